@@ -212,6 +212,14 @@ class Config:
             0.60,
             validator=RangeValidator(0.0, 1.0)
         )
+        self.ocr_device = OptionsConfigItem(
+            "OCR",
+            "Device",
+            "cpu",  # cuda 需要 onnxruntime-gpu 及可用的 CUDA 环境
+            validator=OptionsValidator(["cpu", "cuda"])
+        )
+        self.ocr_quantized = ConfigItem("OCR", "Quantized", False)  # 是否使用INT8量化的检测/识别模型
+        self.ocr_skip_textless_pages = ConfigItem("OCR", "SkipTextlessPages", False)  # 是否用边缘特征预检跳过无文字页面
 
         # ==================== 翻译设置 ====================
         self.translator_type = OptionsConfigItem(
@@ -220,6 +228,12 @@ class Config:
             "Google", 
             validator=OptionsValidator(["Google", "智谱"])
         )
+        self.translation_webp_quality = RangeConfigItem(
+            "Translation",
+            "OutputWebpQuality",
+            90,  # 翻译结果图片的 WebP 编码质量
+            validator=RangeValidator(1, 100)
+        )
 
         # 文字替换设置
         self.font_name = ConfigItem("TextReplace", "FontName", "SourceHanSerifCN-Heavy.ttf")
@@ -1,15 +1,47 @@
 import os
 import json
+import hashlib
 import sqlite3
-from typing import Any, List, Optional, Dict, Tuple # Added Dict, Tuple, sqlite3
+import threading
+import zlib
+from typing import Any, List, Optional, Dict, Tuple, Union # Added Dict, Tuple, sqlite3
 from utils import manga_logger as log
 from core.core_cache.cache_interface import CacheInterface
+from core.manga.manga_model import MangaInfo
 
 # Cache directory and database file name
 CACHE_DIR = "app/config"
 DB_NAME = "manga_list_cache.db"
 DB_PATH = os.path.join(CACHE_DIR, DB_NAME)
+# 旧版表：每个目录一整块 JSON，只在初始化时读取一次并迁移到新表
 TABLE_NAME = "manga_list_cache"
+# 每本漫画一行，last_modified 单独成列，修改检查不需要解析任何 JSON
+ENTRY_TABLE_NAME = "manga_list_entries"
+
+# 热路径上使用的固定 SQL 语句；只绑定参数、语句文本不变，sqlite3 的语句缓存可直接复用已编译的语句
+SQL_GET = f"SELECT payload FROM {ENTRY_TABLE_NAME} WHERE directory_path = ? ORDER BY position"
+SQL_SET = f"""
+INSERT INTO {ENTRY_TABLE_NAME} (directory_path, position, file_path, last_modified, payload, last_updated)
+VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+SQL_DELETE = f"DELETE FROM {ENTRY_TABLE_NAME} WHERE directory_path = ?"
+SQL_UPDATE_ENTRY = f"""
+UPDATE {ENTRY_TABLE_NAME} SET last_modified = ?, payload = ?, last_updated = CURRENT_TIMESTAMP
+WHERE file_path = ?
+"""
+SQL_GET_ENTRY_DIRS = f"SELECT DISTINCT directory_path FROM {ENTRY_TABLE_NAME} WHERE file_path = ?"
+SQL_GET_MTIME = f"SELECT last_modified FROM {ENTRY_TABLE_NAME} WHERE file_path = ? ORDER BY rowid LIMIT 1"
+# 记录一律以 UTF-8 编码的 JSON 字节（BLOB）存储；超过该长度（字节）的再用 zlib 压缩，
+# 页面文件名列表重复度高，通常可压缩到 1/5 以下，较短的记录压缩收益小，保持原始 JSON 字节以免额外的解压开销
+PAYLOAD_COMPRESS_THRESHOLD = 1024
+PAYLOAD_COMPRESS_LEVEL = 1
+# 复用同一个编码器：json.dumps 带参数调用时每次都会新建 JSONEncoder
+_PAYLOAD_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+# 数据库内存映射上限与页缓存大小；映射只占用地址空间，页面由操作系统按需载入
+MMAP_SIZE_BYTES = 1024 * 1024 * 1024
+PAGE_CACHE_SIZE_KIB = 20000
+# 每个连接缓存的已编译语句数
+STATEMENT_CACHE_SIZE = 128
 
 class MangaListCacheManager(CacheInterface):
     """漫画扫描结果缓存管理类，基于SQLite数据库。"""
@@ -18,6 +50,11 @@ class MangaListCacheManager(CacheInterface):
         """初始化缓存管理器"""
         self.db_path = db_path
         self.conn: Optional[sqlite3.Connection] = None
+        self._closed = False  # close() 后置为 True，下次使用时重新连接
+        # 延迟写入可能在后台线程执行，连接允许跨线程使用，由锁保证同一时间只有一个线程访问
+        self._lock = threading.RLock()
+        # 各目录最近一次读取/写入的数据摘要；内容未变化时跳过整块重写
+        self._blob_digests: Dict[str, bytes] = {}
         self._ensure_cache_dir_exists()
         self._init_db()
         log.info(f"MangaListCacheManager 初始化完成，数据库路径: {self.db_path}")
@@ -37,39 +74,124 @@ class MangaListCacheManager(CacheInterface):
         """连接到 SQLite 数据库"""
         if self.conn is None or self._is_connection_closed():
             try:
-                self.conn = sqlite3.connect(self.db_path)
+                self.conn = sqlite3.connect(
+                    self.db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+                )
+                self._closed = False
                 self.conn.row_factory = sqlite3.Row # Access columns by name
+                # 以下 PRAGMA 只对当前连接生效，每次新建连接时设置一次：
+                # WAL 模式下读不阻塞写，扫描时的批量写入也不必每次都同步整个日志；
+                # 临时表放在内存，读取走内存映射，页缓存约 20MB
+                self.conn.execute("PRAGMA journal_mode=WAL")
+                self.conn.execute("PRAGMA synchronous=NORMAL")
+                self.conn.execute("PRAGMA temp_store=MEMORY")
+                mmap_row = self.conn.execute(f"PRAGMA mmap_size={MMAP_SIZE_BYTES}").fetchone()
+                if not mmap_row or mmap_row[0] < MMAP_SIZE_BYTES:
+                    # SQLite 编译时上限较小或禁用了内存映射时返回实际生效的值
+                    log.debug(f"漫画列表缓存内存映射大小受限: {mmap_row[0] if mmap_row else 0} 字节")
+                self.conn.execute(f"PRAGMA cache_size=-{PAGE_CACHE_SIZE_KIB}")
             except sqlite3.Error as e:
                 log.error(f"连接到数据库 {self.db_path} 失败: {e}")
                 raise
         return self.conn
 
     def _is_connection_closed(self) -> bool:
-        """检查数据库连接是否已关闭"""
-        if self.conn is None:
-            return True
-        try:
-            self.conn.execute("SELECT 1").fetchone()
-            return False
-        except (sqlite3.ProgrammingError, sqlite3.OperationalError): # Connection closed or unusable
-            return True
+        """检查数据库连接是否已关闭；只检查 close() 设置的标志，不再每次执行 SELECT 1 探测，
+        使用中的数据库错误由各调用处捕获"""
+        return self.conn is None or self._closed
 
     def _init_db(self):
         """初始化数据库和表"""
         try:
-            conn = self._connect()
-            cursor = conn.cursor()
-            cursor.execute(f"""
-            CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
-                directory_path TEXT PRIMARY KEY,
-                manga_data TEXT NOT NULL,
-                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """)
-            conn.commit()
-            log.info(f"漫画列表缓存数据库表 '{TABLE_NAME}' 已准备就绪")
+            with self._lock:
+                conn = self._connect()
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {ENTRY_TABLE_NAME} (
+                    directory_path TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    file_path TEXT NOT NULL,
+                    last_modified REAL NOT NULL DEFAULT 0,
+                    payload BLOB NOT NULL,
+                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (directory_path, position)
+                )
+                """)
+                cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_{ENTRY_TABLE_NAME}_file_path
+                ON {ENTRY_TABLE_NAME} (file_path)
+                """)
+                conn.commit()
+                self._migrate_legacy_table(conn)
+                log.info(f"漫画列表缓存数据库表 '{ENTRY_TABLE_NAME}' 已准备就绪")
         except sqlite3.Error as e:
-            log.error(f"初始化数据库表 {TABLE_NAME} 失败: {e}")
+            log.error(f"初始化数据库表 {ENTRY_TABLE_NAME} 失败: {e}")
+
+    def _migrate_legacy_table(self, conn: sqlite3.Connection):
+        """把旧版按目录整块存储的 JSON 缓存拆分为逐本记录写入新表，完成后删除旧表"""
+        legacy = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?", (TABLE_NAME,)
+        ).fetchone()
+        if legacy is None:
+            return
+
+        rows = []
+        for row in conn.execute(f"SELECT directory_path, manga_data FROM {TABLE_NAME}"):
+            try:
+                manga_list = json.loads(row["manga_data"])
+            except json.JSONDecodeError:
+                log.warning(f"旧版缓存数据损坏，跳过迁移: {row['directory_path']}")
+                continue
+            rows.extend(self._build_rows(row["directory_path"], manga_list))
+
+        with conn:
+            conn.executemany(SQL_SET, rows)
+            conn.execute(f"DROP TABLE {TABLE_NAME}")
+        log.info(f"已将旧版漫画列表缓存迁移到 '{ENTRY_TABLE_NAME}'，共 {len(rows)} 本漫画")
+
+    @staticmethod
+    def _build_rows(key: str, manga_list: List[Dict[str, Any]]) -> List[Tuple]:
+        """把一个目录的漫画列表转换为逐本写入的参数元组"""
+        return [
+            (
+                key,
+                position,
+                manga_info.get("file_path") or "",
+                manga_info.get("last_modified") or 0,
+                MangaListCacheManager._encode_payload(manga_info),
+            )
+            for position, manga_info in enumerate(manga_list)
+        ]
+
+    @staticmethod
+    def _encode_payload(manga_info: Dict[str, Any]) -> bytes:
+        """
+        把单本漫画记录序列化为紧凑 JSON 并只编码一次为 UTF-8 字节，较长的记录再压缩；
+        绑定 bytes 时 SQLite 不必再转码，计算摘要时也直接使用这份字节
+        """
+        payload = _PAYLOAD_ENCODER.encode(manga_info).encode("utf-8")
+        if len(payload) < PAYLOAD_COMPRESS_THRESHOLD:
+            return payload
+        return zlib.compress(payload, PAYLOAD_COMPRESS_LEVEL)
+
+    @staticmethod
+    def _decode_payload(payload: Union[str, bytes]) -> Dict[str, Any]:
+        """
+        解析单本漫画记录：以 '{' 开头的 bytes 为未压缩的 JSON 字节，其余 bytes 为 zlib 数据
+        （zlib 数据首字节不会是 '{'）；str 为早期以 TEXT 存储的 JSON
+        """
+        if isinstance(payload, bytes) and not payload.startswith(b"{"):
+            payload = zlib.decompress(payload)
+        return json.loads(payload)
+
+    @staticmethod
+    def _digest(payloads: List[Union[str, bytes]]) -> bytes:
+        """计算一个目录全部漫画记录的摘要，用于判断内容是否变化"""
+        hasher = hashlib.blake2b(digest_size=16)
+        for payload in payloads:
+            hasher.update(payload if isinstance(payload, bytes) else payload.encode("utf-8"))
+            hasher.update(b"\n")
+        return hasher.digest()
 
     def generate_key(self, directory_path: str, *args, **kwargs) -> str:
         """对于漫画列表缓存，键就是目录路径。"""
@@ -85,30 +207,124 @@ class MangaListCacheManager(CacheInterface):
             return None
         
         try:
-            conn = self._connect()
-            cursor = conn.cursor()
-            cursor.execute(f"SELECT manga_data FROM {TABLE_NAME} WHERE directory_path = ?", (key,))
-            row = cursor.fetchone()
-            if row:
-                manga_data_json = row["manga_data"]
-                return json.loads(manga_data_json)
-            return None
+            with self._lock:
+                conn = self._connect()
+                payloads = [row["payload"] for row in conn.execute(SQL_GET, (key,))]
+                if not payloads:
+                    return None
+                self._blob_digests[key] = self._digest(payloads)
+                return [self._decode_payload(payload) for payload in payloads]
         except sqlite3.Error as e:
             log.error(f"从漫画列表缓存获取数据失败 (键: {key}): {e}")
             return None
-        except json.JSONDecodeError as e:
+        except (json.JSONDecodeError, zlib.error) as e:
             log.error(f"解析缓存的漫画列表数据失败 (键: {key}): {e}")
             return None
 
     def set(self, key: str, data: List[Any], **kwargs) -> None:
         """更新指定目录（键）的漫画列表缓存。"""
-        if not isinstance(key, str):
-            log.error(f"MangaListCacheManager.set 接收到非字符串键: {key}")
-            return
+        self.set_many([(key, data)])
+
+    def set_many(self, items: List[Tuple[str, List[Any]]]) -> None:
+        """
+        批量更新多个目录（键）的漫画列表缓存。
+        所有目录的删除和插入在同一事务中完成，只提交一次；内容未变化的目录跳过写入。
+        """
+        pending: List[Tuple[str, List[Tuple], bytes]] = []
+        for key, data in items:
+            if not isinstance(key, str):
+                log.error(f"MangaListCacheManager.set 接收到非字符串键: {key}")
+                continue
+            try:
+                # 每本漫画一行，记录内容用紧凑分隔符序列化
+                rows = self._build_rows(key, self._serialize_manga_list(key, data))
+            except TypeError as e: # Error during json.dumps
+                log.error(f"序列化漫画列表数据失败 (键: {key}): {e}")
+                continue
+            pending.append((key, rows, self._digest([row[-1] for row in rows])))
+
+        try:
+            with self._lock:
+                # 重新扫描结果与已缓存内容完全相同时不再重写该目录的数据
+                changed = []
+                for key, rows, digest in pending:
+                    if self._blob_digests.get(key) == digest:
+                        log.debug(f"目录 {key} 的漫画列表缓存内容未变化，跳过写入")
+                    else:
+                        changed.append((key, rows, digest))
+                if not changed:
+                    return
+
+                conn = self._connect()
+                # 删除旧记录与批量插入在同一事务中完成
+                with conn:
+                    for key, rows, _ in changed:
+                        conn.execute(SQL_DELETE, (key,))
+                        conn.executemany(SQL_SET, rows)
+                for key, rows, digest in changed:
+                    self._blob_digests[key] = digest
+                    log.info(f"已更新目录 {key} 的漫画列表缓存，共 {len(rows)} 本漫画")
+        except sqlite3.Error as e:
+            log.error(f"设置漫画列表缓存数据失败 (键: {', '.join(key for key, _, _ in pending)}): {e}")
 
+    def update_manga(self, manga_item: Any) -> bool:
+        """
+        只更新一本漫画的缓存记录（所有包含该漫画的目录中的记录），不重写整个目录。
+        返回是否更新了已有记录；缓存中没有该漫画时返回 False，由调用者决定是否整体写入。
+        """
+        serialized = self._serialize_manga_list("update_manga", [manga_item])
+        if not serialized:
+            return False
+        manga_info = serialized[0]
+        file_path = manga_info.get("file_path")
+        if not file_path:
+            return False
+        last_modified = manga_info.get("last_modified") or 0
+        try:
+            payload = self._encode_payload(manga_info)
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    directories = [row["directory_path"] for row in conn.execute(SQL_GET_ENTRY_DIRS, (file_path,))]
+                    if not directories:
+                        return False
+                    conn.execute(SQL_UPDATE_ENTRY, (last_modified, payload, file_path))
+                # 这些目录的内容已变化，下次整体写入时不能按旧摘要跳过
+                for directory in directories:
+                    self._blob_digests.pop(directory, None)
+                log.debug(f"已更新漫画缓存记录: {file_path}")
+                return True
+        except sqlite3.Error as e:
+            log.error(f"更新漫画缓存记录失败 ({file_path}): {e}")
+        except TypeError as e: # Error during json encoding
+            log.error(f"序列化漫画数据失败 ({file_path}): {e}")
+        return False
+
+    @staticmethod
+    def _serialize_manga_list(key: str, data: List[Any]) -> List[Dict[str, Any]]:
+        """把漫画对象或字典列表转换为可JSON序列化的字典列表"""
         serializable_list: List[Dict[str, Any]] = []
         for manga_item in data:
-            if isinstance(manga_item, dict):
+            if isinstance(manga_item, MangaInfo):
+                # 快速路径：MangaInfo 在 __init__ 中定义了全部字段，直接读取属性，不必逐个 hasattr/getattr 探测
+                page_dimensions = manga_item.page_dimensions
+                dimension_variance = manga_item.dimension_variance
+                is_likely_manga = manga_item.is_likely_manga
+                serializable_list.append({
+                    "file_path": manga_item.file_path,
+                    "title": manga_item.title,
+                    "tags": list(manga_item.tags),
+                    "total_pages": manga_item.total_pages,
+                    "is_valid": bool(manga_item.is_valid),
+                    "last_modified": manga_item.last_modified,
+                    "pages": manga_item.pages,
+                    "is_translated": bool(getattr(manga_item, "is_translated", False)),
+                    # 页面尺寸分析相关数据
+                    "page_dimensions": page_dimensions.tolist() if hasattr(page_dimensions, "tolist") else page_dimensions,
+                    "dimension_variance": None if dimension_variance is None else float(dimension_variance),
+                    "is_likely_manga": None if is_likely_manga is None else bool(is_likely_manga)
+                })
+            elif isinstance(manga_item, dict):
                 serializable_list.append(manga_item)
             elif hasattr(manga_item, "file_path") and hasattr(manga_item, "last_modified"):
                 # 确保所有值都是JSON可序列化的
@@ -126,9 +342,19 @@ class MangaListCacheManager(CacheInterface):
                 if is_likely_manga is not None:
                     is_likely_manga = bool(is_likely_manga)
 
+                # 尺寸分析结果为 numpy 数组，转换为嵌套列表后才能写入JSON
+                page_dimensions = getattr(manga_item, "page_dimensions", [])
+                if hasattr(page_dimensions, "tolist"):
+                    page_dimensions = page_dimensions.tolist()
+
+                # 默认标题只在对象没有 title 时才计算，不再每本都先求一次 basename
+                title = getattr(manga_item, "title", None)
+                if title is None:
+                    title = os.path.basename(manga_item.file_path)
+
                 manga_info = {
                     "file_path": manga_item.file_path,
-                    "title": getattr(manga_item, "title", os.path.basename(manga_item.file_path)),
+                    "title": title,
                     "tags": list(getattr(manga_item, "tags", [])),
                     "total_pages": getattr(manga_item, "total_pages", 0),
                     "is_valid": bool(getattr(manga_item, "is_valid", False)),
@@ -136,28 +362,14 @@ class MangaListCacheManager(CacheInterface):
                     "pages": getattr(manga_item, "pages", []),
                     "is_translated": bool(getattr(manga_item, "is_translated", False)),
                     # 页面尺寸分析相关数据
-                    "page_dimensions": getattr(manga_item, "page_dimensions", []),
+                    "page_dimensions": page_dimensions,
                     "dimension_variance": dimension_variance,
                     "is_likely_manga": is_likely_manga
                 }
                 serializable_list.append(manga_info)
             else:
                 log.warning(f"无法序列化漫画项目: {manga_item} (键: {key})")
-        
-        try:
-            manga_data_json = json.dumps(serializable_list, ensure_ascii=False)
-            conn = self._connect()
-            cursor = conn.cursor()
-            cursor.execute(f"""
-            INSERT OR REPLACE INTO {TABLE_NAME} (directory_path, manga_data, last_updated)
-            VALUES (?, ?, CURRENT_TIMESTAMP)
-            """, (key, manga_data_json))
-            conn.commit()
-            log.info(f"已更新目录 {key} 的漫画列表缓存，共 {len(serializable_list)} 本漫画")
-        except sqlite3.Error as e:
-            log.error(f"设置漫画列表缓存数据失败 (键: {key}): {e}")
-        except TypeError as e: # Error during json.dumps
-            log.error(f"序列化漫画列表数据失败 (键: {key}): {e}")
+        return serializable_list
 
     def delete(self, key: str) -> None:
         """删除指定目录（键）的漫画列表缓存。"""
@@ -165,25 +377,28 @@ class MangaListCacheManager(CacheInterface):
             log.error(f"MangaListCacheManager.delete 接收到非字符串键: {key}")
             return
         try:
-            conn = self._connect()
-            cursor = conn.cursor()
-            cursor.execute(f"DELETE FROM {TABLE_NAME} WHERE directory_path = ?", (key,))
-            conn.commit()
-            if cursor.rowcount > 0:
-                log.info(f"已删除目录 {key} 的漫画列表缓存")
-            else:
-                log.info(f"尝试删除不存在的漫画列表缓存键: {key}")
+            with self._lock:
+                conn = self._connect()
+                self._blob_digests.pop(key, None)
+                cursor = conn.execute(SQL_DELETE, (key,))
+                conn.commit()
+                if cursor.rowcount > 0:
+                    log.info(f"已删除目录 {key} 的漫画列表缓存")
+                else:
+                    log.info(f"尝试删除不存在的漫画列表缓存键: {key}")
         except sqlite3.Error as e:
             log.error(f"删除漫画列表缓存数据失败 (键: {key}): {e}")
 
     def clear(self) -> None:
         """清空所有漫画列表缓存"""
         try:
-            conn = self._connect()
-            cursor = conn.cursor()
-            cursor.execute(f"DELETE FROM {TABLE_NAME}")
-            conn.commit()
-            log.info(f"漫画列表缓存表 '{TABLE_NAME}' 已清空")
+            with self._lock:
+                conn = self._connect()
+                cursor = conn.cursor()
+                self._blob_digests.clear()
+                cursor.execute(f"DELETE FROM {ENTRY_TABLE_NAME}")
+                conn.commit()
+                log.info(f"漫画列表缓存表 '{ENTRY_TABLE_NAME}' 已清空")
         except sqlite3.Error as e:
             log.error(f"清空漫画列表缓存失败: {e}")
 
@@ -193,26 +408,43 @@ class MangaListCacheManager(CacheInterface):
         返回包含 directory_path 和 last_updated 的字典列表。
         """
         try:
-            conn = self._connect()
-            cursor = conn.cursor()
-            # Select directory_path and last_updated.
-            # We could also try to count items in manga_data, but that might be slow.
-            cursor.execute(f"SELECT directory_path, last_updated FROM {TABLE_NAME}")
-            rows = cursor.fetchall()
-            # Convert rows to a list of dictionaries
-            return [dict(row) for row in rows]
+            with self._lock:
+                conn = self._connect()
+                cursor = conn.cursor()
+                # 每个目录一条：目录路径与最近一次写入时间
+                cursor.execute(f"""
+                SELECT directory_path, MAX(last_updated) AS last_updated
+                FROM {ENTRY_TABLE_NAME}
+                GROUP BY directory_path
+                """)
+                rows = cursor.fetchall()
+                # Convert rows to a list of dictionaries
+                return [dict(row) for row in rows]
         except sqlite3.Error as e:
             log.error(f"获取所有漫画列表缓存条目失败: {e}")
             return []
 
+    def count_entries(self) -> int:
+        """统计所有目录缓存的漫画总数，由 SQLite 直接计数，不读取和解析任何记录"""
+        try:
+            with self._lock:
+                row = self._connect().execute(f"SELECT COUNT(*) FROM {ENTRY_TABLE_NAME}").fetchone()
+                return row[0] if row else 0
+        except sqlite3.Error as e:
+            log.error(f"统计漫画列表缓存条目失败: {e}")
+            return 0
+
     def get_cache_size_bytes(self) -> int:
         """
         获取漫画列表缓存的总大小（字节）。
-        返回SQLite数据库文件的大小。
+        返回SQLite数据库文件的大小（WAL 模式下包含尚未合并的 -wal 日志文件）。
         """
         try:
             if os.path.exists(self.db_path):
                 size_bytes = os.path.getsize(self.db_path)
+                wal_path = self.db_path + "-wal"
+                if os.path.exists(wal_path):
+                    size_bytes += os.path.getsize(wal_path)
                 log.debug(f"漫画列表缓存数据库大小: {size_bytes} 字节")
                 return size_bytes
             else:
@@ -224,13 +456,15 @@ class MangaListCacheManager(CacheInterface):
 
     def close(self) -> None:
         """关闭数据库连接。"""
-        if self.conn:
-            try:
-                self.conn.close()
-                self.conn = None
-                log.info("漫画列表缓存数据库连接已关闭")
-            except sqlite3.Error as e:
-                log.error(f"关闭漫画列表数据库连接失败: {e}")
+        with self._lock:
+            if self.conn:
+                try:
+                    self._closed = True
+                    self.conn.close()
+                    self.conn = None
+                    log.info("漫画列表缓存数据库连接已关闭")
+                except sqlite3.Error as e:
+                    log.error(f"关闭漫画列表数据库连接失败: {e}")
 
     def __del__(self):
         self.close()
@@ -238,48 +472,22 @@ class MangaListCacheManager(CacheInterface):
     def is_manga_modified(self, file_path: str) -> bool:
         """
         检查漫画文件是否被修改。
-        注意: 此方法需要知道漫画文件所属的目录键，或者遍历所有缓存的目录来查找文件。
-        当前实现需要调用者提供目录键，或者自行获取。
-        为了简单起见，这里假设我们能获取到包含该文件的目录的缓存数据。
-        如果需要全局检查，调用者需要迭代所有已知的目录键。
+        直接按 file_path 索引查询 last_modified 列，不需要读取和解析任何漫画记录。
         """
-        if not os.path.exists(file_path):
-            return True  # 文件不存在，视为已修改
-
         try:
-            current_mtime = os.path.getmtime(file_path)
+            current_mtime = os.stat(file_path).st_mtime
+        except FileNotFoundError:
+            return True  # 文件不存在，视为已修改
         except OSError:
             log.warning(f"无法获取文件修改时间: {file_path}，视为已修改")
             return True
 
-        # This method's effectiveness depends on how it's used.
-        # If checking against a specific directory's cache:
-        # parent_dir = os.path.dirname(file_path)
-        # cached_manga_list = self.get(parent_dir)
-        # if cached_manga_list:
-        #     for manga_info in cached_manga_list:
-        #         if manga_info.get("file_path") == file_path:
-        #             return current_mtime > manga_info.get("last_modified", 0)
-        # return True # Not found in specific directory's cache or cache miss
-
-        # If iterating all cached directories (less efficient, as in original JSON version):
-        log.warning("is_manga_modified: 正在遍历所有缓存目录检查文件修改状态，可能效率低下。")
         try:
-            conn = self._connect()
-            cursor = conn.cursor()
-            cursor.execute(f"SELECT manga_data FROM {TABLE_NAME}")
-            all_cached_dirs = cursor.fetchall()
-            for row in all_cached_dirs:
-                manga_list_for_dir_json = row["manga_data"]
-                try:
-                    manga_list_for_dir = json.loads(manga_list_for_dir_json)
-                    for manga_info in manga_list_for_dir:
-                        if manga_info.get("file_path") == file_path:
-                            return current_mtime > manga_info.get("last_modified", 0)
-                except json.JSONDecodeError:
-                    log.error(f"解析缓存的漫画列表数据时出错（在 is_manga_modified 中）")
-                    continue # Skip corrupted entry
-            return True # 缓存中没有找到，视为已修改
+            with self._lock:
+                row = self._connect().execute(SQL_GET_MTIME, (file_path,)).fetchone()
         except sqlite3.Error as e:
             log.error(f"is_manga_modified 查询数据库时出错: {e}")
-            return True # Error, assume modified
\ No newline at end of file
+            return True # Error, assume modified
+        if row is None:
+            return True # 缓存中没有找到，视为已修改
+        return current_mtime > row["last_modified"]
\ No newline at end of file
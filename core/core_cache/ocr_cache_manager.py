@@ -1,5 +1,6 @@
 # core/ocr_cache_manager.py
 import sqlite3
+import threading
 import json
 import os
 from typing import Any, List, Optional, Tuple, Dict
@@ -20,8 +21,11 @@ class OcrCacheManager(CacheInterface):
 
     def __init__(self, db_path: str = DB_PATH):
         self.db_path = db_path
-        self._ensure_cache_dir_exists()
         self.conn: Optional[sqlite3.Connection] = None
+        self._closed = False  # close() 后置为 True，下次使用时重新连接
+        # 连接允许跨线程使用（批量翻译时在工作线程中读写缓存），所有访问由此锁串行化
+        self._lock = threading.RLock()
+        self._ensure_cache_dir_exists()
         self._init_db()
 
     def _ensure_cache_dir_exists(self):
@@ -38,7 +42,8 @@ class OcrCacheManager(CacheInterface):
         """连接到 SQLite 数据库"""
         if self.conn is None or self._is_connection_closed():
             try:
-                self.conn = sqlite3.connect(self.db_path)
+                self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                self._closed = False
                 self.conn.row_factory = sqlite3.Row # Access columns by name
             except sqlite3.Error as e:
                 log.error(f"连接到数据库 {self.db_path} 失败: {e}")
@@ -46,36 +51,29 @@ class OcrCacheManager(CacheInterface):
         return self.conn
 
     def _is_connection_closed(self) -> bool:
-        """检查数据库连接是否已关闭"""
-        if self.conn is None:
-            return True
-        try:
-            # Attempt a simple query to check if the connection is live
-            self.conn.execute("SELECT 1").fetchone()
-            return False
-        except sqlite3.ProgrammingError: # Connection closed or cursor used on closed connection
-            return True
-        except sqlite3.OperationalError: # Potentially, connection is still open but unusable
-            return True
+        """检查数据库连接是否已关闭；只检查 close() 设置的标志，不再每次执行 SELECT 1 探测，
+        使用中的数据库错误由各调用处捕获"""
+        return self.conn is None or self._closed
 
 
     def _init_db(self):
         """初始化数据库和表"""
         try:
-            conn = self._connect()
-            cursor = conn.cursor()
-            cursor.execute(f"""
-            CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} (
-                cache_key TEXT PRIMARY KEY,
-                file_name TEXT NOT NULL,
-                file_size INTEGER NOT NULL,
-                last_modified REAL NOT NULL,
-                page_num INTEGER NOT NULL,
-                ocr_data TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """)
-            conn.commit()
+            with self._lock:
+                conn = self._connect()
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self.TABLE_NAME} (
+                    cache_key TEXT PRIMARY KEY,
+                    file_name TEXT NOT NULL,
+                    file_size INTEGER NOT NULL,
+                    last_modified REAL NOT NULL,
+                    page_num INTEGER NOT NULL,
+                    ocr_data TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """)
+                conn.commit()
         except sqlite3.Error as e:
             log.error(f"初始化数据库表 {self.TABLE_NAME} 失败: {e}")
             # Do not close connection here, _connect will handle re-connection if needed
@@ -126,19 +124,20 @@ class OcrCacheManager(CacheInterface):
         """
         log.debug(f"尝试从OCR缓存获取数据，键: '{key}'")
         try:
-            conn = self._connect()
-            cursor = conn.cursor()
-            cursor.execute(f"SELECT ocr_data FROM {self.TABLE_NAME} WHERE cache_key = ?", (key,))
-            row = cursor.fetchone()
-            if row:
-                log.debug(f"OCR缓存命中，键: '{key}'")
-                ocr_data_json = row["ocr_data"]
-                ocr_data_list = json.loads(ocr_data_json)
-                # Assuming OCRResult can be reconstructed from a dict
-                return [OCRResult(**data_dict) for data_dict in ocr_data_list]
-            else:
-                log.debug(f"OCR缓存未命中，键: '{key}'")
-                return None
+            with self._lock:
+                conn = self._connect()
+                cursor = conn.cursor()
+                cursor.execute(f"SELECT ocr_data FROM {self.TABLE_NAME} WHERE cache_key = ?", (key,))
+                row = cursor.fetchone()
+                if row:
+                    log.debug(f"OCR缓存命中，键: '{key}'")
+                    ocr_data_json = row["ocr_data"]
+                    ocr_data_list = json.loads(ocr_data_json)
+                    # Assuming OCRResult can be reconstructed from a dict
+                    return [OCRResult(**data_dict) for data_dict in ocr_data_list]
+                else:
+                    log.debug(f"OCR缓存未命中，键: '{key}'")
+                    return None
         except sqlite3.Error as e:
             log.error(f"从缓存获取数据失败 (键: {key}): {e}")
             return None
@@ -195,14 +194,15 @@ class OcrCacheManager(CacheInterface):
             ocr_data_list = [result.to_dict() for result in data]
             ocr_data_json = json.dumps(ocr_data_list)
 
-            conn = self._connect()
-            cursor = conn.cursor()
-            cursor.execute(f"""
-            INSERT OR REPLACE INTO {self.TABLE_NAME}
-            (cache_key, file_name, file_size, last_modified, page_num, ocr_data)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """, (key, db_file_name, db_file_size, db_last_modified, page_num, ocr_data_json))
-            conn.commit()
+            with self._lock:
+                conn = self._connect()
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                INSERT OR REPLACE INTO {self.TABLE_NAME}
+                (cache_key, file_name, file_size, last_modified, page_num, ocr_data)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """, (key, db_file_name, db_file_size, db_last_modified, page_num, ocr_data_json))
+                conn.commit()
         except sqlite3.Error as e:
             log.error(f"设置缓存数据失败 (键: {key}): {e}")
         except TypeError as e: # Error during to_dict() or json.dumps
@@ -216,10 +216,11 @@ class OcrCacheManager(CacheInterface):
         删除指定键的缓存。
         """
         try:
-            conn = self._connect()
-            cursor = conn.cursor()
-            cursor.execute(f"DELETE FROM {self.TABLE_NAME} WHERE cache_key = ?", (key,))
-            conn.commit()
+            with self._lock:
+                conn = self._connect()
+                cursor = conn.cursor()
+                cursor.execute(f"DELETE FROM {self.TABLE_NAME} WHERE cache_key = ?", (key,))
+                conn.commit()
         except sqlite3.Error as e:
             log.error(f"删除缓存数据失败 (键: {key}): {e}")
 
@@ -228,11 +229,12 @@ class OcrCacheManager(CacheInterface):
         清空所有 OCR 缓存。
         """
         try:
-            conn = self._connect()
-            cursor = conn.cursor()
-            cursor.execute(f"DELETE FROM {self.TABLE_NAME}")
-            conn.commit()
-            log.info("OCR 缓存已清空")
+            with self._lock:
+                conn = self._connect()
+                cursor = conn.cursor()
+                cursor.execute(f"DELETE FROM {self.TABLE_NAME}")
+                conn.commit()
+                log.info("OCR 缓存已清空")
         except sqlite3.Error as e:
             log.error(f"清空 OCR 缓存失败: {e}")
 
@@ -244,21 +246,22 @@ class OcrCacheManager(CacheInterface):
             log.debug("正在获取所有OCR缓存条目以供显示...")
             entries = []
             try:
-                conn = self._connect()
-                cursor = conn.cursor()
-                # 选择要在显示界面中使用的列
-                # ocr_data 可能会很大，可以考虑是否只显示摘要或部分信息
-                # 但为了与 MangaCache 和 TranslationCacheManager 的 get_all_entries_for_display 保持一致
-                # 我们暂时选择所有主要元数据列。UI层面可以决定如何显示。
-                cursor.execute(f"""
-                    SELECT cache_key, file_name, file_size, last_modified, page_num, created_at
-                    FROM {self.TABLE_NAME}
-                    ORDER BY created_at DESC
-                """) # 添加了 ORDER BY
-                rows = cursor.fetchall()
-                for row in rows:
-                    entries.append(dict(row)) # sqlite3.Row可以直接转换为字典
-                log.info(f"成功检索到 {len(entries)} 条OCR缓存条目以供显示。")
+                with self._lock:
+                    conn = self._connect()
+                    cursor = conn.cursor()
+                    # 选择要在显示界面中使用的列
+                    # ocr_data 可能会很大，可以考虑是否只显示摘要或部分信息
+                    # 但为了与 MangaCache 和 TranslationCacheManager 的 get_all_entries_for_display 保持一致
+                    # 我们暂时选择所有主要元数据列。UI层面可以决定如何显示。
+                    cursor.execute(f"""
+                        SELECT cache_key, file_name, file_size, last_modified, page_num, created_at
+                        FROM {self.TABLE_NAME}
+                        ORDER BY created_at DESC
+                    """) # 添加了 ORDER BY
+                    rows = cursor.fetchall()
+                    for row in rows:
+                        entries.append(dict(row)) # sqlite3.Row可以直接转换为字典
+                    log.info(f"成功检索到 {len(entries)} 条OCR缓存条目以供显示。")
             except sqlite3.Error as e:
                 log.error(f"获取所有OCR缓存条目失败: {e}")
             except Exception as e: # Catch any other unexpected errors
@@ -286,13 +289,15 @@ class OcrCacheManager(CacheInterface):
         """
         关闭数据库连接。
         """
-        if self.conn:
-            try:
-                self.conn.close()
-                self.conn = None
-                log.info("OCR 缓存数据库连接已关闭")
-            except sqlite3.Error as e:
-                log.error(f"关闭数据库连接失败: {e}")
+        with self._lock:
+            if self.conn:
+                try:
+                    self._closed = True
+                    self.conn.close()
+                    self.conn = None
+                    log.info("OCR 缓存数据库连接已关闭")
+                except sqlite3.Error as e:
+                    log.error(f"关闭数据库连接失败: {e}")
 
     def __del__(self):
         self.close()
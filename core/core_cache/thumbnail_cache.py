@@ -150,8 +150,10 @@ class ThumbnailCache:
             )
 
             cleaned_count = 0
-            while current_size > self.max_cache_size_bytes and sorted_metadata:
-                cache_key, meta = sorted_metadata.pop(0)
+            # 顺序遍历排序结果，不用 pop(0)（每次都要整体前移列表）
+            for cache_key, meta in sorted_metadata:
+                if current_size <= self.max_cache_size_bytes:
+                    break
                 cache_file = self._get_cache_file_path(cache_key)
 
                 if cache_file.exists():
@@ -296,6 +298,9 @@ class ThumbnailCache:
         使用“调整并居中裁剪”算法创建缩略图。
         """
         try:
+            # 图像尚未解码时，JPEG 可直接按 1/2、1/4、1/8 缩小解码；
+            # 结果两边都不小于输出尺寸，随后的裁剪缩放不会放大
+            image.draft(image.mode if image.mode in ("RGB", "L") else "RGB", self.output_size)
             if image.mode not in ("RGB", "L"):
                 image = image.convert("RGB")
             thumbnail = ImageOps.fit(image, self.output_size, Image.Resampling.LANCZOS)
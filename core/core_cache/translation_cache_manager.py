@@ -2,8 +2,9 @@
 import os
 import json
 import sqlite3
+import threading
 import hashlib # Added for key generation
-from typing import Any, Optional, Dict, List # Added List
+from typing import Any, Optional, Dict, List, Tuple # Added List
 from utils import manga_logger as log
 from core.core_cache.cache_interface import CacheInterface
 
@@ -24,6 +25,9 @@ class TranslationCacheManager(CacheInterface):
         """初始化缓存管理器"""
         self.db_path = db_path
         self.conn: Optional[sqlite3.Connection] = None
+        self._closed = False  # close() 后置为 True，下次使用时重新连接
+        # 连接允许跨线程使用（批量翻译时在工作线程中读写缓存），所有访问由此锁串行化
+        self._lock = threading.RLock()
         self._ensure_cache_dir_exists()
         self._init_db()
         log.info(f"TranslationCacheManager 初始化完成，数据库路径: {self.db_path}")
@@ -43,54 +47,54 @@ class TranslationCacheManager(CacheInterface):
         """连接到 SQLite 数据库"""
         if self.conn is None or self._is_connection_closed():
             try:
-                self.conn = sqlite3.connect(self.db_path)
+                self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                self._closed = False
                 self.conn.row_factory = sqlite3.Row
+                # WAL 模式下读不阻塞写，批量翻译时的频繁写入也更快
+                self.conn.execute("PRAGMA journal_mode=WAL")
+                self.conn.execute("PRAGMA synchronous=NORMAL")
             except sqlite3.Error as e:
                 log.error(f"连接到数据库 {self.db_path} 失败: {e}")
                 raise
         return self.conn
 
     def _is_connection_closed(self) -> bool:
-        """检查数据库连接是否已关闭"""
-        if self.conn is None:
-            return True
-        try:
-            self.conn.execute("SELECT 1").fetchone()
-            return False
-        except (sqlite3.ProgrammingError, sqlite3.OperationalError):
-            return True
+        """检查数据库连接是否已关闭；只检查 close() 设置的标志，不再每次执行 SELECT 1 探测，
+        使用中的数据库错误由各调用处捕获"""
+        return self.conn is None or self._closed
 
     def _init_db(self):
         """初始化数据库和表"""
         try:
-            conn = self._connect()
-            cursor = conn.cursor()
-            # 检查表结构是否需要更新
-            cursor.execute(f"PRAGMA table_info({TABLE_NAME})")
-            columns = [column['name'] for column in cursor.fetchall()]
-
-            if 'is_sensitive' not in columns:
-                log.info(f"表 '{TABLE_NAME}' 中缺少 'is_sensitive' 列，正在添加...")
-                try:
-                    cursor.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN is_sensitive INTEGER DEFAULT 0")
-                    conn.commit()
-                    log.info(f"成功向表 '{TABLE_NAME}' 添加 'is_sensitive' 列。")
-                except sqlite3.OperationalError as alter_e: # Catch specific error for ALTER TABLE
-                    log.warning(f"尝试添加 'is_sensitive' 列时发生错误 (可能是列已存在于并发操作中): {alter_e}")
-                    # If alter fails, assume it might be due to concurrent creation or already exists
-                    # We will proceed with the CREATE TABLE IF NOT EXISTS which handles this.
-
-            cursor.execute(f"""
-            CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
-                cache_key TEXT PRIMARY KEY,
-                translated_text TEXT NOT NULL,
-                is_sensitive INTEGER DEFAULT 0, -- 0 for False, 1 for True
-                original_text_sample TEXT, 
-                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """)
-            conn.commit()
-            log.info(f"翻译缓存数据库表 '{TABLE_NAME}' 已准备就绪")
+            with self._lock:
+                conn = self._connect()
+                cursor = conn.cursor()
+                # 检查表结构是否需要更新
+                cursor.execute(f"PRAGMA table_info({TABLE_NAME})")
+                columns = [column['name'] for column in cursor.fetchall()]
+
+                if 'is_sensitive' not in columns:
+                    log.info(f"表 '{TABLE_NAME}' 中缺少 'is_sensitive' 列，正在添加...")
+                    try:
+                        cursor.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN is_sensitive INTEGER DEFAULT 0")
+                        conn.commit()
+                        log.info(f"成功向表 '{TABLE_NAME}' 添加 'is_sensitive' 列。")
+                    except sqlite3.OperationalError as alter_e: # Catch specific error for ALTER TABLE
+                        log.warning(f"尝试添加 'is_sensitive' 列时发生错误 (可能是列已存在于并发操作中): {alter_e}")
+                        # If alter fails, assume it might be due to concurrent creation or already exists
+                        # We will proceed with the CREATE TABLE IF NOT EXISTS which handles this.
+
+                cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
+                    cache_key TEXT PRIMARY KEY,
+                    translated_text TEXT NOT NULL,
+                    is_sensitive INTEGER DEFAULT 0, -- 0 for False, 1 for True
+                    original_text_sample TEXT, 
+                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """)
+                conn.commit()
+                log.info(f"翻译缓存数据库表 '{TABLE_NAME}' 已准备就绪")
         except sqlite3.Error as e:
             log.error(f"初始化数据库表 {TABLE_NAME} 失败: {e}")
 
@@ -121,17 +125,71 @@ class TranslationCacheManager(CacheInterface):
             return None
         
         try:
-            conn = self._connect()
-            cursor = conn.cursor()
-            cursor.execute(f"SELECT translated_text, is_sensitive FROM {TABLE_NAME} WHERE cache_key = ?", (key,))
-            row = cursor.fetchone()
-            if row:
-                return {"text": row["translated_text"], "is_sensitive": bool(row["is_sensitive"])}
-            return None
+            with self._lock:
+                conn = self._connect()
+                cursor = conn.cursor()
+                cursor.execute(f"SELECT translated_text, is_sensitive FROM {TABLE_NAME} WHERE cache_key = ?", (key,))
+                row = cursor.fetchone()
+                if row:
+                    return {"text": row["translated_text"], "is_sensitive": bool(row["is_sensitive"])}
+                return None
         except sqlite3.Error as e:
             log.error(f"从翻译缓存获取数据失败 (键: {key}): {e}")
             return None
 
+    def get_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        批量获取翻译结果，一次查询代替逐键查询。
+        返回 {键: {'text', 'is_sensitive'}}，未命中的键不在结果中。
+        """
+        found: Dict[str, Dict[str, Any]] = {}
+        unique_keys = [key for key in dict.fromkeys(keys) if isinstance(key, str)]
+        if not unique_keys:
+            return found
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                cursor = conn.cursor()
+                # SQLite 默认最多 999 个绑定参数，分块查询
+                for start in range(0, len(unique_keys), 500):
+                    chunk = unique_keys[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    cursor.execute(
+                        f"SELECT cache_key, translated_text, is_sensitive FROM {TABLE_NAME} WHERE cache_key IN ({placeholders})",
+                        chunk
+                    )
+                    for row in cursor.fetchall():
+                        found[row["cache_key"]] = {"text": row["translated_text"], "is_sensitive": bool(row["is_sensitive"])}
+        except sqlite3.Error as e:
+            log.error(f"批量获取翻译缓存数据失败 ({len(unique_keys)} 个键): {e}")
+        return found
+
+    def set_many(self, entries: List[Tuple[str, str, bool, Optional[str]]]) -> None:
+        """
+        在单个事务中批量写入翻译结果。
+        Args:
+            entries: (缓存键, 翻译文本, 是否敏感, 原文) 列表
+        """
+        rows = [
+            (key, data, 1 if is_sensitive else 0, original_text[:100] if original_text else None)
+            for key, data, is_sensitive, original_text in entries
+            if isinstance(key, str) and isinstance(data, str)
+        ]
+        if not rows:
+            return
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.executemany(f"""
+                INSERT OR REPLACE INTO {TABLE_NAME} (cache_key, translated_text, is_sensitive, original_text_sample, last_updated)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """, rows)
+                conn.commit()
+        except sqlite3.Error as e:
+            log.error(f"批量设置翻译缓存数据失败 ({len(rows)} 条): {e}")
+
     def set(self, key: str, data: str, **kwargs) -> None:
         """
         设置翻译结果。
@@ -154,13 +212,14 @@ class TranslationCacheManager(CacheInterface):
         original_text_sample = original_text_input[:100] if original_text_input else None
 
         try:
-            conn = self._connect()
-            cursor = conn.cursor()
-            cursor.execute(f"""
-            INSERT OR REPLACE INTO {TABLE_NAME} (cache_key, translated_text, is_sensitive, original_text_sample, last_updated)
-            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-            """, (key, data, 1 if is_sensitive else 0, original_text_sample))
-            conn.commit()
+            with self._lock:
+                conn = self._connect()
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                INSERT OR REPLACE INTO {TABLE_NAME} (cache_key, translated_text, is_sensitive, original_text_sample, last_updated)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """, (key, data, 1 if is_sensitive else 0, original_text_sample))
+                conn.commit()
         except sqlite3.Error as e:
             log.error(f"设置翻译缓存数据失败 (键: {key}): {e}")
 
@@ -170,25 +229,27 @@ class TranslationCacheManager(CacheInterface):
             log.error(f"TranslationCacheManager.delete 接收到非字符串键: {key}")
             return
         try:
-            conn = self._connect()
-            cursor = conn.cursor()
-            cursor.execute(f"DELETE FROM {TABLE_NAME} WHERE cache_key = ?", (key,))
-            conn.commit()
-            if cursor.rowcount > 0:
-                log.info(f"已删除翻译缓存: '{key}'")
-            else:
-                log.info(f"尝试删除不存在的翻译缓存键: {key}")
+            with self._lock:
+                conn = self._connect()
+                cursor = conn.cursor()
+                cursor.execute(f"DELETE FROM {TABLE_NAME} WHERE cache_key = ?", (key,))
+                conn.commit()
+                if cursor.rowcount > 0:
+                    log.info(f"已删除翻译缓存: '{key}'")
+                else:
+                    log.info(f"尝试删除不存在的翻译缓存键: {key}")
         except sqlite3.Error as e:
             log.error(f"删除翻译缓存数据失败 (键: {key}): {e}")
 
     def clear(self) -> None:
         """清空所有翻译缓存"""
         try:
-            conn = self._connect()
-            cursor = conn.cursor()
-            cursor.execute(f"DELETE FROM {TABLE_NAME}")
-            conn.commit()
-            log.info(f"翻译缓存表 '{TABLE_NAME}' 已清空")
+            with self._lock:
+                conn = self._connect()
+                cursor = conn.cursor()
+                cursor.execute(f"DELETE FROM {TABLE_NAME}")
+                conn.commit()
+                log.info(f"翻译缓存表 '{TABLE_NAME}' 已清空")
         except sqlite3.Error as e:
             log.error(f"清空翻译缓存失败: {e}")
 
@@ -198,19 +259,20 @@ class TranslationCacheManager(CacheInterface):
         返回包含 cache_key, original_text_sample, translated_text (sample), is_sensitive, last_updated 的字典列表。
         """
         try:
-            conn = self._connect()
-            cursor = conn.cursor()
-            cursor.execute(f"SELECT cache_key, original_text_sample, translated_text, is_sensitive, last_updated FROM {TABLE_NAME}")
-            rows = cursor.fetchall()
+            with self._lock:
+                conn = self._connect()
+                cursor = conn.cursor()
+                cursor.execute(f"SELECT cache_key, original_text_sample, translated_text, is_sensitive, last_updated FROM {TABLE_NAME}")
+                rows = cursor.fetchall()
             
-            results = []
-            for row in rows:
-                entry = dict(row)
-                entry["is_sensitive"] = bool(entry.get("is_sensitive", 0)) # Ensure boolean
-                # Optionally, add a sample of translated_text if needed for display
-                # entry["translated_text_sample"] = entry.get("translated_text", "")[:50] + "..." if entry.get("translated_text") else ""
-                results.append(entry)
-            return results
+                results = []
+                for row in rows:
+                    entry = dict(row)
+                    entry["is_sensitive"] = bool(entry.get("is_sensitive", 0)) # Ensure boolean
+                    # Optionally, add a sample of translated_text if needed for display
+                    # entry["translated_text_sample"] = entry.get("translated_text", "")[:50] + "..." if entry.get("translated_text") else ""
+                    results.append(entry)
+                return results
         except sqlite3.Error as e:
             log.error(f"获取所有翻译缓存条目失败: {e}")
             return []
@@ -234,13 +296,15 @@ class TranslationCacheManager(CacheInterface):
 
     def close(self) -> None:
         """关闭数据库连接。"""
-        if self.conn:
-            try:
-                self.conn.close()
-                self.conn = None
-                log.info("翻译缓存数据库连接已关闭")
-            except sqlite3.Error as e:
-                log.error(f"关闭翻译数据库连接失败: {e}")
+        with self._lock:
+            if self.conn:
+                try:
+                    self._closed = True
+                    self.conn.close()
+                    self.conn = None
+                    log.info("翻译缓存数据库连接已关闭")
+                except sqlite3.Error as e:
+                    log.error(f"关闭翻译数据库连接失败: {e}")
 
     def __del__(self):
         self.close()
\ No newline at end of file
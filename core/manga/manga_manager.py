@@ -1,7 +1,15 @@
 # core/manga_manager.py
 
 import os
-from PySide6.QtCore import QObject, Signal  # 导入 PySide6 的信号
+import sys
+import atexit
+import threading
+import zipfile
+from difflib import SequenceMatcher
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, lru_cache
+import zhconv
+from PySide6.QtCore import QObject, Signal, QRunnable, QThreadPool  # 导入 PySide6 的信号
 from core.manga.manga_model import MangaInfo, MangaLoader
 from core.config import config
 from utils import manga_logger as log
@@ -10,11 +18,49 @@ from core.core_cache.cache_factory import get_cache_factory_instance # Added
 from core.core_cache.cache_interface import CacheInterface # Added
 
 
+# 参与相似度合并的标签前缀，其余标签原样保留
+_MERGEABLE_TAG_PREFIXES = ("作者", "作品", "汉化")
+
+
+@lru_cache(maxsize=65536)
+def _to_simplified(text):
+    """繁体转简体；标签在整个漫画库中大量重复，缓存转换结果"""
+    return zhconv.convert(text, "zh-hans")
+
+
+class _MangaPrefetchTask(QRunnable):
+    """后台预读后续漫画：读取ZIP目录/列出文件夹以预热系统缓存，不构建也不保留漫画对象"""
+
+    def __init__(self, file_paths):
+        super().__init__()
+        self.file_paths = file_paths
+
+    def run(self):
+        for file_path in self.file_paths:
+            try:
+                if os.path.isdir(file_path):
+                    with os.scandir(file_path) as entries:
+                        for _ in entries:
+                            pass
+                else:
+                    with zipfile.ZipFile(file_path) as zf:
+                        zf.infolist()
+            except Exception as e:
+                log.debug(f"预读漫画失败 {file_path}: {e}")
+
+
 class MangaManager(QObject):
+    # 预读（预热系统缓存）当前漫画之后的漫画数量
+    PREFETCH_COUNT = 3
+    # 翻页等高频操作触发的配置保存会合并，最后一次修改后延迟该秒数再写盘
+    CONFIG_SAVE_DELAY = 0.5
+
     # 信号定义
     data_loaded = Signal(list)
     data_loading = Signal()
+    scan_completed = Signal(list, set)  # 扫描完成后一次性发送 (漫画列表, 标签集合)
     data_load_failed = Signal(str)
+    data_unchanged = Signal()  # 重新扫描结果无变化时代替 scan_completed 结束加载状态
     tags_updated = Signal(set)
 
     filter_applied = Signal(list)
@@ -32,10 +78,10 @@ class MangaManager(QObject):
     def __init__(self, parent=None):
         super().__init__(parent=parent)
 
-        import inspect
-        caller_frame = inspect.currentframe().f_back
-        caller_info = inspect.getframeinfo(caller_frame)
-        log.info(f"MangaManager初始化 - 调用者: {caller_info.filename}:{caller_info.lineno} 函数: {caller_info.function}")
+        # 调用者信息仅在调试时记录；sys._getframe 不读取源码文件，远比 inspect.getframeinfo 轻量
+        if log.is_debug_enabled():
+            caller_frame = sys._getframe(1)
+            log.debug(f"MangaManager初始化 - 调用者: {caller_frame.f_code.co_filename}:{caller_frame.f_lineno} 函数: {caller_frame.f_code.co_name}")
         if self.parent: # Check if parent exists
              log.info(f"父类类型: {self.parent.__class__}")
         else:
@@ -46,14 +92,58 @@ class MangaManager(QObject):
         self.translation_cache_manager: CacheInterface = get_cache_factory_instance().get_manager("translation")
         # self.ocr_cache_manager: CacheInterface = get_cache_factory_instance().get_manager("ocr") # If needed directly
 
-        self.manga_list = []
+        self._manga_list = []
+        self._manga_by_path = {}  # 路径 -> manga_list 中的漫画对象，随列表增删同步维护
         self.tags = set()
         self.current_manga = None
 
+        # 延迟保存配置（应用不一定运行 Qt 事件循环，因此使用 threading.Timer 而不是 QTimer）
+        self._save_timer = None
+        self._save_timer_lock = threading.Lock()
+
+        # 延迟写入漫画列表缓存：缓存按目录整体存储，单本漫画变动也要序列化整个列表，
+        # 因此合并短时间内的多次变动后再写入
+        # 写入的数据（目录键与列表快照）在调度时于调用线程取得，定时器线程只做序列化与写入；
+        # 每次调度或取消都递增代号，已经触发的旧定时器据此放弃写入
+        self._cache_save_timer = None
+        self._cache_save_snapshot = None
+        self._cache_save_generation = 0
+        # 串行化延迟写入与取消：取消时等待正在进行的写入完成，之后的整体写入不会被旧快照覆盖
+        self._cache_write_lock = threading.Lock()
+
+        # 退出时写入尚未保存的延迟配置与缓存；close() 会注销，不再使用的实例不会被 atexit 一直持有
+        atexit.register(self._flush_pending_saves)
+
         log.info(
             f"MangaManager初始化完成，最新目录: {config.manga_dir.value}, 漫画数量: {len(self.manga_list)}"
         )
 
+    @property
+    def manga_list(self):
+        return self._manga_list
+
+    @manga_list.setter
+    def manga_list(self, mangas):
+        """整体替换漫画列表时重建路径索引"""
+        self._manga_list = mangas
+        self._manga_by_path = {manga.file_path: manga for manga in mangas}
+
+    def has_manga(self, file_path):
+        """列表中是否已有该路径的漫画"""
+        return file_path in self._manga_by_path
+
+    def get_manga_by_path(self, file_path):
+        """按路径查找列表中的漫画，不存在时返回 None"""
+        return self._manga_by_path.get(file_path)
+
+    def add_manga(self, manga):
+        """将漫画加入列表（按路径去重），返回是否新加入"""
+        if manga.file_path in self._manga_by_path:
+            return False
+        self._manga_list.append(manga)
+        self._manga_by_path[manga.file_path] = manga
+        return True
+
     def set_manga_dir(self, dir_path, force_rescan=False):
         log.info(f"设置漫画目录: {dir_path}")
         if os.path.exists(dir_path) and os.path.isdir(dir_path):
@@ -73,6 +163,77 @@ class MangaManager(QObject):
         except Exception as e:
             log.error(f"保存配置时发生错误: {str(e)}")
             
+    def schedule_config_save(self):
+        """延迟保存配置：CONFIG_SAVE_DELAY 秒内的多次修改只写一次磁盘"""
+        with self._save_timer_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self.CONFIG_SAVE_DELAY, self.flush_config_save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush_config_save(self):
+        """立即写入尚未保存的延迟配置"""
+        with self._save_timer_lock:
+            if self._save_timer is None:
+                return
+            self._save_timer.cancel()
+            self._save_timer = None
+        self.save_config()
+
+    def schedule_manga_cache_save(self):
+        """延迟写入当前目录的漫画列表缓存，CONFIG_SAVE_DELAY 秒内的多次变动只写一次；须在修改列表的线程中调用"""
+        with self._save_timer_lock:
+            if self._cache_save_timer is not None:
+                self._cache_save_timer.cancel()
+            self._cache_save_generation += 1
+            self._cache_save_snapshot = (
+                self.manga_list_cache_manager.generate_key(config.manga_dir.value),
+                list(self.manga_list),
+            )
+            self._cache_save_timer = threading.Timer(
+                self.CONFIG_SAVE_DELAY, self.flush_manga_cache_save, args=(self._cache_save_generation,)
+            )
+            self._cache_save_timer.daemon = True
+            self._cache_save_timer.start()
+
+    def flush_manga_cache_save(self, generation=None):
+        """
+        立即写入尚未保存的漫画列表缓存。
+        generation 由定时器传入，与当前代号不一致说明这次调度已被替换或取消，不再写入。
+        """
+        with self._cache_write_lock:
+            with self._save_timer_lock:
+                if self._cache_save_timer is None:
+                    return
+                if generation is not None and generation != self._cache_save_generation:
+                    return
+                self._cache_save_timer.cancel()
+                self._cache_save_timer = None
+                cache_key, mangas = self._cache_save_snapshot
+                self._cache_save_snapshot = None
+            self.manga_list_cache_manager.set(cache_key, mangas)
+
+    def _flush_pending_saves(self):
+        """立即写入所有尚未保存的延迟配置与漫画列表缓存"""
+        self.flush_config_save()
+        self.flush_manga_cache_save()
+
+    def close(self):
+        """写入尚未保存的数据并注销退出时的写入；实例不再使用时调用"""
+        atexit.unregister(self._flush_pending_saves)
+        self._flush_pending_saves()
+
+    def _cancel_manga_cache_save(self):
+        """放弃尚未执行的延迟缓存写入（随后会整体写入或清空缓存时使用）"""
+        with self._cache_write_lock:
+            with self._save_timer_lock:
+                self._cache_save_generation += 1
+                self._cache_save_snapshot = None
+                if self._cache_save_timer is not None:
+                    self._cache_save_timer.cancel()
+                    self._cache_save_timer = None
+
     def create_translator(self):
         """根据配置创建翻译器实例"""
         try:
@@ -118,6 +279,7 @@ class MangaManager(QObject):
         """清空所有加载的漫画数据和缓存"""
         log.info("开始清空所有漫画数据和缓存")
         self.manga_list.clear()
+        self._manga_by_path.clear()
         self.tags.clear()
         self.current_manga = None
         
@@ -125,7 +287,12 @@ class MangaManager(QObject):
         config.manga_dir.value = ""
         config.current_manga_path.value = ""
         config.current_page.value = 0
+        with self._save_timer_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
         self.save_config()
+        self._cancel_manga_cache_save()
 
         # 清空缓存
         self.clear_manga_cache()
@@ -156,62 +323,75 @@ class MangaManager(QObject):
                 cached_manga_data_list = self.manga_list_cache_manager.get(cache_key)
             
             current_scan_mangas = []
+            # 扫描结果是否与缓存不一致（有条目被重新加载或被丢弃），不一致时必须通知界面
+            scan_changed = True
             if cached_manga_data_list and not force_rescan:
                 log.info(f"从缓存加载漫画列表数据，共 {len(cached_manga_data_list)} 条记录")
-                
+
+                # 按所在目录批量列出一次取得修改时间，代替逐条 os.path.exists / getmtime
+                existing_mtimes = self._list_existing_mtimes(
+                    manga_data.get("file_path") for manga_data in cached_manga_data_list
+                )
+
+                # 第一遍：按缓存数据恢复漫画对象，需要重新加载的位置先占位为 None
+                restored = []
+                reload_indices = []
                 for manga_data in cached_manga_data_list:
                     file_path = manga_data.get("file_path")
                     if not file_path:
                         log.warning(f"缓存数据中缺少 file_path: {manga_data.get('title', 'N/A')}")
                         continue
 
-                    # is_manga_modified is now part of MangaListCacheManager
-                    if os.path.exists(file_path):
-                        try:
-                            manga = MangaInfo(file_path) # Recreate MangaInfo from path
-                            manga.title = manga_data.get("title", os.path.basename(file_path))
-                            manga.tags = set(manga_data.get("tags", []))
-                            manga.total_pages = manga_data.get("total_pages", 0)
-                            manga.is_valid = manga_data.get("is_valid", False) # Rely on cached validity
-                            manga.last_modified = manga_data.get("last_modified", 0)
-                            manga.pages = manga_data.get("pages", []) # Assuming pages are serializable
-                            # manga.is_translated = manga_data.get("is_translated", False) # If this field is used
-
-                            # 恢复页面尺寸分析数据
-                            manga.page_dimensions = manga_data.get("page_dimensions", [])
-                            manga.dimension_variance = manga_data.get("dimension_variance", None)
-                            manga.is_likely_manga = manga_data.get("is_likely_manga", None)
-                            if manga.is_valid: # Double check validity if needed, or trust cache
-                                current_scan_mangas.append(manga)
-                            else:
-                                log.warning(f"从缓存加载的漫画 {file_path} 无效，将尝试重新加载。")
-                                fresh_manga = MangaLoader.load_manga(file_path)
-                                if fresh_manga and fresh_manga.is_valid:
-                                    current_scan_mangas.append(fresh_manga)
-                        except Exception as e_load:
-                            log.error(f"从缓存数据创建 MangaInfo 对象失败 ({file_path}): {e_load}, 将尝试重新加载。")
-                            fresh_manga = MangaLoader.load_manga(file_path)
-                            if fresh_manga and fresh_manga.is_valid:
-                                current_scan_mangas.append(fresh_manga)
+                    manga = None
+                    current_mtime = existing_mtimes.get(file_path)
+                    if current_mtime is not None and current_mtime > manga_data.get("last_modified", 0):
+                        log.info(f"漫画文件在缓存之后被修改: {file_path}，将重新加载。")
+                    elif current_mtime is not None or os.path.exists(file_path):
+                        manga = self._restore_manga_from_cache(manga_data)
                     else:
                         log.info(f"漫画文件不存在于缓存: {file_path}，将重新加载。")
-                        manga = MangaLoader.load_manga(file_path)
-                        if manga and manga.is_valid:
-                            current_scan_mangas.append(manga)
-                        else:
-                            log.warning(f"无法加载漫画: {file_path}")
+                    if manga is None:
+                        reload_indices.append(len(restored))
+                    restored.append((file_path, manga))
+
+                # 第二遍：并发重新加载所有无法从缓存恢复的漫画，结果保持原有顺序
+                if reload_indices:
+                    max_workers = min(32, (os.cpu_count() or 1) * 4, len(reload_indices))
+                    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                        reloaded = executor.map(
+                            MangaLoader.load_manga,
+                            [restored[i][0] for i in reload_indices]
+                        )
+                        for i, fresh_manga in zip(reload_indices, reloaded):
+                            restored[i] = (restored[i][0], fresh_manga)
+
+                for file_path, manga in restored:
+                    if manga and manga.is_valid:
+                        current_scan_mangas.append(manga)
+                    else:
+                        log.warning(f"无法加载漫画: {file_path}")
+
+                scan_changed = bool(reload_indices) or len(current_scan_mangas) != len(cached_manga_data_list)
             else:
                 log.info(f"开始扫描漫画目录 (无缓存或强制重新扫描): {config.manga_dir.value}")
                 manga_files = MangaLoader.find_manga_files(config.manga_dir.value)
 
-                for file_path_scan in manga_files:
-                    # 根据配置决定是否进行尺寸分析
-                    analyze_dimensions = config.enable_dimension_analysis.value
-                    manga = MangaLoader.load_manga(file_path_scan, analyze_dimensions=analyze_dimensions)
+                # 根据配置决定是否进行尺寸分析、是否过滤非漫画文件（扫描前读取一次）
+                analyze_dimensions = config.enable_dimension_analysis.value
+                filter_non_manga = config.filter_non_manga.value
+
+                # 读取ZIP目录与列出文件夹是IO密集操作，用线程池并发加载；map 保持原有顺序
+                max_workers = min(32, (os.cpu_count() or 1) * 4)
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    loaded_mangas = list(executor.map(
+                        partial(MangaLoader.load_manga, analyze_dimensions=analyze_dimensions),
+                        manga_files
+                    ))
 
+                for file_path_scan, manga in zip(manga_files, loaded_mangas):
                     if manga and manga.is_valid:
                         # 根据配置决定是否过滤非漫画文件
-                        if config.filter_non_manga.value and manga.is_likely_manga is not None:
+                        if filter_non_manga and manga.is_likely_manga is not None:
                             if not manga.is_likely_manga:
                                 log.info(f"根据尺寸分析过滤非漫画文件: {file_path_scan} "
                                         f"(方差分数: {manga.dimension_variance:.3f})")
@@ -225,28 +405,29 @@ class MangaManager(QObject):
             # The `set` method of MangaListCacheManager expects a list of manga objects
             # or serializable dicts. current_scan_mangas contains MangaInfo objects.
             # The MangaListCacheManager's set method should handle serialization.
+            self._cancel_manga_cache_save()
             self.manga_list_cache_manager.set(cache_key, current_scan_mangas)
 
             # 合并新扫描到的漫画到主列表，并去重
-            existing_manga_paths = {manga.file_path for manga in self.manga_list}
-            
-            for manga in current_scan_mangas:
-                if manga.file_path not in existing_manga_paths:
-                    self.manga_list.append(manga)
-                    existing_manga_paths.add(manga.file_path) 
+            had_mangas = bool(self.manga_list)
+            added_count = sum(1 for manga in current_scan_mangas if self.add_manga(manga))
 
-            log.info(f"扫描完成，当前共加载 {len(self.manga_list)} 本漫画")
+            log.info(f"扫描完成，新增 {added_count} 本，当前共加载 {len(self.manga_list)} 本漫画")
 
-            # 重新收集所有漫画的标签
-            self.tags.clear() # 每次扫描后重新收集所有标签
-            for manga in self.manga_list:
-                self.tags.update(manga.tags)
+            # 重新收集所有漫画的标签，一次 union 合并全部标签集合
+            new_tags = set().union(*(manga.tags for manga in self.manga_list))
+            tags_changed = new_tags != self.tags
+            self.tags = new_tags
 
             log.info(f"标签收集完成，共收集 {len(self.tags)} 个标签")
 
-            self.data_loaded.emit(self.manga_list)
-            self.tags_updated.emit(self.tags)
-            self.filter_manga([])
+            # 列表和标签一次性通知，界面只需重置一次模型（相当于 data_loaded + tags_updated + 清空过滤）；
+            # 重新扫描完全命中缓存、没有新增漫画且标签不变时界面数据不变，只发送 data_unchanged 结束加载状态
+            if not had_mangas or scan_changed or added_count or tags_changed:
+                self.scan_completed.emit(self.manga_list, self.tags)
+            else:
+                log.debug("重新扫描结果无变化，跳过界面重绘")
+                self.data_unchanged.emit()
 
             # 恢复上次阅读状态
             # 访问 config 值时使用 .value
@@ -254,14 +435,7 @@ class MangaManager(QObject):
                 config.current_manga_path.value
             ):
                 # 访问 config 值时使用 .value
-                found_manga = next(
-                    (
-                        m
-                        for m in self.manga_list
-                        if m.file_path == config.current_manga_path.value
-                    ),
-                    None,
-                )
+                found_manga = self._manga_by_path.get(config.current_manga_path.value)
                 if found_manga:
                     self.set_current_manga(found_manga)
                     # 访问 config 值时使用 .value
@@ -272,6 +446,30 @@ class MangaManager(QObject):
             log.error(error_msg)
             self.data_load_failed.emit(error_msg)
 
+    @staticmethod
+    def _list_existing_mtimes(file_paths):
+        """
+        对每个父目录只做一次 os.scandir，返回其中实际存在的路径 -> 修改时间。
+        只对请求的路径调用 DirEntry.stat()（Linux 上每次都是一次系统调用），目录中的无关文件不 stat；
+        不在结果中的路径（如路径写法不一致）由调用者再用 os.path.exists 确认。
+        """
+        wanted_paths = {file_path for file_path in file_paths if file_path}
+        parent_dirs = {os.path.dirname(file_path) for file_path in wanted_paths}
+        existing_mtimes = {}
+        for parent_dir in parent_dirs:
+            try:
+                with os.scandir(parent_dir) as entries:
+                    for entry in entries:
+                        if entry.path not in wanted_paths:
+                            continue
+                        try:
+                            existing_mtimes[entry.path] = entry.stat().st_mtime
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return existing_mtimes
+
     def change_page(self, page_number):
         if self.current_manga is None:
             log.warning("未选择漫画，无法改变页码")
@@ -281,6 +479,7 @@ class MangaManager(QObject):
         if 0 <= page_number < total_pages:
             config.current_page.value = page_number  # 设置 config 值时使用 .value
             # self.current_page = page_number # 移除了 MangaManager 自身的页码属性
+            self.schedule_config_save()
             self.page_changed.emit(page_number)
         else:
             log.warning(f"页码超出范围: {page_number + 1}, 总页数: {total_pages}")
@@ -292,15 +491,7 @@ class MangaManager(QObject):
             return self.manga_list
 
         log.info(f"开始按标签过滤漫画，过滤标签: {tag_filters}")
-        filtered_list = []
-        for manga in self.manga_list:
-            match = True
-            for tag in tag_filters:
-                if tag not in manga.tags:
-                    match = False
-                    break
-            if match:
-                filtered_list.append(manga)
+        filtered_list = self.filter_manga_by_tags(tag_filters)
 
         log.info(
             f"过滤完成，从 {len(self.manga_list)} 本漫画中筛选出 {len(filtered_list)} 本"
@@ -308,15 +499,22 @@ class MangaManager(QObject):
         self.filter_applied.emit(filtered_list)
         return filtered_list
 
+    def filter_manga_by_tags(self, tag_filters):
+        """返回同时包含全部过滤标签的漫画，不发出界面信号；没有过滤标签时返回全部漫画"""
+        if not tag_filters:
+            return list(self.manga_list)
+        # 标签为 frozenset，issubset 在 C 层逐个查哈希表，没有 Python 层的逐标签循环
+        required_tags = frozenset(tag_filters)
+        return [manga for manga in self.manga_list if required_tags.issubset(manga.tags)]
+
     def translate_titles(self):
         if not config.translate_title.value:  # 访问 config 值时使用 .value
             return
 
-        import zhconv
-
         log.info("开始翻译作品名和标题")
         for manga in self.manga_list:
             if manga.title:
+                # 标题几乎各不相同，缓存不会命中，直接转换，避免挤掉 _to_simplified 中大量复用的标签结果
                 manga.title = zhconv.convert(manga.title, "zh-hans")
         log.info("作品名和标题翻译完成")
 
@@ -327,14 +525,12 @@ class MangaManager(QObject):
         Args:
             force_reanalyze: 是否强制重新分析（即使已有分析结果）
         """
-        from core.manga.manga_model import MangaLoader
-        import os
 
         # 筛选需要分析的ZIP漫画（排除文件夹）
         need_analysis = []
         for manga in self.manga_list:
             # 只分析ZIP文件，跳过文件夹
-            if os.path.isdir(manga.file_path):
+            if manga.is_dir:
                 continue
             if force_reanalyze or manga.dimension_variance is None:
                 need_analysis.append(manga)
@@ -343,7 +539,7 @@ class MangaManager(QObject):
         zip_count = 0
         analyzed_count = 0
         for manga in self.manga_list[:10]:  # 只检查前10个
-            if not os.path.isdir(manga.file_path):
+            if not manga.is_dir:
                 zip_count += 1
                 if manga.dimension_variance is not None:
                     analyzed_count += 1
@@ -355,26 +551,22 @@ class MangaManager(QObject):
             log.info("所有ZIP漫画都已有尺寸分析数据，无需重新分析")
             return 0
 
-        total_zip_count = len([m for m in self.manga_list if not os.path.isdir(m.file_path)])
+        total_zip_count = sum(1 for m in self.manga_list if not m.is_dir)
         log.info(f"开始为 {len(need_analysis)} 本ZIP漫画进行尺寸分析（总共 {total_zip_count} 本ZIP漫画）")
 
         analyzed_count = 0
         failed_count = 0
 
-        for i, manga in enumerate(need_analysis):
-            try:
-                log.info(f"正在分析 ({i+1}/{len(need_analysis)}): {manga.title}")
-
-                # 调用MangaLoader的尺寸分析方法
-                MangaLoader._analyze_manga_dimensions(manga)
+        # 尺寸分析主要是读取ZIP和解析图片头，由 MangaLoader.analyze_library 并发分析多本漫画
+        for i, (manga, error) in enumerate(MangaLoader.analyze_library(need_analysis)):
+            if error is None:
                 analyzed_count += 1
 
-                log.debug(f"完成尺寸分析: {manga.file_path}, "
+                log.info(f"完成尺寸分析 ({i+1}/{len(need_analysis)}): {manga.title}, "
                          f"方差分数={manga.dimension_variance:.3f}, "
                          f"可能是漫画={manga.is_likely_manga}")
-
-            except Exception as e:
-                log.error(f"尺寸分析失败 {manga.file_path}: {e}")
+            else:
+                log.error(f"尺寸分析失败 {manga.file_path}: {error}")
                 failed_count += 1
                 # 设置默认值，避免重复分析
                 manga.dimension_variance = 0.0
@@ -385,8 +577,8 @@ class MangaManager(QObject):
         # 更新缓存（保存分析结果）
         if analyzed_count > 0:
             try:
-                from core.config import config
                 cache_key = self.manga_list_cache_manager.generate_key(config.manga_dir.value)
+                self._cancel_manga_cache_save()
                 self.manga_list_cache_manager.set(cache_key, self.manga_list)
                 log.info("已保存尺寸分析结果到缓存")
             except Exception as e:
@@ -398,47 +590,57 @@ class MangaManager(QObject):
         if not config.simplify_chinese.value:  # 访问 config 值时使用 .value
             return
 
-        import zhconv
-
         for manga in self.manga_list:
-            simplified_tags = set()
-            for tag in manga.tags:
-                simplified_tag = zhconv.convert(tag, "zh-hans")
-                simplified_tags.add(simplified_tag)
-            manga.tags = simplified_tags
+            manga.tags = frozenset(_to_simplified(tag) for tag in manga.tags)
 
     def analyze_and_merge_tags(self, similarity_threshold=0.9):
         if not config.merge_tags.value:  # 访问 config 值时使用 .value
             return
 
-        from difflib import SequenceMatcher
-
+        matcher = SequenceMatcher(None)
+        # 可合并标签集合 -> 合并后保留的标签；同一作者/作品/汉化组的组合在库中大量重复，只需计算一次
+        merge_results = {}
         for manga in self.manga_list:
-            tags_list = list(manga.tags)
-            merged_tags = set()
-            while tags_list:
-                current_tag = tags_list.pop(0)
-                merged = False
-                if current_tag.startswith(("作者", "作品", "汉化")):
-                    for merged_tag in merged_tags:
-                        similarity = SequenceMatcher(
-                            None, current_tag, merged_tag
-                        ).ratio()
-                        if similarity >= similarity_threshold:
-                            merged = True
-                            break
-                if not merged:
-                    merged_tags.add(current_tag)
-            manga.tags = merged_tags
-
-    def save_config(self):
-        log.info(f"保存配置到文件: {config.config_file}")
-        try:
-            # 调用 config.save 方法保存所有 ConfigItem
-            config.save()
-            log.info("配置保存成功")
-        except Exception as e:
-            log.error(f"保存配置文件失败: {e}")
+            mergeable_tags = frozenset(
+                tag for tag in manga.tags if tag.startswith(_MERGEABLE_TAG_PREFIXES)
+            )
+            if not mergeable_tags:
+                continue
+            kept_tags = merge_results.get(mergeable_tags)
+            if kept_tags is None:
+                kept_tags = self._merge_similar_tags(mergeable_tags, matcher, similarity_threshold)
+                merge_results[mergeable_tags] = kept_tags
+            if len(kept_tags) < len(mergeable_tags):
+                manga.tags = frozenset((manga.tags - mergeable_tags).union(kept_tags))
+
+    @staticmethod
+    def _merge_similar_tags(tags, matcher, similarity_threshold):
+        """
+        按前缀分桶，只在同一前缀（作者/作品/汉化）的标签之间做相似度比较，
+        相似度达到阈值的标签只保留先出现的一个
+        """
+        buckets = {}
+        for tag in tags:
+            buckets.setdefault(tag[:2], []).append(tag)
+
+        kept_tags = []
+        for bucket in buckets.values():
+            merged_tags = []
+            for current_tag in bucket:
+                # SequenceMatcher 缓存 seq2 的分析结果，当前标签只需设置一次；
+                # 先用长度上界 real_quick_ratio 与字符计数上界 quick_ratio 排除，
+                # 只对可能达到阈值的标签计算代价较高的 ratio
+                matcher.set_seq2(current_tag)
+                for merged_tag in merged_tags:
+                    matcher.set_seq1(merged_tag)
+                    if (matcher.real_quick_ratio() >= similarity_threshold
+                            and matcher.quick_ratio() >= similarity_threshold
+                            and matcher.ratio() >= similarity_threshold):
+                        break
+                else:
+                    merged_tags.append(current_tag)
+            kept_tags.extend(merged_tags)
+        return kept_tags
 
     def rename_manga_file(self, manga, new_name):
         log.info(f"尝试重命名漫画: {manga.title} -> {new_name}")
@@ -455,10 +657,14 @@ class MangaManager(QObject):
                 log.error(f"文件已存在，无法重命名: {new_file_path}")
                 return False
 
+            # 先释放保持打开的ZIP句柄，Windows 上无法重命名仍被打开的文件
+            manga.close()
             os.rename(manga.file_path, new_file_path)
             old_title = manga.title
+            self._manga_by_path.pop(manga.file_path, None)
             manga.title = new_name
             manga.file_path = new_file_path
+            self._manga_by_path[new_file_path] = manga
 
             log.info(f"漫画重命名成功: {old_title} -> {manga.title}")
             self.file_renamed.emit(manga.file_path, new_file_path)
@@ -467,7 +673,7 @@ class MangaManager(QObject):
                 config.current_manga_path.value = (
                     new_file_path  # 设置 config 值时使用 .value
                 )
-                self.save_config()
+                self.schedule_config_save()
 
             return True
         except Exception as e:
@@ -477,35 +683,47 @@ class MangaManager(QObject):
     def set_current_manga(self, manga):
         if manga != self.current_manga:
             log.info(f"切换当前漫画: {manga.title if manga else 'None'}")
+
+            # 释放上一本漫画保持打开的ZIP句柄
+            if self.current_manga is not None:
+                self.current_manga.close()
             
             # 检查漫画文件是否存在，如果不存在则更新漫画列表
             if manga and not os.path.exists(manga.file_path):
                 log.warning(f"漫画文件不存在: {manga.file_path}，将从列表中移除")
                 self.manga_list = [m for m in self.manga_list if m.file_path != manga.file_path]
                 # 更新缓存
-                cache_key_update = self.manga_list_cache_manager.generate_key(config.manga_dir.value)
-                self.manga_list_cache_manager.set(cache_key_update, self.manga_list)
+                self.schedule_manga_cache_save()
                 self.current_manga = None
                 config.current_manga_path.value = ""
+                self.schedule_config_save()
                 self.current_manga_changed.emit(None)
                 return
             
             # 检查漫画文件是否被修改，如果被修改则重新加载
             if manga:
-                # is_manga_modified is now part of MangaListCacheManager
-                if self.manga_list_cache_manager.is_manga_modified(manga.file_path):
+                # 快速路径：修改时间与内存中记录一致时视为未修改，
+                # 只有不一致时才调用需要查询缓存数据库的 is_manga_modified
+                try:
+                    current_mtime = os.stat(manga.file_path).st_mtime
+                except OSError:
+                    current_mtime = 0
+                if (current_mtime != manga.last_modified
+                        and self.manga_list_cache_manager.is_manga_modified(manga.file_path)):
                     log.info(f"漫画文件已修改，重新加载: {manga.file_path}")
                     updated_manga = MangaLoader.load_manga(manga.file_path)
                     if updated_manga and updated_manga.is_valid:
                         # 更新列表中的漫画对象
                         for i, m_loop in enumerate(self.manga_list): # Renamed m to m_loop to avoid conflict
                             if m_loop.file_path == manga.file_path:
+                                m_loop.close()
                                 self.manga_list[i] = updated_manga
+                                self._manga_by_path[updated_manga.file_path] = updated_manga
                                 manga = updated_manga # Update the manga variable being processed
                                 break
-                        # 更新缓存
-                        cache_key_update_modified = self.manga_list_cache_manager.generate_key(config.manga_dir.value)
-                        self.manga_list_cache_manager.set(cache_key_update_modified, self.manga_list)
+                        # 只更新这一本漫画的缓存记录；缓存中还没有该漫画时再整体写入
+                        if not self.manga_list_cache_manager.update_manga(updated_manga):
+                            self.schedule_manga_cache_save()
             
             self.current_manga = manga
             config.current_manga_path.value = (
@@ -514,11 +732,48 @@ class MangaManager(QObject):
             # 调用 change_page，change_page 会负责更新 config.current_page
             self.change_page(0)
             self.current_manga_changed.emit(manga)
+            if manga:
+                self._prefetch_following(manga)
+
+    @staticmethod
+    def _restore_manga_from_cache(manga_data):
+        """根据缓存数据重建 MangaInfo，缓存记录无效或重建失败时返回 None"""
+        file_path = manga_data["file_path"]
+        try:
+            manga = MangaInfo(file_path) # Recreate MangaInfo from path
+            # 缓存记录总会写入标题，只有缺失时才用文件名
+            cached_title = manga_data.get("title")
+            manga.title = cached_title if cached_title is not None else os.path.basename(file_path)
+            manga.tags = frozenset(manga_data.get("tags", []))
+            manga.total_pages = manga_data.get("total_pages", 0)
+            manga.is_valid = manga_data.get("is_valid", False) # Rely on cached validity
+            manga.last_modified = manga_data.get("last_modified", 0)
+            manga.pages = manga_data.get("pages", []) # Assuming pages are serializable
+
+            # 恢复页面尺寸分析数据
+            manga.page_dimensions = manga_data.get("page_dimensions", [])
+            manga.dimension_variance = manga_data.get("dimension_variance", None)
+            manga.is_likely_manga = manga_data.get("is_likely_manga", None)
+        except Exception as e_load:
+            log.error(f"从缓存数据创建 MangaInfo 对象失败 ({file_path}): {e_load}, 将尝试重新加载。")
+            return None
+        if not manga.is_valid:
+            log.warning(f"从缓存加载的漫画 {file_path} 无效，将尝试重新加载。")
+            return None
+        return manga
+
+    def _prefetch_following(self, manga):
+        """在后台线程池中预热当前漫画之后 PREFETCH_COUNT 本漫画的系统缓存"""
+        try:
+            idx = self.manga_list.index(manga)
+        except ValueError:
+            return
+        following_paths = [m.file_path for m in self.manga_list[idx + 1:idx + 1 + self.PREFETCH_COUNT]]
+        if following_paths:
+            QThreadPool.globalInstance().start(_MangaPrefetchTask(following_paths))
 
     def set_current_manga_by_path(self, file_path):
-        found_manga = next(
-            (m for m in self.manga_list if m.file_path == file_path), None
-        )
+        found_manga = self._manga_by_path.get(file_path)
         if found_manga:
             self.set_current_manga(found_manga)
             # 访问 config 值时使用 .value
@@ -1,30 +1,109 @@
 import os
 import re
 import io
+import stat
+import threading
+from collections import OrderedDict
 from zipfile import ZipFile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import cv2
 import numpy as np
 from utils import manga_logger as log
+from core.config import config
 
 from PIL import Image
 
 
+# 标题元数据解析用到的正则表达式，模块加载时编译一次
+_PLATFORM_RE = re.compile(r"[\(（](.*?)[\)）](.*)")
+_DIGIT_RE = re.compile(r"\d")
+_GROUP_AUTHOR_RE = re.compile(r"\[(.*?) \((.*?)\)\]")
+_BRACKET_RE = re.compile(r"\[(.*?)\]")
+_EVENT_RE = re.compile(r"\(([Cc][0-9]+)\)(.*)")
+_SERIES_RE = re.compile(r"[\(（]([^()（）\d]*?)[\)）](?![^[]*\])")
+
+# 方括号标签分类：每类关键词合并为一个交替正则，一次扫描完成匹配
+_CN_TRANSLATION_RE = re.compile(r"中国翻[訳译]|中國翻[譯訳]")
+_TRANSLATION_RE = re.compile(r"汉化|漢化|翻[訳译譯]")
+_UNCENSORED_RE = re.compile(r"无修正|無修")  # "無修" 已覆盖 "無修正"
+
+# 尺寸一致性评分中各变异系数的权重，顺序为 宽度、高度、宽高比、面积
+_DIMENSION_CV_WEIGHTS = np.array([0.15, 0.15, 0.4, 0.3])
+
+# 尺寸分析抽样页码用的随机数生成器（PCG64），避免使用旧版全局 RandomState
+_PAGE_SAMPLE_RNG = np.random.default_rng()
+
+# ZIP 内排序后的图片文件列表缓存：(路径, 修改时间, 大小) -> 文件名元组，按最近使用淘汰
+_ZIP_LISTING_CACHE_SIZE = 256
+_zip_listing_cache = OrderedDict()
+_zip_listing_lock = threading.Lock()
+
+# 识别为漫画页面的图片扩展名（小写）
+_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp")
+# 全小写或全大写的扩展名可直接匹配，免去为每个文件名生成小写副本
+_IMAGE_EXTENSIONS_CASED = _IMAGE_EXTENSIONS + tuple(ext.upper() for ext in _IMAGE_EXTENSIONS)
+
+# 解码时直接输出RGB的标志（旧版 OpenCV 没有时为 None）
+_CV2_IMREAD_COLOR_RGB = getattr(cv2, "IMREAD_COLOR_RGB", None)
+
+# 并发列出目录的线程数
+_SCAN_WORKERS = 16
+
+# 获取图片尺寸时从ZIP中解压的头部字节数，足以覆盖常见JPEG/PNG/WebP的尺寸信息
+_IMAGE_HEADER_PROBE_SIZE = 64 * 1024
+
+def _remove_span(text, match):
+    """按匹配位置切掉已解析的部分；search 返回最左匹配，结果与 replace(group(0), "", 1) 一致"""
+    return (text[:match.start()] + text[match.end():]).strip()
+
+
+def _cv2_decode_rgb(decode, source):
+    """用 cv2.imdecode / cv2.imread 解码为RGB数组，失败返回 None。
+
+    OpenCV 4.11 起支持 IMREAD_COLOR_RGB，解码时直接输出RGB，省去一次 cvtColor 的整幅拷贝
+    """
+    if _CV2_IMREAD_COLOR_RGB is not None:
+        return decode(source, _CV2_IMREAD_COLOR_RGB)
+    image = decode(source, cv2.IMREAD_COLOR)
+    if image is None:
+        return None
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+def _has_image_extension(name):
+    """文件名是否为图片；常见的全小写/全大写扩展名直接匹配，只有大小写混合时才转小写比较"""
+    return name.endswith(_IMAGE_EXTENSIONS_CASED) or name.lower().endswith(_IMAGE_EXTENSIONS)
+
+
 class MangaInfo:
-    def __init__(self, file_path):
+    def __init__(self, file_path, stat_result=None):
         self.file_path = file_path
         self.title = os.path.basename(file_path)
-        self.tags = set()
+        self.tags = frozenset()
         self.current_page = 0
         self.total_pages = 0
         self.is_valid = False
         self.pages = []  # 存储页面路径
-        self.last_modified = os.path.getmtime(file_path) if os.path.exists(file_path) else 0  # 获取文件最后修改时间
+        # 一次 stat 同时取得最后修改时间和是否为文件夹漫画，之后直接读取属性，不再重复访问文件系统；
+        # 调用方已经 stat 过时可直接传入 stat_result
+        try:
+            file_stat = stat_result if stat_result is not None else os.stat(file_path)
+            self.last_modified = file_stat.st_mtime
+            self.is_dir = stat.S_ISDIR(file_stat.st_mode)
+        except OSError:
+            self.last_modified = 0
+            self.is_dir = False
 
         # 页面尺寸分析相关属性
-        self.page_dimensions = []  # 存储每页的尺寸 [(width, height), ...]
+        self.page_dimensions = []  # 存储每页的尺寸，分析后为 (N, 2) 的 int32 数组；从缓存恢复时为 [[width, height], ...]
         self.dimension_variance = None  # 尺寸方差分数 (0-1, 越小越一致)
         self.is_likely_manga = None  # 基于尺寸分析的漫画可能性判断
 
+        # 阅读ZIP漫画时保持打开的文件句柄，连续翻页不必每页重新打开并解析中央目录；切换漫画时调用 close()
+        self._zip_handle = None
+        self._zip_handle_key = None
+        self._zip_lock = threading.Lock()
+
         self._parse_metadata()
 
     def get_page_path(self, page_index):
@@ -36,145 +115,135 @@ class MangaInfo:
             return self.pages[page_index]
         return None
 
+    def _get_zip_handle(self, file_stat):
+        """返回保持打开的ZIP句柄（调用方需持有 _zip_lock）；文件被修改后重新打开"""
+        handle_key = (file_stat.st_mtime_ns, file_stat.st_size)
+        if self._zip_handle is None or self._zip_handle_key != handle_key:
+            if self._zip_handle is not None:
+                self._zip_handle.close()
+                self._zip_handle = None
+            self._zip_handle = ZipFile(self.file_path, "r")
+            self._zip_handle_key = handle_key
+        return self._zip_handle
+
+    def close(self):
+        """关闭保持打开的ZIP句柄"""
+        with self._zip_lock:
+            if self._zip_handle is not None:
+                try:
+                    self._zip_handle.close()
+                except Exception as e:
+                    log.debug(f"关闭ZIP文件失败 {self.file_path}: {e}")
+                self._zip_handle = None
+                self._zip_handle_key = None
+
     def _parse_metadata(self):
+        tags = set()
+
         # 保存原始文件名
         original_title = os.path.splitext(self.title)[0]  # 移除扩展名
 
         # 解析杂志/平台信息 (Fantia) 等
-        platform_match = re.match(r"[\(（](.*?)[\)）](.*)", original_title)
+        platform_match = _PLATFORM_RE.match(original_title)
         if platform_match:
             platform = platform_match.group(1)
             # 排除版本号和包含数字的括号内容
-            if not re.search(r"\d", platform):
-                self.tags.add(f"平台:{platform}")
+            if not _DIGIT_RE.search(platform):
+                tags.add(f"平台:{platform}")
                 original_title = platform_match.group(2).strip()
 
         # 解析作者和团队 [团队 (作者)]
-        group_author_match = re.search(r"\[(.*?) \((.*?)\)\]", original_title)
+        group_author_match = _GROUP_AUTHOR_RE.search(original_title)
         if group_author_match:
-            self.tags.add(f"组:{group_author_match.group(1)}")
-            self.tags.add(f"作者:{group_author_match.group(2)}")
-            original_title = original_title.replace(
-                group_author_match.group(0), "", 1
-            ).strip()
+            tags.add(f"组:{group_author_match.group(1)}")
+            tags.add(f"作者:{group_author_match.group(2)}")
+            original_title = _remove_span(original_title, group_author_match)
         else:
             # 解析单独的作者 [作者]
-            author_match = re.search(r"\[(.*?)\]", original_title)
+            author_match = _BRACKET_RE.search(original_title)
             if author_match and "汉化" not in author_match.group(1):
-                self.tags.add(f"作者:{author_match.group(1)}")
-                original_title = original_title.replace(
-                    author_match.group(0), "", 1
-                ).strip()
+                tags.add(f"作者:{author_match.group(1)}")
+                original_title = _remove_span(original_title, author_match)
 
         # 解析会场信息 (C97) 等
-        event_match = re.match(r"\(([Cc][0-9]+)\)(.*)", original_title)
+        event_match = _EVENT_RE.match(original_title)
         if event_match:
-            self.tags.add(f"会场:{event_match.group(1)}")
+            tags.add(f"会场:{event_match.group(1)}")
             original_title = event_match.group(2).strip()
 
         # 解析作品名 (作品名)
         # 解析作品名，修改正则表达式以支持中文括号并排除包含数字的括号内容
-        series_match = re.search(
-            r"[\(（]([^()（）\d]*?)[\)）](?![^[]*\])", original_title
-        )
+        series_match = _SERIES_RE.search(original_title)
         if series_match and series_match.group(1).strip():
-            self.tags.add(f"作品:{series_match.group(1)}")
+            tags.add(f"作品:{series_match.group(1)}")
             # 移除作品名部分，保留主标题
             original_title = original_title[
                 : original_title.rfind(series_match.group(0))
             ].strip()
 
-        # 处理其他方括号标签
-        while True:
-            bracket_match = re.search(r"\[(.*?)\]", original_title)
-            if not bracket_match:
-                break
+        # 处理其他方括号标签：第一个匹配之前不会再有 "["，
+        # 因此逐个移除再重新搜索与一次 finditer 遍历得到的标签和剩余标题相同
+        for bracket_match in _BRACKET_RE.finditer(original_title):
             tag_content = bracket_match.group(1)
 
             # 改进汉化标签识别
-            if any(
-                keyword in tag_content
-                for keyword in ["中国翻訳", "中国翻译", "中國翻譯", "中國翻訳"]
-            ):
-                self.tags.add("汉化:中国翻译")
-            elif any(
-                keyword in tag_content
-                for keyword in ["汉化", "漢化", "翻訳", "翻译", "翻譯"]
-            ):
-                self.tags.add(f"汉化:{tag_content}")
-            elif any(
-                keyword in tag_content for keyword in ["無修正", "无修正", "無修"]
-            ):
-                self.tags.add("其他:无修正")
+            if _CN_TRANSLATION_RE.search(tag_content):
+                tags.add("汉化:中国翻译")
+            elif _TRANSLATION_RE.search(tag_content):
+                tags.add(f"汉化:{tag_content}")
+            elif _UNCENSORED_RE.search(tag_content):
+                tags.add("其他:无修正")
             else:
                 # 未知类型的标签
-                self.tags.add(f"其他:{tag_content}")
+                tags.add(f"其他:{tag_content}")
 
-            # 从标题中移除这个标签
-            original_title = original_title.replace(f"[{tag_content}]", "", 1).strip()
+        # 从标题中移除这些标签
+        original_title = _BRACKET_RE.sub("", original_title).strip()
 
         # 剩下的就是真正的标题
         clean_title = original_title.strip()
         if clean_title:
-            self.tags.add(f"标题:{clean_title}")
+            tags.add(f"标题:{clean_title}")
+
+        self.tags = frozenset(tags)
 
         # 验证：必须有作者和标题标签才是有效的漫画
-        has_author = any(tag.startswith("作者:") for tag in self.tags)
-        has_title = any(tag.startswith("标题:") for tag in self.tags)
+        has_author = any(tag.startswith("作者:") for tag in tags)
+        has_title = any(tag.startswith("标题:") for tag in tags)
         self.is_valid = has_author and has_title
 
     def analyze_page_dimensions(self):
         """分析页面尺寸一致性，计算方差分数"""
-        if not self.page_dimensions or len(self.page_dimensions) < 2:
+        if self.page_dimensions is None or len(self.page_dimensions) < 2:
             self.dimension_variance = 0.0
             self.is_likely_manga = True
             return
 
         try:
-            import numpy as np
-
-            # 转换为numpy数组便于计算
-            dimensions = np.array(self.page_dimensions)
+            # 转换为 (N, 4) 数组：宽、高、宽高比、面积，一次归约求出各列均值和标准差。
+            # 采样最多 30 页，numpy 的 std 先求均值再求偏差平方和，数值上是稳定的，
+            # 不需要额外的 JIT 或 Welford 实现
+            dimensions = np.asarray(self.page_dimensions, dtype=np.float64)
             widths = dimensions[:, 0]
             heights = dimensions[:, 1]
-
-            # 计算宽高比
-            aspect_ratios = widths / heights
-
-            # 计算面积
-            areas = widths * heights
+            features = np.column_stack((widths, heights, widths / heights, widths * heights))
+            means = features.mean(axis=0)
+            stds = features.std(axis=0)
 
             # 使用变异系数 (CV = std/mean) 来衡量一致性
-            # 变异系数对尺寸大小不敏感，更适合评估相对变化
-
-            # 宽度变异系数
-            width_cv = np.std(widths) / np.mean(widths) if np.mean(widths) > 0 else 0
-
-            # 高度变异系数
-            height_cv = np.std(heights) / np.mean(heights) if np.mean(heights) > 0 else 0
-
-            # 宽高比变异系数
-            ratio_cv = np.std(aspect_ratios) / np.mean(aspect_ratios) if np.mean(aspect_ratios) > 0 else 0
-
-            # 面积变异系数
-            area_cv = np.std(areas) / np.mean(areas) if np.mean(areas) > 0 else 0
+            # 变异系数对尺寸大小不敏感，更适合评估相对变化；均值不为正时记为 0
+            cvs = np.divide(stds, means, out=np.zeros_like(means), where=means > 0)
 
             # 综合方差分数：取各项变异系数的加权平均
             # 宽高比权重最高，因为漫画页面宽高比通常很一致
             # 面积权重次之，宽高权重较低
-            variance_score = (
-                ratio_cv * 0.4 +      # 宽高比权重40%
-                area_cv * 0.3 +       # 面积权重30%
-                width_cv * 0.15 +     # 宽度权重15%
-                height_cv * 0.15      # 高度权重15%
-            )
+            variance_score = float(cvs @ _DIMENSION_CV_WEIGHTS)
 
             # 限制分数在0-1范围内
             self.dimension_variance = min(variance_score, 1.0)
 
             # 判断是否可能是漫画
             # 使用配置中的阈值
-            from core.config import config
             manga_threshold = config.dimension_variance_threshold.value
             self.is_likely_manga = self.dimension_variance < manga_threshold
 
@@ -194,65 +263,87 @@ class MangaLoader:
     def __init__(self):
         cv2.ocl.setUseOpenCL(True)
 
+    @staticmethod
+    def _scan_dir_entries(directory):
+        """列出目录项；DirEntry 自带文件类型信息，判断文件/目录时无需额外 stat"""
+        try:
+            with os.scandir(directory) as entries:
+                return list(entries)
+        except OSError as e:
+            log.warning(f"无法读取目录 {directory}: {e}")
+            return []
+
     @staticmethod
     def find_manga_files(directory):
         """递归遍历目录查找漫画文件和图片文件夹"""
         manga_files = []
-        image_extensions = (".jpg", ".jpeg", ".png", ".gif", ".webp")
+
+        def has_images(entries):
+            # 检查目录是否包含图片文件 (不递归检查子目录)
+            return any(_has_image_extension(entry.name) and entry.is_file() for entry in entries)
+
+        def walk(entries, executor):
+            # 与 os.walk 自顶向下的顺序一致：先收集当前目录的ZIP和图片文件夹，再依次进入子目录。
+            # 每个目录只用 os.scandir 列出一次，同一份结果既用于判断是否含图片，也用于继续向下遍历
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir():
+                    subdirs.append(entry)
+                elif entry.name.lower().endswith(".zip"):
+                    manga_files.append(entry.path)
+
+            # 子目录的列出提交到线程池并发执行（网络盘等高延迟场景下重叠等待时间），
+            # 结果仍按原顺序取用；工作线程只做 scandir，不会等待其他任务
+            pending_scans = [
+                executor.submit(MangaLoader._scan_dir_entries, subdir.path)
+                for subdir in subdirs
+            ]
+
+            subdir_entries = []
+            for subdir, pending_scan in zip(subdirs, pending_scans):
+                child_entries = pending_scan.result()
+                if has_images(child_entries):
+                    manga_files.append(subdir.path)
+                # 与 os.walk 默认行为一致，不进入符号链接目录
+                if not subdir.is_symlink():
+                    subdir_entries.append(child_entries)
+
+            for child_entries in subdir_entries:
+                walk(child_entries, executor)
+
         try:
-            # 首先检查传入的directory本身是否是一个漫画文件夹
             if os.path.isdir(directory):
-                has_images_in_root = False
-                for item in os.listdir(directory):
-                    item_path = os.path.join(directory, item)
-                    if os.path.isfile(item_path) and item.lower().endswith(image_extensions):
-                        has_images_in_root = True
-                        break
-                if has_images_in_root:
+                root_entries = MangaLoader._scan_dir_entries(directory)
+                # 首先检查传入的directory本身是否是一个漫画文件夹
+                if has_images(root_entries):
                     manga_files.append(directory)
-
-            for root, dirs, files in os.walk(directory):
-                # 检查ZIP文件
-                for file in files:
-                    if file.lower().endswith(".zip"):
-                        full_path = os.path.join(root, file)
-                        manga_files.append(full_path)
-
-                # 检查图片文件夹 (不包含子目录)
-                for d in dirs:
-                    dir_path = os.path.join(root, d)
-                    # 检查目录是否包含图片文件 (不递归检查子目录)
-                    has_images = False
-                    for item in os.listdir(dir_path):
-                        item_path = os.path.join(dir_path, item)
-                        if os.path.isfile(item_path) and item.lower().endswith(image_extensions):
-                            has_images = True
-                            break # 找到图片文件即可
-
-                    if has_images:
-                        manga_files.append(dir_path)
+                with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as executor:
+                    walk(root_entries, executor)
         except Exception as e:
             log.error(f"遍历目录时发生错误: {str(e)}")
         return manga_files
 
     @staticmethod
     def load_manga(file_path, analyze_dimensions=True):
-        if not os.path.exists(file_path):
+        # 存在性检查与 MangaInfo 所需的修改时间共用同一次 stat
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
             log.warning(f"文件或目录不存在: {file_path}")
             return None
 
-        manga = MangaInfo(file_path)
+        manga = MangaInfo(file_path, file_stat)
 
-        if os.path.isdir(file_path):
+        if manga.is_dir:
             # 处理文件夹作为漫画
-            image_extensions = (".jpg", ".jpeg", ".png", ".gif", ".webp")
             try:
-                all_files = os.listdir(file_path)
-                image_files = [
-                    os.path.join(file_path, f)
-                    for f in all_files
-                    if os.path.isfile(os.path.join(file_path, f)) and f.lower().endswith(image_extensions)
-                ]
+                # scandir 的 DirEntry 自带文件类型，无需对每一项再调用 isfile
+                with os.scandir(file_path) as entries:
+                    image_files = [
+                        entry.path
+                        for entry in entries
+                        if _has_image_extension(entry.name) and entry.is_file()
+                    ]
                 image_files.sort()
 
                 if not image_files:
@@ -264,8 +355,9 @@ class MangaLoader:
 
                 if not manga.is_valid:
                     title_from_filename = os.path.basename(file_path)
-                    manga.tags.add(f"标题:{title_from_filename}")
-                    manga.tags.add("其他:文件夹漫画")
+                    manga.tags = frozenset(
+                        manga.tags | {f"标题:{title_from_filename}", "其他:文件夹漫画"}
+                    )
                     manga.is_valid = True
 
             except Exception as e:
@@ -279,7 +371,7 @@ class MangaLoader:
                     image_files = [
                         f
                         for f in all_files
-                        if f.lower().endswith((".jpg", ".jpeg", ".png", ".gif", ".webp"))
+                        if _has_image_extension(f)
                     ]
 
                     if not image_files and all_files:
@@ -294,8 +386,9 @@ class MangaLoader:
                         title_from_filename = os.path.splitext(
                             os.path.basename(file_path)
                         )[0]
-                        manga.tags.add(f"标题:{title_from_filename}")
-                        manga.tags.add("其他:未知")
+                        manga.tags = frozenset(
+                            manga.tags | {f"标题:{title_from_filename}", "其他:未知"}
+                        )
                         manga.is_valid = True
 
             except Exception as e:
@@ -307,6 +400,30 @@ class MangaLoader:
 
         return manga
 
+    @staticmethod
+    def analyze_library(mangas, max_workers=None):
+        """并发分析多本漫画的页面尺寸，按完成顺序逐本产出 (manga, error)，成功时 error 为 None。
+
+        分析以读取ZIP目录和解析图片头为主，PIL 与文件读取期间会释放 GIL，使用线程池即可重叠 I/O
+        """
+        if not mangas:
+            return
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(mangas))) as executor:
+            future_to_manga = {
+                executor.submit(MangaLoader._analyze_manga_dimensions, manga): manga
+                for manga in mangas
+            }
+            for future in as_completed(future_to_manga):
+                manga = future_to_manga[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    yield manga, e
+                else:
+                    yield manga, None
+
     @staticmethod
     def _analyze_manga_dimensions(manga):
         """分析漫画页面尺寸，提取尺寸信息（仅对ZIP文件进行分析）"""
@@ -314,7 +431,7 @@ class MangaLoader:
             return
 
         # 只对ZIP文件进行尺寸分析，文件夹结构的漫画不需要过滤
-        if os.path.isdir(manga.file_path):
+        if manga.is_dir:
             log.debug(f"跳过文件夹漫画的尺寸分析: {manga.file_path}")
             # 文件夹漫画默认认为是有效漫画
             manga.dimension_variance = None  # 设置为None表示不需要分析
@@ -332,36 +449,44 @@ class MangaLoader:
             elif total_pages <= 50:
                 # 10-50页，采样70%
                 sample_size = max(7, int(total_pages * 0.7))
-                sample_indices = np.random.choice(total_pages, sample_size, replace=False)
+                sample_indices = _PAGE_SAMPLE_RNG.choice(total_pages, sample_size, replace=False)
             else:
                 # 超过50页，采样30页
-                sample_indices = np.random.choice(total_pages, 30, replace=False)
+                sample_indices = _PAGE_SAMPLE_RNG.choice(total_pages, 30, replace=False)
 
-            dimensions = []
+            # 预分配 (N, 2) 的 int32 数组按行写入宽高，避免为每页创建元组，
+            # 分析时也无需再把元组列表转换为数组
+            dimensions = np.empty((len(sample_indices), 2), dtype=np.int32)
+            valid_count = 0
 
-            for i in sample_indices:
-                try:
-                    # 获取页面尺寸信息
-                    if os.path.isdir(manga.file_path):
-                        width, height = MangaLoader._get_page_dimensions_from_folder(manga, i)
-                    else:
-                        width, height = MangaLoader._get_page_dimensions_from_zip(manga, i)
+            # 整个采样过程只打开一次ZIP、只解析并排序一次文件列表
+            with ZipFile(manga.file_path, "r") as zip_file:
+                image_files = MangaLoader._list_zip_images(zip_file, os.stat(manga.file_path))
+                for i in sample_indices:
+                    if i >= len(image_files):
+                        continue
+                    try:
+                        # 获取页面尺寸信息
+                        width, height = MangaLoader._get_page_dimensions_from_open_zip(
+                            zip_file, image_files[i]
+                        )
 
-                    if width and height:
-                        dimensions.append((width, height))
+                        if width and height:
+                            dimensions[valid_count] = (width, height)
+                            valid_count += 1
 
-                except Exception as e:
-                    log.debug(f"获取页面 {i} 尺寸失败: {e}")
-                    continue
+                    except Exception as e:
+                        log.debug(f"获取页面 {i} 尺寸失败: {e}")
+                        continue
 
             # 更新漫画对象的尺寸信息
-            manga.page_dimensions = dimensions
+            manga.page_dimensions = dimensions[:valid_count]
 
             # 执行尺寸分析
             manga.analyze_page_dimensions()
 
             log.info(f"尺寸分析完成: {manga.file_path}, "
-                    f"采样页数={len(dimensions)}/{total_pages}, "
+                    f"采样页数={valid_count}/{total_pages}, "
                     f"方差分数={manga.dimension_variance:.3f}, "
                     f"可能是漫画={manga.is_likely_manga}")
 
@@ -372,42 +497,78 @@ class MangaLoader:
             manga.dimension_variance = 0.0
             manga.is_likely_manga = True
 
+    @staticmethod
+    def _list_zip_images(zip_file, file_stat=None):
+        """列出ZIP中的图片文件并排序，顺序与页码对应。
+
+        传入 file_stat 时按 (路径, 修改时间, 大小) 缓存结果，翻页时不再重复过滤和排序文件列表；
+        文件被修改后键随之变化，旧结果自然失效
+        """
+        cache_key = None
+        if file_stat is not None:
+            cache_key = (zip_file.filename, file_stat.st_mtime_ns, file_stat.st_size)
+            with _zip_listing_lock:
+                image_files = _zip_listing_cache.get(cache_key)
+                if image_files is not None:
+                    _zip_listing_cache.move_to_end(cache_key)
+                    return image_files
+
+        image_files = tuple(sorted(
+            f for f in zip_file.namelist()
+            if _has_image_extension(f)
+        ))
+
+        if cache_key is not None:
+            with _zip_listing_lock:
+                _zip_listing_cache[cache_key] = image_files
+                if len(_zip_listing_cache) > _ZIP_LISTING_CACHE_SIZE:
+                    _zip_listing_cache.popitem(last=False)
+        return image_files
+
+    @staticmethod
+    def _get_page_dimensions_from_open_zip(zip_file, file_name):
+        """从已打开的ZIP文件中获取指定图片的尺寸（不加载完整图像）"""
+        try:
+            # 尺寸信息位于文件头部，只解压开头一段交给PIL解析，不解压整张图片
+            with zip_file.open(file_name) as image_stream:
+                header_data = image_stream.read(_IMAGE_HEADER_PROBE_SIZE)
+            try:
+                with Image.open(io.BytesIO(header_data)) as pil_image:
+                    return pil_image.size  # 返回 (width, height)
+            except Exception:
+                if len(header_data) < _IMAGE_HEADER_PROBE_SIZE:
+                    raise
+                # 头部超出探测范围（如带大块EXIF/ICC的JPEG），退回读取完整数据
+                with Image.open(io.BytesIO(zip_file.read(file_name))) as pil_image:
+                    return pil_image.size
+
+        except Exception as e:
+            log.debug(f"获取ZIP页面尺寸失败 {file_name}: {e}")
+            return None, None
+
     @staticmethod
     def _get_page_dimensions_from_zip(manga, page_index):
         """从ZIP文件获取页面尺寸（不加载完整图像）"""
         try:
             with ZipFile(manga.file_path, "r") as zip_file:
-                image_files = [
-                    f for f in zip_file.namelist()
-                    if f.lower().endswith((".jpg", ".jpeg", ".png", ".gif", ".webp"))
-                ]
-
+                image_files = MangaLoader._list_zip_images(zip_file, os.stat(manga.file_path))
                 if page_index >= len(image_files):
                     return None, None
-
-                image_files.sort()
-                file_name = image_files[page_index]
-
-                # 读取图像数据
-                image_data = zip_file.read(file_name)
-
-                # 使用PIL快速获取尺寸（不加载完整图像）
-                image_io = io.BytesIO(image_data)
-                with Image.open(image_io) as pil_image:
-                    return pil_image.size  # 返回 (width, height)
+                return MangaLoader._get_page_dimensions_from_open_zip(
+                    zip_file, image_files[page_index]
+                )
 
         except Exception as e:
-            log.debug(f"获取ZIP页面尺寸失败 {file_name}: {e}")
+            log.debug(f"获取ZIP页面尺寸失败 {manga.file_path}: {e}")
             return None, None
 
     @staticmethod
     def _get_page_dimensions_from_folder(manga, page_index):
         """从文件夹获取页面尺寸（不加载完整图像）"""
         try:
-            image_extensions = (".jpg", ".jpeg", ".png", ".gif", ".webp")
             image_files = [
                 f for f in os.listdir(manga.file_path)
-                if f.lower().endswith(image_extensions)
+                if _has_image_extension(f)
             ]
 
             if page_index >= len(image_files):
@@ -426,43 +587,57 @@ class MangaLoader:
 
 
 
-    def get_page_image(self, manga, page_index):
-        """获取指定页面的漫画图像"""
+    def get_page_image(self, manga, page_index, target_size=None):
+        """获取指定页面的漫画图像
+
+        target_size 为 (宽, 高) 时表示调用方只需要不小于该尺寸的图像（例如随后会缩小显示），
+        JPEG 会在解码阶段直接按比例缩小，省去大部分解码工作
+        """
         # 根据漫画类型调用不同的图像获取方法
-        if os.path.isdir(manga.file_path):
-            image = MangaLoader._get_page_image_from_folder(manga, page_index)
+        if manga.is_dir:
+            image = MangaLoader._get_page_image_from_folder(manga, page_index, target_size)
         else: # 默认为ZIP文件
-            image = MangaLoader._get_page_image_from_zip(manga, page_index)
+            image = MangaLoader._get_page_image_from_zip(manga, page_index, target_size)
 
         return image
 
+    @staticmethod
+    def _decode_image_reduced(source, target_size):
+        """用Pillow解码图像，JPEG通过 draft 在解码时按 1/2、1/4、1/8 缩小，结果不小于 target_size；返回RGB数组"""
+        with Image.open(source) as pil_image:
+            pil_image.draft("RGB", target_size)
+            if pil_image.mode != "RGB":
+                pil_image = pil_image.convert("RGB")
+            return np.array(pil_image)
+
 
 
     @staticmethod
-    def _get_page_image_from_zip(manga, page_index):
+    def _get_page_image_from_zip(manga, page_index, target_size=None):
         """从ZIP文件读取图像数据"""
         # 参数验证
-        if not manga or not os.path.exists(manga.file_path):
+        try:
+            file_stat = os.stat(manga.file_path) if manga else None
+        except OSError:
+            file_stat = None
+        if file_stat is None:
             log.warning(
                 f"无效的漫画对象或文件不存在: {getattr(manga, 'file_path', None)}"
             )
             return None
 
         try:
-            with ZipFile(manga.file_path, "r") as zip_file:
-                # 获取并过滤图像文件
-                image_files = [
-                    f
-                    for f in zip_file.namelist()
-                    if f.lower().endswith((".jpg", ".jpeg", ".png", ".gif", ".webp"))
-                ]
+            # 持有该漫画的锁完成"取得ZIP句柄 + 读取压缩数据"，解码在锁外进行
+            with manga._zip_lock:
+                zip_file = manga._get_zip_handle(file_stat)
+
+                # 获取过滤并排序后的图像文件列表（按文件状态缓存）
+                image_files = MangaLoader._list_zip_images(zip_file, file_stat)
 
                 if not image_files:
                     log.debug(f"ZIP中未找到图片文件: {manga.file_path}")
                     return None
 
-                image_files.sort()
-
                 # 页码验证
                 if page_index < 0 or page_index >= len(image_files):
                     log.warning(f"无效页码: {page_index} (总数: {len(image_files)})")
@@ -470,51 +645,55 @@ class MangaLoader:
 
                 # 读取图像数据
                 file_name = image_files[page_index]
+                image_data = zip_file.read(file_name)
+        except Exception as e:
+            log.error(f"处理ZIP文件时出错({manga.file_path}): {str(e)}")
+            manga.close()
+            return None
+
+        try:
+            if not image_data:
+                log.error(f"空图像数据: {file_name}")
+                return None
+
+            if target_size:
                 try:
-                    image_data = zip_file.read(file_name)
-                    if not image_data:
-                        log.error(f"空图像数据: {file_name}")
-                        return None
+                    return MangaLoader._decode_image_reduced(io.BytesIO(image_data), target_size)
+                except Exception as e:
+                    log.debug(f"缩小解码失败，按原尺寸解码: {file_name}: {e}")
+
+            # 首先尝试使用OpenCV解码（直接得到RGB）
+            nparr = np.frombuffer(image_data, np.uint8)
+            image = _cv2_decode_rgb(cv2.imdecode, nparr)
+
+            if image is None:
+                log.warning(f"OpenCV无法解码图像，尝试使用Pillow: {file_name}")
+                try:
+                    # 使用Pillow尝试解码
+                    image_io = io.BytesIO(image_data)
+                    pil_image = Image.open(image_io)
+
+                    # 确保图像被完全加载
+                    pil_image.load()
 
-                    # 首先尝试使用OpenCV解码
-                    nparr = np.frombuffer(image_data, np.uint8)
-                    image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-
-                    if image is None:
-                        log.warning(f"OpenCV无法解码图像，尝试使用Pillow: {file_name}")
-                        try:
-                            # 使用Pillow尝试解码
-                            image_io = io.BytesIO(image_data)
-                            pil_image = Image.open(image_io)
-                            
-                            # 确保图像被完全加载
-                            pil_image.load()
-                            
-                            # 转换为RGB模式
-                            if pil_image.mode != 'RGB':
-                                pil_image = pil_image.convert('RGB')
-                            
-                            # 转换为OpenCV格式
-                            image = np.array(pil_image)
-                            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-                        except Exception as e:
-                            log.error(f"Pillow也无法解码图像({file_name}): {str(e)}")
-                            return None
-                    
-                    # 转换为RGB格式
-                    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                    return image
+                    # 转换为RGB模式
+                    if pil_image.mode != 'RGB':
+                        pil_image = pil_image.convert('RGB')
 
+                    # Pillow 解码结果已是RGB，无需再转换
+                    image = np.array(pil_image)
                 except Exception as e:
-                    log.error(f"处理图像时出错({file_name}): {str(e)}")
+                    log.error(f"Pillow也无法解码图像({file_name}): {str(e)}")
                     return None
 
+            return image
+
         except Exception as e:
-            log.error(f"处理ZIP文件时出错({manga.file_path}): {str(e)}")
+            log.error(f"处理图像时出错({file_name}): {str(e)}")
             return None
 
     @staticmethod
-    def _get_page_image_from_folder(manga, page_index):
+    def _get_page_image_from_folder(manga, page_index, target_size=None):
         """从文件夹读取图像数据"""
         if not manga or not os.path.exists(manga.file_path) or not os.path.isdir(manga.file_path):
             log.warning(f"无效的漫画对象或目录不存在: {getattr(manga, 'file_path', None)}")
@@ -531,9 +710,15 @@ class MangaLoader:
                 log.error(f"图片文件不存在: {image_path}")
                 return None
 
+            if target_size:
+                try:
+                    return MangaLoader._decode_image_reduced(image_path, target_size)
+                except Exception as e:
+                    log.debug(f"缩小解码失败，按原尺寸解码: {image_path}: {e}")
+
             try:
-                # 首先尝试使用OpenCV解码
-                image = cv2.imread(image_path, cv2.IMREAD_COLOR)
+                # 首先尝试使用OpenCV解码（直接得到RGB）
+                image = _cv2_decode_rgb(cv2.imread, image_path)
 
                 if image is None:
                     log.warning(f"OpenCV无法解码图像，尝试使用Pillow: {image_path}")
@@ -548,15 +733,12 @@ class MangaLoader:
                         if pil_image.mode != 'RGB':
                             pil_image = pil_image.convert('RGB')
                         
-                        # 转换为OpenCV格式
+                        # Pillow 解码结果已是RGB，无需再转换
                         image = np.array(pil_image)
-                        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
                     except Exception as e:
                         log.error(f"Pillow也无法解码图像({image_path}): {str(e)}")
                         return None
-                
-                # 转换为RGB格式
-                image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
                 return image
 
             except Exception as e:
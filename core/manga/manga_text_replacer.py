@@ -471,7 +471,14 @@ class MangaTextReplacer:
     
     def _inpaint_background(self, image: np.ndarray,
                            bbox: List[List[int]]) -> np.ndarray:
-        """直接将文本区域涂白"""
+        """直接将文本区域涂白（返回新图像）"""
+        inpainted_image = image.copy()
+        self._inpaint_background_inplace(inpainted_image, bbox)
+        return inpainted_image
+
+    def _inpaint_background_inplace(self, image: np.ndarray,
+                                    bbox: List[List[int]]) -> None:
+        """直接在传入的图像上将文本区域涂白，不复制整张图像"""
         try:
             # 计算边界框，考虑文本周围留白
             points = np.array(bbox, dtype=np.int32)
@@ -488,25 +495,27 @@ class MangaTextReplacer:
             x_max = min(image.shape[1], x_max + padding)
             y_max = min(image.shape[0], y_max + padding)
 
-            # 创建一个与原始图像相同类型的白色区域
-            white_patch = np.full((y_max - y_min, x_max - x_min, image.shape[2]), 
-                                  255, dtype=image.dtype)
-            
-            # 将白色区域复制到图像的指定位置
-            inpainted_image = image.copy()
-            inpainted_image[y_min:y_max, x_min:x_max] = white_patch
-            
-            return inpainted_image
+            # 将图像的指定区域原地填充为白色
+            image[y_min:y_max, x_min:x_max] = 255
 
         except Exception as e:
             log.error(f"背景涂白失败: {e}", exc_info=True)
-            return image.copy() # 返回原始图像副本以避免崩溃
 
     def _draw_text_with_layout(self, image: np.ndarray, 
                                replacement: MangaTextReplacement) -> np.ndarray:
         """根据布局绘制文本"""
         try:
             pil_image = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+            self._draw_text_on_pil(pil_image, replacement)
+            return cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+        except Exception as e:
+            log.error(f"绘制文本时出错: {e}", exc_info=True)
+            return image # 返回原始图像
+
+    def _draw_text_on_pil(self, pil_image: Image.Image,
+                          replacement: MangaTextReplacement) -> None:
+        """在PIL图像上原地绘制单个文本块"""
+        try:
             draw = ImageDraw.Draw(pil_image)
             font = self._get_font(replacement.font_size)
             
@@ -529,11 +538,8 @@ class MangaTextReplacer:
                     draw, replacement, font,
                     box_center_x, box_center_y, box_width, box_height
                 )
-
-            return cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
         except Exception as e:
             log.error(f"绘制文本时出错: {e}", exc_info=True)
-            return image # 返回原始图像
 
     def _draw_horizontal_text(self, draw: ImageDraw.Draw, 
                               replacement: MangaTextReplacement, 
@@ -671,15 +677,17 @@ class MangaTextReplacer:
         """
         processed_image = image.copy()
         
+        if inpaint_background:
+            # 修复背景（简单的颜色填充），在同一副本上原地完成
+            for replacement in replacements:
+                self._inpaint_background_inplace(processed_image, replacement.bbox)
+        
+        # 只做一次 BGR->RGB->PIL 转换，所有文本块绘制在同一张PIL图像上
+        pil_image = Image.fromarray(cv2.cvtColor(processed_image, cv2.COLOR_BGR2RGB))
         for replacement in replacements:
-            if inpaint_background:
-                # 修复背景（例如，使用内容感知填充或简单的颜色填充）
-                processed_image = self._inpaint_background(processed_image, replacement.bbox)
-            
-            # 绘制文本
-            processed_image = self._draw_text_with_layout(processed_image, replacement)
+            self._draw_text_on_pil(pil_image, replacement)
             
-        return processed_image
+        return cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
 
     def process_manga_image(self, image: np.ndarray, 
                             structured_texts: List[OCRResult], # 修改类型注解
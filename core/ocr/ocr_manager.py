@@ -1,10 +1,11 @@
 # core/ocr_manager.py
 
 import os
+import re
 import cv2
 import time
 import numpy as np
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Iterable
 from PySide6.QtCore import QObject, Signal, QThread
 from utils import manga_logger as log
 from core.config import config
@@ -15,6 +16,13 @@ from OnnxOCR.onnxocr.onnx_paddleocr import ONNXPaddleOcr
 
 # OCRResult class definition is removed from here
 
+# 纯数字/符号文本的匹配模式，模块加载时编译一次
+_NUMERIC_SYMBOL_PATTERN = re.compile(r'[\d\s,.。:：\-_/\\+=\(\)\[\]【】［］（）\{\}]*')
+
+# 文本存在性预检：缩略图拉普拉斯响应均值低于该值的页面视为没有可识别文字
+_TEXT_PRESENCE_SIZE = 224
+_TEXT_PRESENCE_EDGE_THRESHOLD = 2.0
+
 
 class OCRWorker(QThread): # This worker will now also need file_path and page_num for caching
     """OCR工作线程"""
@@ -114,7 +122,12 @@ class OCRManager(QObject):
             'use_gpu': False,       # 是否使用GPU
             'det': True,            # 是否进行文本检测
             'rec': True,            # 是否进行文本识别
-            'cls': False             # 是否进行角度分类
+            'cls': False,            # 是否进行角度分类
+            'rec_batch_num': 16,     # 识别模型每次前向处理的文本框数量（默认6）
+            # 检测阶段只在缩小后的图像上进行：最长边缩放到不超过 det_limit_side_len
+            # （并对齐到32的倍数），检测框会映射回原图坐标，识别仍使用原分辨率裁剪
+            'det_limit_side_len': 960,
+            'det_limit_type': 'max'
         }
         
         log.info("OCRManager初始化完成")
@@ -142,6 +155,35 @@ class OCRManager(QObject):
             self.is_model_loaded = False
             self.model_load_error.emit(error_msg)
     
+    def get_quantized_model_options(self) -> Dict[str, Any]:
+        """
+        获取INT8量化的检测/识别模型路径，作为 load_model 的 model_options。
+
+        量化模型放在原始ONNX模型旁（*.int8.onnx），不存在时使用
+        onnxruntime.quantization 对原模型做一次动态量化生成。
+        任何一步失败都返回空字典，即继续使用原始FP32模型。
+        """
+        try:
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+            from OnnxOCR.onnxocr.utils import infer_args
+
+            defaults = {action.dest: action.default for action in infer_args()._actions}
+            quantized_options = {}
+            for option_key in ('det_model_dir', 'rec_model_dir'):
+                model_path = defaults.get(option_key)
+                if not model_path or not os.path.isfile(model_path):
+                    log.warning(f"未找到原始OCR模型 ({option_key}: {model_path})，跳过量化")
+                    continue
+                quantized_path = os.path.splitext(model_path)[0] + ".int8.onnx"
+                if not os.path.exists(quantized_path):
+                    log.info(f"生成INT8量化模型: {model_path} -> {quantized_path}")
+                    quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QUInt8)
+                quantized_options[option_key] = quantized_path
+            return quantized_options
+        except Exception as e:
+            log.warning(f"准备INT8量化OCR模型失败，将使用原始模型: {e}")
+            return {}
+
     def is_ready(self) -> bool:
         """检查OCR引擎是否准备就绪"""
         return self.is_model_loaded and self.ocr_engine is not None
@@ -341,6 +383,10 @@ class OCRManager(QObject):
         current_ocr_options = self.ocr_options.copy()
         if options:
             current_ocr_options.update(options)
+
+        if config.ocr_skip_textless_pages.value and not self.has_text(image_data):
+            log.info(f"页面边缘特征过少，判定为无文字页面，跳过OCR (实际文件: {file_path_for_cache or 'N/A'}, 页码: {page_num_for_cache if page_num_for_cache is not None else 'N/A'})")
+            return []
         
         try:
             log_msg_ocr = f"开始同步OCR识别 (实际文件: {file_path_for_cache or 'N/A'}, 页码: {page_num_for_cache if page_num_for_cache is not None else 'N/A'}"
@@ -480,20 +526,10 @@ class OCRManager(QObject):
         Returns:
             过滤后的OCR结果列表
         """
-        # 输出过滤前的结果
-        print("OCR结果:")
-        for result in ocr_results:
-            print(f"文本: {result.text}, 置信度: {result.confidence}")
         filtered_results = [result for result in ocr_results 
                           if result.confidence >= min_confidence]
-        
-        # 输出过滤后的结果
-        print("\n过滤后的OCR结果:")
-        for result in filtered_results:
-            print(f"文本: {result.text}, 置信度: {result.confidence}")
 
-        print(f"置信度过滤: {len(ocr_results)} -> {len(filtered_results)} "
-                f"(阈值: {min_confidence})")
+        log.debug("置信度过滤: %d -> %d (阈值: %s)", len(ocr_results), len(filtered_results), min_confidence)
         
         return filtered_results
     
@@ -517,7 +553,7 @@ class OCRManager(QObject):
         # 返回一个表示合并后矩形的新 bbox (左上，右上，右下，左下)
         return [[min_x, min_y], [max_x, min_y], [max_x, max_y], [min_x, max_y]]
 
-    def _sort_and_group_ocr_results(self, ocr_results: List[OCRResult],
+    def _sort_and_group_ocr_results(self, ocr_results: Iterable[OCRResult],
                                      line_threshold_ratio: float = 0.05,
                                      column_threshold_ratio: float = 0.05) -> List[OCRResult]:
         """
@@ -527,10 +563,9 @@ class OCRManager(QObject):
         2. 对每组检测重叠的文本框
         3. 合并重叠的文本框
         4. 按阅读顺序排序文本（先列后行，从右到左，从上到下）
+
+        ocr_results 可以是任意可迭代对象（例如过滤用的生成器），只会被遍历一次。
         """
-        if not ocr_results:
-            return []
-        
         # 1. 按方向分组
         direction_groups = {}
         for result in ocr_results:
@@ -538,6 +573,9 @@ class OCRManager(QObject):
             if direction not in direction_groups:
                 direction_groups[direction] = []
             direction_groups[direction].append(result)
+
+        if not direction_groups:
+            return []
         
         merged_results = []
         
@@ -619,30 +657,93 @@ class OCRManager(QObject):
         
         return merged_results
  
-    def get_structured_text(self, ocr_results: List[OCRResult]) -> List[OCRResult]:
+    def get_structured_text(self, ocr_results: Iterable[OCRResult]) -> List[OCRResult]:
         """
         从OCR结果中提取结构化文本，并尝试合并多列文本。
         
         Args:
-            ocr_results: 原始OCR结果列表。
+            ocr_results: 原始OCR结果列表，或只遍历一次的可迭代对象（如过滤生成器）。
             
         Returns:
             合并之后的文本列表，每个元素是一个字典，包含文本和相关信息。
         """
-        if not ocr_results:
+        if ocr_results is None:
             return []
 
         # 进行结果合并
         processed_groups = self._sort_and_group_ocr_results(ocr_results)
 
         # 打印合并后的结果
-        log.info(f"结构化文本识别完成，共识别到 {len(processed_groups)} 个文本区域。")
-        for idx, result in enumerate(processed_groups):
-            log.debug(f"文本 {idx + 1}: {result.text}, 置信度: {result.confidence}, "
-                      f"方向: {result.direction}, 边界框: {result.bbox}, 合并数量: {result.merged_count}")
+        log.info("结构化文本识别完成，共识别到 %d 个文本区域。", len(processed_groups))
+        if log.is_debug_enabled():
+            log.debug("结构化文本:\n%s", "\n".join(
+                f"文本 {idx + 1}: {result.text}, 置信度: {result.confidence}, "
+                f"方向: {result.direction}, 边界框: {result.bbox}, 合并数量: {result.merged_count}"
+                for idx, result in enumerate(processed_groups)
+            ))
 
         return processed_groups
 
+    @staticmethod
+    def has_text(image_data: np.ndarray, threshold: float = _TEXT_PRESENCE_EDGE_THRESHOLD) -> bool:
+        """
+        快速判断页面是否可能包含文字：在缩小到 224x224 的灰度图上计算拉普拉斯响应均值。
+        空白页、纯色或大面积平滑渐变的页面响应很低，可直接跳过OCR。
+
+        Args:
+            image_data: 图像数据 (BGR 或灰度)
+            threshold: 判定阈值，均值低于该值视为无文字
+
+        Returns:
+            是否可能包含文字
+        """
+        if image_data is None or image_data.size == 0:
+            return False
+        gray = cv2.cvtColor(image_data, cv2.COLOR_BGR2GRAY) if image_data.ndim == 3 else image_data
+        small = cv2.resize(gray, (_TEXT_PRESENCE_SIZE, _TEXT_PRESENCE_SIZE), interpolation=cv2.INTER_AREA)
+        edge_response = float(np.abs(cv2.Laplacian(small, cv2.CV_16S)).mean())
+        return edge_response >= threshold
+
+    @classmethod
+    def is_pure_numeric_or_symbol(cls, text: str) -> bool:
+        """检查文本是否只包含数字和常见符号（忽略空白字符）"""
+        return _NUMERIC_SYMBOL_PATTERN.fullmatch(text) is not None
+
+    def structure_results(self, ocr_results: Iterable[OCRResult],
+                          min_confidence: Optional[float] = None) -> List[OCRResult]:
+        """
+        一次遍历完成置信度过滤、纯数字/符号过滤和结构化合并，不生成中间列表。
+
+        Args:
+            ocr_results: 原始OCR结果
+            min_confidence: 最小置信度，默认使用配置中的阈值
+
+        Returns:
+            结构化文本列表
+        """
+        if min_confidence is None:
+            min_confidence = config.ocr_confidence_threshold.value
+        return self.get_structured_text(
+            r for r in ocr_results
+            if r.confidence >= min_confidence and not self.is_pure_numeric_or_symbol(r.text)
+        )
+
+    def recognize_and_structure(self, image_data: np.ndarray,
+                                file_path_for_cache: Optional[str] = None,
+                                page_num_for_cache: Optional[int] = None,
+                                original_archive_path: Optional[str] = None,
+                                options: Optional[Dict[str, Any]] = None,
+                                min_confidence: Optional[float] = None) -> List[OCRResult]:
+        """同步识别图像（优先使用缓存）并直接返回过滤、合并后的结构化文本"""
+        ocr_results = self.recognize_image_data_sync(
+            image_data,
+            file_path_for_cache=file_path_for_cache,
+            page_num_for_cache=page_num_for_cache,
+            original_archive_path=original_archive_path,
+            options=options
+        )
+        return self.structure_results(ocr_results, min_confidence)
+
     def filter_numeric_and_symbols(self, ocr_results: List[OCRResult]) -> List[OCRResult]:
         """
         过滤掉纯数字和符号的OCR结果
@@ -653,17 +754,8 @@ class OCRManager(QObject):
         Returns:
             过滤后的OCR结果列表
         """
-        import re
-        
-        def is_pure_numeric_or_symbol(text: str) -> bool:
-            # 移除所有空白字符
-            text = ''.join(text.split())
-            # 检查是否只包含数字和常见符号
-            pattern = r'^[\d\s,.。:：\-_/\\+=\(\)\[\]【】［］（）\{\}]*$'
-            return bool(re.match(pattern, text))
-        
         filtered_results = [result for result in ocr_results 
-                          if not is_pure_numeric_or_symbol(result.text)]
+                          if not self.is_pure_numeric_or_symbol(result.text)]
         
         removed_count = len(ocr_results) - len(filtered_results)
         if removed_count > 0:
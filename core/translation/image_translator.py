@@ -3,16 +3,36 @@ import os
 import cv2
 import numpy as np
 import threading
-from typing import Optional, Dict, Any, Union, List
+import multiprocessing
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Dict, Any, Union, List, Tuple
 from pathlib import Path
 
 from core.ocr.ocr_manager import OCRManager, OCRResult
-from core.translation.translator import TranslatorFactory, ZhipuTranslator, GoogleDeepTranslator
+from core.translation.translator import TranslatorFactory, ZhipuTranslator, GoogleDeepTranslator, create_http_session
 from core.manga.manga_text_replacer import MangaTextReplacer
 from core.config import config
 from utils import manga_logger as log
 from core.harmonization_map_manager import get_harmonization_map_manager_instance
 
+# 启用 OpenCV 的 SIMD 优化路径。单张翻译时 OpenCV 使用全部核心；
+# 批量并行翻译时按并行数缩减每个工作者的 OpenCV 线程数，以并行处理多张图片代替单次调用内的并行，避免线程争抢
+cv2.setUseOptimized(True)
+
+
+def _opencv_threads_per_worker(n_workers: int) -> int:
+    """并行处理 n_workers 张图片时，每个工作者可用的 OpenCV 线程数"""
+    return max(1, (os.cpu_count() or 1) // max(1, n_workers))
+
+
+class _UncachedTranslation(Exception):
+    """翻译失败时抛出，使失败结果不被 lru_cache 记住"""
+
+    def __init__(self, text: str):
+        super().__init__(text)
+        self.text = text
+
 
 class ImageTranslator:
     """图片翻译器 - 提供完整的图片翻译功能"""
@@ -29,15 +49,24 @@ class ImageTranslator:
         """
         self.ocr_manager = None
         self.translator = None
+        self._http_session = None  # 翻译器共享的 HTTP 连接池会话
         self.harmonization_manager = None
         self.manga_text_replacer = None
 
+        # 构造时一次性解析翻译器类型与参数（缺省值取自配置），
+        # 之后的重新初始化和多进程工作进程都复用这份快照
+        self.translator_type = translator_type if translator_type is not None else config.translator_type.value
+        self.translator_kwargs = self._resolve_translator_settings(self.translator_type, translator_kwargs)
+
         # 添加取消机制
         self.cancel_flag = threading.Event()
         self.is_translating = False
 
+        # 单条文本翻译的实例内缓存，键为 (文本, 目标语言)，随实例一起释放，不影响其他实例
+        self._translate_text_cached = lru_cache(maxsize=4096)(self._translate_text_uncached)
+
         self._init_ocr_manager()
-        self._init_translator(translator_type if translator_type is not None else config.translator_type.value, **translator_kwargs)
+        self._init_translator(self.translator_type, **self.translator_kwargs)
         self._init_manga_text_replacer()
         self._init_harmonization_manager()
         
@@ -48,8 +77,16 @@ class ImageTranslator:
         try:
             log.info("开始初始化OCR管理器...")
             self.ocr_manager = OCRManager()
-            log.info("OCR管理器实例创建成功，开始加载模型...")
-            self.ocr_manager.load_model()
+            use_gpu = config.ocr_device.value == "cuda"
+            model_options = {'use_gpu': use_gpu}
+            if config.ocr_quantized.value:
+                model_options.update(self.ocr_manager.get_quantized_model_options())
+            log.info(f"OCR管理器实例创建成功，开始加载模型 (设备: {config.ocr_device.value}, 量化: {config.ocr_quantized.value})...")
+            self.ocr_manager.load_model(model_options)
+
+            if not self.ocr_manager.is_ready() and (use_gpu or len(model_options) > 1):
+                log.warning("使用GPU或量化模型加载OCR失败，回退到CPU原始模型...")
+                self.ocr_manager.load_model({'use_gpu': False})
 
             # 验证OCR管理器是否准备就绪
             if not self.ocr_manager.is_ready():
@@ -63,6 +100,17 @@ class ImageTranslator:
             self.ocr_manager = None
             raise RuntimeError(f"OCR管理器初始化失败: {e}")
     
+    @staticmethod
+    def _resolve_translator_settings(translator_type: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """返回翻译器参数的普通字典快照，未显式传入的参数从配置中读取"""
+        settings = dict(kwargs)
+        if translator_type == "智谱":
+            settings.setdefault('api_key', config.zhipu_api_key.value)
+            settings.setdefault('model', config.zhipu_model.value)
+        elif translator_type == "Google":
+            settings.setdefault('api_key', config.google_api_key.value)
+        return settings
+
     def _init_translator(self, translator_type_to_init: str, **kwargs):
         """
         初始化翻译器。
@@ -70,17 +118,23 @@ class ImageTranslator:
             translator_type_to_init: 要初始化的翻译器类型。
             **kwargs: 传递给 TranslatorFactory 的参数。
         """
+        # 翻译器实例变化后，本实例单条翻译缓存中的结果不再适用
+        self._translate_text_cached.cache_clear()
         try:
-            log.info(f"尝试初始化翻译器类型: {translator_type_to_init}，参数: {kwargs}")
+            log.info(f"尝试初始化翻译器类型: {translator_type_to_init}，参数: {list(kwargs.keys())}")
             if translator_type_to_init == "智谱":
                 api_key = kwargs.get('api_key', config.zhipu_api_key.value)
                 model = kwargs.get('model', config.zhipu_model.value)
                 if not api_key:
                     log.warning("智谱翻译器 API Key 未在配置中找到。如果这是预期的翻译器，翻译将会失败。")
+                # 重新初始化翻译器时沿用已有的连接池会话，保持 keep-alive 连接
+                if self._http_session is None:
+                    self._http_session = create_http_session()
                 self.translator = TranslatorFactory.create_translator(
                     translator_type="智谱",
                     api_key=api_key,
-                    model=model
+                    model=model,
+                    session=self._http_session
                 )
             elif translator_type_to_init == "Google":
                 api_key = kwargs.get('api_key', config.google_api_key.value)
@@ -203,7 +257,7 @@ class ImageTranslator:
                 if not self.translator:
                     log.info("重新初始化翻译器...")
                     try:
-                        self._init_translator(config.translator_type.value)
+                        self._init_translator(self.translator_type, **self.translator_kwargs)
                     except Exception as e:
                         log.error(f"重新初始化翻译器失败: {e}")
                         raise RuntimeError(f"翻译器重新初始化失败: {e}")
@@ -238,7 +292,7 @@ class ImageTranslator:
             if not os.path.exists(image_input):
                 raise FileNotFoundError(f"图片文件不存在: {image_input}")
             try:
-                image_data = cv2.imdecode(np.fromfile(image_input, dtype=np.uint8), cv2.IMREAD_COLOR)
+                image_data = self._decode_image(image_input)
                 if image_data is None:
                     raise ValueError(f"无法读取图片文件: {image_input}")
                 log.info(f"已加载图片: {image_input}")
@@ -247,7 +301,8 @@ class ImageTranslator:
             except Exception as e:
                 raise ValueError(f"读取图片文件失败: {image_input}, 错误: {e}")
         elif isinstance(image_input, np.ndarray):
-            image_data = image_input.copy()
+            # OCR 只读取图像，文本替换器会在自己的副本上绘制，无需复制输入
+            image_data = image_input
             log.info("已加载图片数据")
         else:
             raise ValueError("image_input必须是文件路径或numpy数组")
@@ -284,11 +339,7 @@ class ImageTranslator:
             
             log.info(f"OCR识别完成，识别到 {len(ocr_results)} 个原始文本区域")
             
-            ocr_results = self.ocr_manager.filter_numeric_and_symbols(ocr_results)
-            
-            filtered_ocr_results = self.ocr_manager.filter_by_confidence(ocr_results, config.ocr_confidence_threshold.value)
-
-            structured_texts: List[OCRResult] = self.ocr_manager.get_structured_text(filtered_ocr_results)
+            structured_texts: List[OCRResult] = self.ocr_manager.structure_results(ocr_results)
 
             log.info(f"获取到 {len(structured_texts)} 个结构化文本块 (OCRResult)")
             
@@ -296,22 +347,23 @@ class ImageTranslator:
             texts_to_translate_mapping = {} # Stores original_text -> text_for_translation
             actual_texts_for_api = []
 
+            # 同一页中重复出现的文本（拟声词、短句等）只翻译一次
             if self.harmonization_manager:
                 log.info("应用和谐化规则...")
                 for item_ocr_result in structured_texts: 
                     original_text = item_ocr_result.text.strip()
-                    if not original_text:
+                    if not original_text or original_text in texts_to_translate_mapping:
                         continue
                     harmonized_text = self.harmonization_manager.apply_mapping_to_text(original_text)
                     texts_to_translate_mapping[original_text] = harmonized_text
                     actual_texts_for_api.append(harmonized_text)
                     if original_text != harmonized_text:
-                        log.debug(f"和谐化: '{original_text}' -> '{harmonized_text}'")
+                        log.debug("和谐化: '%s' -> '%s'", original_text, harmonized_text)
             else: # Fallback if harmonization_manager is None (e.g. init failed)
                 log.warning("和谐化管理器未初始化，跳过和谐化步骤。")
                 for item_ocr_result in structured_texts:
                     original_text = item_ocr_result.text.strip()
-                    if not original_text:
+                    if not original_text or original_text in texts_to_translate_mapping:
                         continue
                     texts_to_translate_mapping[original_text] = original_text
                     actual_texts_for_api.append(original_text)
@@ -331,15 +383,8 @@ class ImageTranslator:
                 else:
                     api_translations = self.translator.translate_batch(actual_texts_for_api, target_lang=target_language)
             else: 
-                log.info(f"使用 {self.translator.__class__.__name__ if self.translator else '未知翻译器'} 翻译器逐个翻译 {len(actual_texts_for_api)} 个文本块...")
-                for text_for_api in actual_texts_for_api:
-                    try:
-                        translated = self.translator.translate(text_for_api, target_lang=target_language)
-                        api_translations.append(translated)
-                        log.debug(f"翻译API输入: '{text_for_api}' -> '{translated}'")
-                    except Exception as e:
-                        log.error(f"翻译失败: {text_for_api}, 错误: {e}")
-                        api_translations.append(text_for_api) # Return text_for_api (harmonized or original) on error
+                log.info(f"使用 {self.translator.__class__.__name__ if self.translator else '未知翻译器'} 翻译器批量翻译 {len(actual_texts_for_api)} 个文本块...")
+                api_translations = self.translator.translate_batch(actual_texts_for_api, target_lang=target_language)
             
             # Map translations back to original OCR texts
             final_translations_map: Dict[str, str] = {}
@@ -354,18 +399,23 @@ class ImageTranslator:
                 for original_key, translated_text in zip(original_texts_ordered, api_translations):
                     final_translations_map[original_key] = translated_text
             
-            log.info(f"翻译完成，共处理 {len(final_translations_map)} 个文本块的映射")
-            
-            log.info("开始文本替换...")
-            result_image = self.manga_text_replacer.process_manga_image(
-                image_data,
-                structured_texts, 
-                final_translations_map, 
-                target_language=target_language,
-                inpaint_background=True 
-            )
-            
-            log.info("文本替换完成")
+            log.info("翻译完成，共处理 %d 个文本块的映射", len(final_translations_map))
+
+            if all(translated == original for original, translated in final_translations_map.items()):
+                # 译文与原文完全一致，跳过代价最高的涂白与重绘步骤
+                log.info("所有译文与原文一致，跳过文本替换")
+                result_image = image_data
+            else:
+                log.info("开始文本替换...")
+                result_image = self.manga_text_replacer.process_manga_image(
+                    image_data,
+                    structured_texts, 
+                    final_translations_map, 
+                    target_language=target_language,
+                    inpaint_background=True 
+                )
+                
+                log.info("文本替换完成")
             
             if output_path:
                 output_path_webp = str(Path(output_path).with_suffix('.webp'))
@@ -410,9 +460,20 @@ class ImageTranslator:
                               input_dir: str,
                               output_dir: str = "output",
                               target_language: str = "zh",
-                              image_extensions: List[str] = None) -> List[str]:
+                              image_extensions: List[str] = None,
+                              use_batch: bool = True,
+                              n_workers: int = 1) -> List[str]:
         """
         批量翻译图片
+
+        Args:
+            input_dir: 输入目录
+            output_dir: 输出目录
+            target_language: 目标语言
+            image_extensions: 需要处理的图片扩展名
+            use_batch: 是否走 batch_translate_images_optimized（跨页去重与批量翻译），
+                       为 False 时逐张调用 translate_image_simple
+            n_workers: 工作进程数。大于1时使用进程池逐张翻译，每个进程只在初始化时加载一次OCR模型
         """
         if image_extensions is None:
             image_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp']
@@ -422,36 +483,88 @@ class ImageTranslator:
         
         os.makedirs(output_dir, exist_ok=True)
         
-        image_files = []
-        for ext in image_extensions:
-            pattern = f"*{ext}"
-            image_files.extend(Path(input_dir).glob(pattern))
-            image_files.extend(Path(input_dir).glob(pattern.upper()))
+        # 单次 scandir 遍历，按小写扩展名匹配（避免每个扩展名大小写各 glob 一次）
+        extensions = frozenset(ext.lower() for ext in image_extensions)
+        with os.scandir(input_dir) as entries:
+            image_files = sorted(
+                (Path(entry.path) for entry in entries
+                 if entry.is_file() and os.path.splitext(entry.name)[1].lower() in extensions),
+                key=lambda p: p.name
+            )
         
         if not image_files:
             log.warning(f"在目录 {input_dir} 中未找到图片文件")
             return []
         
         log.info(f"找到 {len(image_files)} 个图片文件，开始批量翻译...")
-        
-        output_paths = []
-        for i, image_file_path_obj in enumerate(image_files, 1): 
+
+        if n_workers > 1:
+            return self._batch_translate_with_process_pool(image_files, output_dir, target_language, n_workers)
+
+        if use_batch:
+            image_paths = [str(image_file_path_obj) for image_file_path_obj in image_files]
+            output_paths = [
+                os.path.join(output_dir, f"{image_file_path_obj.stem}_translated_{target_language}.webp")
+                for image_file_path_obj in image_files
+            ]
             try:
-                log.info(f"处理第 {i}/{len(image_files)} 个文件: {image_file_path_obj.name}")
-                output_path = self.translate_image_simple(
-                    str(image_file_path_obj), 
-                    output_dir,
-                    target_language
-                )
-                output_paths.append(output_path)
-                log.info(f"完成: {image_file_path_obj.name} -> {os.path.basename(output_path)}")
+                # 只报告实际写入成功的文件，无法读取或保存失败的页面不计入结果
+                _, saved_paths = self._batch_translate_and_save(image_paths, output_paths, target_language)
+                log.info(f"批量翻译完成，成功处理 {len(saved_paths)}/{len(image_files)} 个文件")
+                return saved_paths
             except Exception as e:
-                log.error(f"处理文件 {image_file_path_obj.name} 时发生错误: {e}")
-                continue 
+                if self.cancel_flag.is_set():
+                    raise
+                log.error(f"批量翻译失败，回退到逐张翻译: {e}")
+        
+        # 逐张翻译：OCR（onnxruntime）与图像编解码会释放GIL，用线程池同时处理多张图片
+        # OCR引擎本身已使用多线程推理，线程数不宜过多
+        max_workers = min(os.cpu_count() or 1, len(image_files), 4)
+        results_by_index: Dict[int, str] = {}
+        previous_cv_threads = cv2.getNumThreads()
+        cv2.setNumThreads(_opencv_threads_per_worker(max_workers))
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                future_to_index = {
+                    executor.submit(self.translate_image_simple, str(image_file_path_obj), output_dir, target_language): i
+                    for i, image_file_path_obj in enumerate(image_files)
+                }
+                for future in as_completed(future_to_index):
+                    i = future_to_index[future]
+                    image_file_path_obj = image_files[i]
+                    try:
+                        output_path = future.result()
+                        results_by_index[i] = output_path
+                        log.info(f"完成第 {i+1}/{len(image_files)} 个文件: {image_file_path_obj.name} -> {os.path.basename(output_path)}")
+                    except Exception as e:
+                        log.error(f"处理文件 {image_file_path_obj.name} 时发生错误: {e}")
+        finally:
+            cv2.setNumThreads(previous_cv_threads)
         
+        output_paths = [results_by_index[i] for i in sorted(results_by_index)]
         log.info(f"批量翻译完成，成功处理 {len(output_paths)}/{len(image_files)} 个文件")
         return output_paths
     
+    def _batch_translate_with_process_pool(self,
+                                           image_files: List[Path],
+                                           output_dir: str,
+                                           target_language: str,
+                                           n_workers: int) -> List[str]:
+        """使用进程池逐张翻译图片，每个工作进程只创建一次翻译器（含OCR模型）"""
+        n_workers = min(n_workers, len(image_files))
+        log.info(f"使用 {n_workers} 个工作进程批量翻译 {len(image_files)} 个文件")
+
+        tasks = [(str(image_file_path_obj), output_dir, target_language) for image_file_path_obj in image_files]
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(processes=n_workers,
+                      initializer=_batch_worker_init,
+                      initargs=(self.translator_type, self.translator_kwargs, n_workers)) as pool:
+            results = pool.map(_batch_worker_translate, tasks)
+
+        output_paths = [output_path for output_path in results if output_path]
+        log.info(f"批量翻译完成，成功处理 {len(output_paths)}/{len(image_files)} 个文件")
+        return output_paths
+
     def batch_translate_images_optimized(self,
                                  image_inputs: List[Union[str, np.ndarray]],
                                  output_paths: Optional[List[str]] = None,
@@ -461,7 +574,23 @@ class ImageTranslator:
                                  original_archive_paths_for_cache: Optional[List[Optional[str]]] = None) -> List[np.ndarray]:
         """
         优化的批量翻译功能，一次性处理所有图片的 OCR 和翻译
+        无法读取的图片会被跳过，不出现在返回结果中
         """
+        result_images, _ = self._batch_translate_and_save(
+            image_inputs, output_paths, target_language,
+            file_paths_for_cache, page_nums_for_cache, original_archive_paths_for_cache
+        )
+        return result_images
+
+    def _batch_translate_and_save(self,
+                                  image_inputs: List[Union[str, np.ndarray]],
+                                  output_paths: Optional[List[str]] = None,
+                                  target_language: str = "zh",
+                                  file_paths_for_cache: Optional[List[str]] = None,
+                                  page_nums_for_cache: Optional[List[int]] = None,
+                                  original_archive_paths_for_cache: Optional[List[Optional[str]]] = None
+                                  ) -> Tuple[List[np.ndarray], List[str]]:
+        """batch_translate_images_optimized 的实现，额外返回实际写入成功的输出路径"""
         if not self.is_ready():
             log.warning("ImageTranslator 未准备就绪 (optimized)，尝试根据当前配置重新初始化翻译器...")
             try:
@@ -478,7 +607,7 @@ class ImageTranslator:
                 if not self.translator:
                     log.info("重新初始化翻译器 (optimized)...")
                     try:
-                        self._init_translator(config.translator_type.value)
+                        self._init_translator(self.translator_type, **self.translator_kwargs)
                     except Exception as e:
                         log.error(f"重新初始化翻译器失败 (optimized): {e}")
                         raise RuntimeError(f"翻译器重新初始化失败 (optimized): {e}")
@@ -506,34 +635,34 @@ class ImageTranslator:
             except Exception as reinit_e:
                  raise RuntimeError(f"图片翻译器未准备就绪 (optimized)，重新初始化翻译器失败: {reinit_e}")
 
-        images_data: List[np.ndarray] = [] 
+        # 文件输入交给后台线程读取和解码，与前面页面的OCR重叠进行；
+        # 对应位置先放 None，在OCR循环中按需取回解码结果
+        images_data: List[Optional[np.ndarray]] = [] 
         actual_file_paths_for_cache: List[Optional[str]] = [] 
+        decode_executor = ThreadPoolExecutor(max_workers=2)
+        decode_futures = {}
 
         for i, img_input in enumerate(image_inputs):
             current_file_path: Optional[str] = None 
             img_data_single: Optional[np.ndarray] = None 
 
             if isinstance(img_input, str):
-                if not os.path.exists(img_input):
-                    raise FileNotFoundError(f"图片文件不存在: {img_input}")
-                img_data_single = cv2.imdecode(np.fromfile(img_input, dtype=np.uint8), cv2.IMREAD_COLOR)
-                if img_data_single is None:
-                    raise ValueError(f"无法读取图片文件: {img_input}")
+                # 不存在的文件不提交解码，在OCR循环中作为无法读取的页面跳过
+                if os.path.exists(img_input):
+                    decode_futures[i] = decode_executor.submit(self._decode_image, img_input)
                 current_file_path = img_input
             elif isinstance(img_input, np.ndarray):
-                img_data_single = img_input.copy()
+                img_data_single = img_input  # 只读使用，无需复制
                 if file_paths_for_cache and i < len(file_paths_for_cache):
                     current_file_path = file_paths_for_cache[i]
             else:
+                decode_executor.shutdown(wait=False, cancel_futures=True)
                 raise ValueError("image_input必须是文件路径或numpy数组")
-            
-            if img_data_single is None: 
-                raise RuntimeError(f"无法加载第 {i+1} 张图片数据")
 
             images_data.append(img_data_single)
             actual_file_paths_for_cache.append(current_file_path)
         
-        log.info(f"已加载 {len(images_data)} 张图片 (optimized)")
+        log.info(f"已提交 {len(images_data)} 张图片 (optimized)，其中 {len(decode_futures)} 张在后台解码")
         
         final_file_paths_for_cache = actual_file_paths_for_cache
         if file_paths_for_cache and len(file_paths_for_cache) == len(images_data):
@@ -562,15 +691,27 @@ class ImageTranslator:
             log.info(f"🚀 翻译状态已设置: is_translating={self.is_translating}, cancel_flag={self.cancel_flag.is_set()}")
 
             log.info("开始批量 OCR 识别 (optimized)...")
-            all_ocr_results_per_page: List[List[OCRResult]] = []
             all_structured_texts_per_page: List[List[OCRResult]] = []
 
-            for i, img_data_item in enumerate(images_data):
+            for i in range(len(images_data)):
                 # 检查取消标志
                 if self.cancel_flag.is_set():
                     log.warning(f"🛑 翻译已取消，停止OCR处理 (第{i+1}/{len(images_data)}张)")
                     raise RuntimeError("翻译已被用户取消")
 
+                if images_data[i] is None:
+                    decode_future = decode_futures.get(i)
+                    try:
+                        images_data[i] = decode_future.result() if decode_future else None
+                    except Exception as e:
+                        log.error(f"解码图片失败: {image_inputs[i]}, {e}")
+                    if images_data[i] is None:
+                        # 单张无法读取的图片只跳过该页，不影响其余页面的翻译
+                        log.error(f"无法读取图片文件，跳过该页 (optimized): {image_inputs[i]}")
+                        all_structured_texts_per_page.append([])
+                        continue
+                img_data_item = images_data[i]
+
                 current_fp_cache = final_file_paths_for_cache[i]
                 current_pn_cache = final_page_nums_for_cache[i]
                 current_oa_cache = final_original_archive_paths_for_cache[i]
@@ -586,26 +727,23 @@ class ImageTranslator:
                     if current_oa_cache: log_message += f", 原始存档: {current_oa_cache}"
                     log_message += ")"
                     log.warning(log_message)
-                    all_ocr_results_per_page.append([])
                     all_structured_texts_per_page.append([])
                     continue
                 
-                filtered_results_page = self.ocr_manager.filter_numeric_and_symbols(ocr_results_page)
-                filtered_results_page = [r for r in filtered_results_page if r.confidence >= config.ocr_confidence_threshold.value]
-                
-                structured_texts_page: List[OCRResult] = self.ocr_manager.get_structured_text(filtered_results_page)
+                # 置信度与纯数字/符号过滤在结构化的同一次遍历中完成，不生成中间列表
+                structured_texts_page: List[OCRResult] = self.ocr_manager.structure_results(ocr_results_page)
                 
-                all_ocr_results_per_page.append(filtered_results_page) 
                 all_structured_texts_per_page.append(structured_texts_page)
                 log.info(f"图片 {i+1} (optimized) OCR 识别完成，识别到 {len(structured_texts_page)} 个结构化文本块 (OCRResult)")
             
             # Apply harmonization before bulk translation
-            unique_original_texts = set()
+            # dict 按首次出现顺序去重，保证送去翻译的文本顺序稳定且与页面顺序一致
+            unique_original_texts: Dict[str, None] = {}
             for structured_texts_page_item in all_structured_texts_per_page: 
                 for item_ocr_result in structured_texts_page_item: 
                     text = item_ocr_result.text.strip() 
                     if text:
-                        unique_original_texts.add(text)
+                        unique_original_texts.setdefault(text, None)
             
             texts_to_translate_mapping_optimized = {} # original_text -> harmonized_text
             actual_texts_for_api_optimized = []
@@ -617,7 +755,7 @@ class ImageTranslator:
                     texts_to_translate_mapping_optimized[original_text] = harmonized_text
                     actual_texts_for_api_optimized.append(harmonized_text)
                     if original_text != harmonized_text:
-                        log.debug(f"和谐化 (optimized): '{original_text}' -> '{harmonized_text}'")
+                        log.debug("和谐化 (optimized): '%s' -> '%s'", original_text, harmonized_text)
             else:
                 log.warning("和谐化管理器未初始化 (optimized)，跳过和谐化步骤。")
                 for original_text in unique_original_texts:
@@ -641,22 +779,15 @@ class ImageTranslator:
                         )
                         api_translations_optimized = translated_results if translated_results else actual_texts_for_api_optimized
                 else:
-                    for text_for_api in actual_texts_for_api_optimized:
-                        # 检查取消标志
-                        if self.cancel_flag.is_set():
-                            log.info("翻译已取消，停止文本翻译处理")
-                            raise RuntimeError("翻译已被用户取消")
-
-                        try:
-                            translated = self.translator.translate(text_for_api, target_lang=target_language)
-                            api_translations_optimized.append(translated)
-                        except Exception as e_trans:
-                            log.error(f"翻译失败 (optimized): {text_for_api}, 错误: {e_trans}")
-                            api_translations_optimized.append(text_for_api)
+                    api_translations_optimized = self.translator.translate_batch(
+                        actual_texts_for_api_optimized,
+                        target_lang=target_language,
+                        cancel_flag=self.cancel_flag
+                    )
             
             # Map translations back to original unique OCR texts
             bulk_translations_map: Dict[str, str] = {} 
-            unique_original_texts_list = list(unique_original_texts) # Keep order for zipping if needed
+            unique_original_texts_list = list(unique_original_texts) # Insertion order, matches actual_texts_for_api_optimized
 
             if len(unique_original_texts_list) != len(api_translations_optimized):
                 log.error(f"优化批量翻译结果数量 ({len(api_translations_optimized)}) 与唯一原始文本数量 ({len(unique_original_texts_list)}) 不匹配。")
@@ -672,12 +803,16 @@ class ImageTranslator:
             log.info("批量翻译完成 (optimized)")
             
             final_result_images: List[np.ndarray] = []
+            pending_saves: List[Tuple[int, np.ndarray, str, str]] = []
             for page_idx, (img_data_item, structured_texts_page_item) in enumerate(zip(images_data, all_structured_texts_per_page)):
                 # 检查取消标志
                 if self.cancel_flag.is_set():
                     log.info(f"翻译已取消，停止文本替换处理 (第{page_idx+1}/{len(images_data)}张)")
                     raise RuntimeError("翻译已被用户取消")
 
+                if img_data_item is None:
+                    continue
+
                 page_specific_translations: Dict[str, str] = {}
                 for ocr_item in structured_texts_page_item:
                     original_ocr_text = ocr_item.text.strip()
@@ -685,15 +820,13 @@ class ImageTranslator:
                         # Get the translation from the bulk map, using original_ocr_text as key
                         page_specific_translations[original_ocr_text] = bulk_translations_map.get(original_ocr_text, original_ocr_text)
 
-                if not structured_texts_page_item: # or not page_specific_translations if only considering translated items
-                    log.info(f"图片 {page_idx+1} (optimized) 没有文本进行替换，使用原图。")
+                if not structured_texts_page_item or all(
+                        translated == original for original, translated in page_specific_translations.items()):
+                    log.info(f"图片 {page_idx+1} (optimized) 没有需要替换的文本（无文本或译文与原文一致），使用原图。")
                     final_result_images.append(img_data_item)
                     if output_paths and page_idx < len(output_paths) and output_paths[page_idx]:
                         output_path_webp = str(Path(output_paths[page_idx]).with_suffix('.webp'))
-                        if self._save_image(img_data_item, output_path_webp):
-                            log.info(f"图片 {page_idx+1} (optimized) 原图已保存: {output_path_webp}")
-                        else:
-                            log.error(f"图片 {page_idx+1} (optimized) 保存原图失败: {output_path_webp}")
+                        pending_saves.append((page_idx, img_data_item, output_path_webp, "原图"))
                     continue
 
                 log.info(f"开始文本替换 for page {page_idx+1} (optimized)...")
@@ -709,18 +842,19 @@ class ImageTranslator:
 
                 if output_paths and page_idx < len(output_paths) and output_paths[page_idx]:
                     output_path_webp = str(Path(output_paths[page_idx]).with_suffix('.webp'))
-                    if self._save_image(result_image_page, output_path_webp):
-                        log.info(f"翻译结果已保存 for page {page_idx+1} (optimized): {output_path_webp}")
-                    else:
-                        log.error(f"保存翻译结果失败 for page {page_idx+1} (optimized): {output_path_webp}")
+                    pending_saves.append((page_idx, result_image_page, output_path_webp, "翻译结果"))
+
+            # 编码和写盘放到最后并行执行（cv2.imencode 会释放GIL）
+            saved_paths = self._save_images_parallel(pending_saves)
             
-            return final_result_images
+            return final_result_images, saved_paths
         except Exception as e:
             log.error(f"批量图片翻译过程中发生错误 (optimized): {e}")
             import traceback
             log.error(traceback.format_exc())
             raise RuntimeError(f"批量图片翻译失败 (optimized): {e}")
         finally:
+            decode_executor.shutdown(wait=False, cancel_futures=True)
             # 重置翻译状态
             self.is_translating = False
 
@@ -741,7 +875,7 @@ class ImageTranslator:
             if not os.path.exists(image_input):
                 raise FileNotFoundError(f"图片文件不存在: {image_input}")
             try:
-                image_data = cv2.imdecode(np.fromfile(image_input, dtype=np.uint8), cv2.IMREAD_COLOR)
+                image_data = self._decode_image(image_input)
                 if image_data is None:
                     raise ValueError(f"无法读取图片文件: {image_input}")
                 if current_file_path_for_cache is None:
@@ -749,31 +883,34 @@ class ImageTranslator:
             except Exception as e:
                 raise ValueError(f"读取图片文件失败: {image_input}, 错误: {e}")
         elif isinstance(image_input, np.ndarray):
-            image_data = image_input.copy()
+            image_data = image_input
         else:
             raise ValueError("image_input必须是文件路径或numpy数组")
         
         if image_data is None:
             raise RuntimeError("无法加载图片数据")
 
-        ocr_results = self.ocr_manager.recognize_image_data_sync(
+        return self.ocr_manager.recognize_and_structure(
             image_data,
             file_path_for_cache=current_file_path_for_cache,
             page_num_for_cache=page_num_for_cache,
             original_archive_path=original_archive_path_for_cache,
             options=options
         )
-        filtered_results = self.ocr_manager.filter_numeric_and_symbols(ocr_results)
-        filtered_results = self.ocr_manager.filter_by_confidence(filtered_results, config.ocr_confidence_threshold.value)
-        structured_texts = self.ocr_manager.get_structured_text(filtered_results)
-        return structured_texts
+
+    def _translate_text_uncached(self, text: str, target_language: str) -> str:
+        """调用翻译器翻译单条文本，失败时抛出 _UncachedTranslation 使结果不进入缓存"""
+        result = self.translator.translate(text, target_lang=target_language)
+        if result.startswith("[Translation Failed"):
+            raise _UncachedTranslation(result)
+        return result
 
     def translate_text(self, text: str, target_language: str = "zh") -> str:
         """直接翻译文本 (主要用于测试或独立文本翻译)"""
         if not self.translator:
             log.warning("翻译器未初始化，尝试根据当前配置重新初始化...")
             try:
-                self._init_translator(config.translator_type.value)
+                self._init_translator(self.translator_type, **self.translator_kwargs)
                 if not self.translator:
                     raise RuntimeError("翻译器仍未初始化")
             except Exception as e:
@@ -784,9 +921,12 @@ class ImageTranslator:
         if self.harmonization_manager:
             text_to_translate = self.harmonization_manager.apply_mapping_to_text(text)
             if text != text_to_translate:
-                log.debug(f"文本和谐化: '{text}' -> '{text_to_translate}'")
+                log.debug("文本和谐化: '%s' -> '%s'", text, text_to_translate)
         
-        return self.translator.translate(text_to_translate, target_lang=target_language)
+        try:
+            return self._translate_text_cached(text_to_translate, target_language)
+        except _UncachedTranslation as e:
+            return e.text
 
     def translate_image_with_cache_data(self, image_input: Union[str, np.ndarray],
                                        target_language: str = "zh",
@@ -816,13 +956,13 @@ class ImageTranslator:
                 if not os.path.exists(image_input):
                     log.error(f"图片文件不存在: {image_input}")
                     return None
-                image_data = cv2.imdecode(np.fromfile(image_input, dtype=np.uint8), cv2.IMREAD_COLOR)
+                image_data = self._decode_image(image_input)
                 if image_data is None:
                     log.error(f"无法读取图片文件: {image_input}")
                     return None
                 image_data = cv2.cvtColor(image_data, cv2.COLOR_BGR2RGB)
             elif isinstance(image_input, np.ndarray):
-                image_data = image_input.copy()
+                image_data = image_input
             else:
                 log.error(f"不支持的图片输入类型: {type(image_input)}")
                 return None
@@ -865,12 +1005,8 @@ class ImageTranslator:
                 translation_data["translated_image"] = image_data
                 return translation_data
 
-            # 过滤OCR结果
-            filtered_results = self.ocr_manager.filter_numeric_and_symbols(ocr_results)
-            filtered_results = [r for r in filtered_results if r.confidence >= config.ocr_confidence_threshold.value]
-
-            # 获取结构化文本
-            structured_texts = self.ocr_manager.get_structured_text(filtered_results)
+            # 过滤OCR结果并获取结构化文本
+            structured_texts = self.ocr_manager.structure_results(ocr_results)
             translation_data["structured_texts"] = structured_texts
 
             if not structured_texts:
@@ -878,8 +1014,9 @@ class ImageTranslator:
                 translation_data["translated_image"] = image_data
                 return translation_data
 
-            # 提取原始文本
-            original_texts = [result.text for result in structured_texts if result.text.strip()]
+            # 预先拆出非空文本块及其下标，空白块不参与后续和谐化与翻译
+            nonempty_results = [(i, result) for i, result in enumerate(structured_texts) if result.text.strip()]
+            original_texts = [result.text for _, result in nonempty_results]
             translation_data["original_texts"] = original_texts
 
             if not original_texts:
@@ -902,33 +1039,35 @@ class ImageTranslator:
                 harmonized_texts = original_texts.copy()
                 translation_data["harmonized_texts"] = harmonized_texts
 
-            # 翻译文本
-            log.info(f"开始翻译 {len(harmonized_texts)} 个文本片段...")
-            translated_texts = []
+            # 翻译文本（重复文本只翻译一次）
+            unique_harmonized_texts = list(dict.fromkeys(harmonized_texts))
+            log.info(f"开始翻译 {len(harmonized_texts)} 个文本片段 (去重后 {len(unique_harmonized_texts)} 个)...")
 
-            for text in harmonized_texts:
+            if self.cancel_flag.is_set():
+                log.info("翻译被取消")
+                return None
+            try:
+                unique_translations = self.translator.translate_batch(
+                    unique_harmonized_texts, target_lang=target_language, cancel_flag=self.cancel_flag
+                )
+            except RuntimeError:
                 if self.cancel_flag.is_set():
                     log.info("翻译被取消")
                     return None
-
-                translated_text = self.translator.translate(text, target_lang=target_language)
-                translated_texts.append(translated_text)
+                raise
+            translation_by_text = dict(zip(unique_harmonized_texts, unique_translations))
+            translated_texts = [translation_by_text.get(text, text) for text in harmonized_texts]
 
             translation_data["translated_texts"] = translated_texts
 
             # 应用翻译到图像
             log.info("开始应用翻译到图像...")
 
-            # 为OCR结果添加翻译文本
-            for i, result in enumerate(structured_texts):
-                if i < len(translated_texts):
-                    result.translated_texts = [translated_texts[i]]
-
-            # 创建翻译映射
+            # 按下标将译文散回对应的OCR结果，并创建翻译映射
             translation_mapping = {}
-            for i, original_text in enumerate(original_texts):
-                if i < len(translated_texts):
-                    translation_mapping[original_text] = translated_texts[i]
+            for (_, result), original_text, translated_text in zip(nonempty_results, original_texts, translated_texts):
+                result.translated_texts = [translated_text]
+                translation_mapping[original_text] = translated_text
 
             # 使用文本替换器处理图像
             translated_image = self.manga_text_replacer.process_manga_image(
@@ -958,13 +1097,23 @@ class ImageTranslator:
         p = Path(output_path)
         return str(p.with_name(f"{p.stem}_original{p.suffix}"))
 
+    @staticmethod
+    def _decode_image(file_path: str, flags: int = cv2.IMREAD_COLOR) -> Optional[np.ndarray]:
+        """
+        读取并解码图片文件（通过 fromfile/imdecode 支持Unicode路径）
+
+        OCR引擎（ONNX PaddleOCR）的检测与识别模型都以3通道BGR为输入，
+        因此翻译流程统一使用 IMREAD_COLOR 解码一次，OCR与文本替换共用同一份数据。
+        """
+        return cv2.imdecode(np.fromfile(file_path, dtype=np.uint8), flags)
+
     def _check_image_file(self, file_path: str) -> bool:
         """检查图片文件是否有效"""
         if not os.path.exists(file_path):
             log.error(f"图片文件不存在: {file_path}")
             return False
         try:
-            img = cv2.imdecode(np.fromfile(file_path, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+            img = self._decode_image(file_path, cv2.IMREAD_UNCHANGED)
             if img is None:
                 log.error(f"无法解码图片文件 (可能已损坏或格式不支持): {file_path}")
                 return False
@@ -973,6 +1122,34 @@ class ImageTranslator:
             log.error(f"检查图片文件时发生错误: {file_path}, {e}")
             return False
 
+    def _save_images_parallel(self, save_jobs: List[Tuple[int, np.ndarray, str, str]]) -> List[str]:
+        """
+        使用线程池并行编码并保存多张图片
+
+        Args:
+            save_jobs: (页索引, 图像数据, 输出路径, 描述) 列表
+
+        Returns:
+            按任务顺序排列的、实际写入成功的输出路径
+        """
+        saved_paths: List[str] = []
+        if not save_jobs:
+            return saved_paths
+
+        def save_single(job):
+            page_idx, image, output_path_webp, kind = job
+            return job, self._save_image(image, output_path_webp)
+
+        max_workers = min(os.cpu_count() or 1, len(save_jobs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for (page_idx, _, output_path_webp, kind), success in executor.map(save_single, save_jobs):
+                if success:
+                    saved_paths.append(output_path_webp)
+                    log.info(f"图片 {page_idx+1} (optimized) {kind}已保存: {output_path_webp}")
+                else:
+                    log.error(f"图片 {page_idx+1} (optimized) 保存{kind}失败: {output_path_webp}")
+        return saved_paths
+
     def _save_image(self, image: np.ndarray, file_path: str) -> bool:
         """使用imencode将图片保存为WebP格式，支持Unicode文件名。 """
         try:
@@ -989,12 +1166,13 @@ class ImageTranslator:
             # 使用 fromfile/imdecode 的逆过程 tofile/imencode
             ext = Path(file_path).suffix.lower()
             encode_params = []
+            quality = config.translation_webp_quality.value
             if ext == ".webp":
-                encode_params = [cv2.IMWRITE_WEBP_QUALITY, 90] # 0-100, 90 is good quality
+                encode_params = [cv2.IMWRITE_WEBP_QUALITY, quality]
             elif ext in [".jpg", ".jpeg"]:
-                encode_params = [cv2.IMWRITE_JPEG_QUALITY, 90]
+                encode_params = [cv2.IMWRITE_JPEG_QUALITY, quality]
             elif ext == ".png":
-                encode_params = [cv2.IMWRITE_PNG_COMPRESSION, 3] # 0-9, 3 is default
+                encode_params = [cv2.IMWRITE_PNG_COMPRESSION, 1] # 0-9, 低压缩级别编码明显更快
                 
             result, buf = cv2.imencode(ext, image, encode_params)
             if result:
@@ -1014,6 +1192,28 @@ class ImageTranslator:
 _translator_instance = None
 _current_translation_process = None
 
+# create_image_translator 复用的最近一个实例及其参数键（只保留一个，避免多个OCR模型常驻内存）
+_image_translator_cached: Optional[Tuple[Tuple[Any, ...], ImageTranslator]] = None
+_image_translator_instances_lock = threading.Lock()
+
+# 多进程批量翻译时，每个工作进程独享的翻译器实例
+_worker_image_translator: Optional[ImageTranslator] = None
+
+def _batch_worker_init(translator_type: Optional[str], translator_kwargs: Dict[str, Any], n_workers: int = 1):
+    """进程池初始化函数：每个工作进程只加载一次OCR模型和翻译器"""
+    global _worker_image_translator
+    cv2.setNumThreads(_opencv_threads_per_worker(n_workers))
+    _worker_image_translator = ImageTranslator(translator_type=translator_type, **translator_kwargs)
+
+def _batch_worker_translate(task) -> Optional[str]:
+    """进程池任务函数：翻译单张图片，失败时返回 None"""
+    image_path, output_dir, target_language = task
+    try:
+        return _worker_image_translator.translate_image_simple(image_path, output_dir, target_language)
+    except Exception as e:
+        log.error(f"处理文件 {os.path.basename(image_path)} 时发生错误: {e}")
+        return None
+
 def get_image_translator() -> ImageTranslator:
     """获取图片翻译器实例（单例模式）"""
     global _translator_instance
@@ -1055,10 +1255,26 @@ def kill_current_translation():
 def create_image_translator(translator_type: Optional[str] = None, **kwargs) -> ImageTranslator:
     """
     工厂函数，用于创建 ImageTranslator 实例。
-    简化 ImageTranslator 的创建过程。
+    与上一次调用参数相同时复用该实例，避免重复加载OCR模型和重建翻译器；
+    参数变化时替换缓存，进程内最多只保留一个实例。
     """
+    global _image_translator_cached
+    key = (translator_type, tuple(sorted(kwargs.items())))
     try:
-        return ImageTranslator(translator_type=translator_type, **kwargs)
-    except Exception as e:
-        log.error(f"创建 ImageTranslator 实例失败: {e}")
-        raise # Re-raise the exception so the caller knows it failed
+        hash(key)
+    except TypeError:
+        # 参数中含不可哈希的值，无法作为缓存键，直接创建不缓存的实例
+        key = None
+
+    with _image_translator_instances_lock:
+        if key is not None and _image_translator_cached is not None and _image_translator_cached[0] == key:
+            return _image_translator_cached[1]
+        try:
+            instance = ImageTranslator(translator_type=translator_type, **kwargs)
+        except Exception as e:
+            log.error(f"创建 ImageTranslator 实例失败: {e}")
+            raise # Re-raise the exception so the caller knows it failed
+        # 仅缓存完全就绪的实例，初始化不完整时下次调用重新创建
+        if key is not None and instance.is_ready():
+            _image_translator_cached = (key, instance)
+        return instance
@@ -9,7 +9,7 @@ import numpy as np
 from typing import Optional, Dict, Any
 from PIL import Image
 
-from core.translation.image_translator import ImageTranslator
+from core.translation.image_translator import ImageTranslator, create_image_translator
 from utils import manga_logger as log
 
 
@@ -29,7 +29,7 @@ class RealtimeTranslator:
         """设置翻译器配置"""
         try:
             log.info(f"配置翻译器: {translator_type}")
-            self.image_translator = ImageTranslator(translator_type, **kwargs)
+            self.image_translator = create_image_translator(translator_type, **kwargs)
 
             if self.image_translator.is_ready():
                 log.info(f"翻译器配置完成: {translator_type}")
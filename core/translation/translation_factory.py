@@ -206,6 +206,7 @@ class TranslationFactory:
         """执行翻译任务"""
         status_key = self.key_generator.generate_translation_key(manga_path, page_index, translator_id)
 
+        manga = None
         try:
             # 更新状态为翻译中
             with self.status_lock:
@@ -249,6 +250,10 @@ class TranslationFactory:
             with self.status_lock:
                 self.page_status[status_key] = PageStatus.FAILED
             log.error(f"翻译工厂: 翻译失败 {manga_path}:{page_index} - {e}")
+        finally:
+            # 临时加载的漫画对象读取页面时会打开ZIP句柄，用完立即关闭，避免占用文件直到被回收
+            if manga is not None:
+                manga.close()
     
     def get_page_status(self, manga_path: str, page_index: int, translator_id: str) -> PageStatus:
         """获取页面翻译状态"""
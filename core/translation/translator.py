@@ -3,7 +3,11 @@ import json
 import os
 import requests
 import time
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional 
 from utils import manga_logger as log 
 from core.core_cache.cache_factory import get_cache_factory_instance 
@@ -12,7 +16,24 @@ from core.core_cache.cache_interface import CacheInterface
 # 导入deep_translator库
 from deep_translator import GoogleTranslator
 
+def create_http_session(pool_size: int = 16) -> requests.Session:
+    """
+    创建带连接池的 HTTP 会话，供翻译器复用 keep-alive 连接，避免每次请求重新进行 TCP/TLS 握手。
+    连接错误最多重试3次（POST 请求不会因服务端状态码被重复提交）。
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=3, backoff_factor=0.3)
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
 class BaseTranslator(ABC):
+    max_concurrent_requests = 8  # translate_batch 默认实现中同时在途的请求数
+
     def __init__(self):
         self.translation_cache_manager: CacheInterface = get_cache_factory_instance().get_manager("translation")
 
@@ -55,10 +76,10 @@ class BaseTranslator(ABC):
                     log.warning(f"Google翻译替换敏感缓存失败 for '{clean_text[:30]}...'. 返回原始敏感缓存文本。")
                     return cached_result["text"] 
             else:
-                log.debug(f"缓存命中 (不敏感): '{clean_text[:30]}...' -> {target_lang} 使用 {translator_name}")
+                log.debug("缓存命中 (不敏感): '%s...' -> %s 使用 %s", clean_text[:30], target_lang, translator_name)
                 return cached_result["text"]
         else:
-            log.debug(f"缓存未命中: '{clean_text[:30]}...' -> {target_lang} 使用 {translator_name}。调用API...")
+            log.debug("缓存未命中: '%s...' -> %s 使用 %s。调用API...", clean_text[:30], target_lang, translator_name)
             translation_api_result = self._translate_text(clean_text, target_lang) 
 
             if translation_api_result and isinstance(translation_api_result, dict) and "text" in translation_api_result:
@@ -71,12 +92,77 @@ class BaseTranslator(ABC):
                     is_sensitive=is_sensitive,
                     original_text=clean_text
                 )
-                log.debug(f"已翻译并缓存: '{clean_text[:30]}...' -> '{translated_text_api[:30]}...'. 敏感: {is_sensitive}")
+                log.debug("已翻译并缓存: '%s...' -> '%s...'. 敏感: %s", clean_text[:30], translated_text_api[:30], is_sensitive)
                 return translated_text_api
             else:
                 log.warning(f"翻译失败: '{clean_text[:30]}...' 使用 {translator_name}")
                 return f"[Translation Failed: {clean_text}]"
 
+    def translate_batch(self, texts: List[str], target_lang: str ="en", cancel_flag=None) -> List[str]:
+        """
+        批量翻译，返回与 texts 等长、顺序一致的结果列表。
+        默认实现：一次查询取回缓存，未命中的文本并发调用 _translate_text
+        （最多 max_concurrent_requests 个请求同时在途），结果在调用线程中一次写入缓存。
+        支持批量接口的翻译器应重写此方法。
+        """
+        if not texts: return []
+
+        # 检查取消标志
+        if cancel_flag and cancel_flag.is_set():
+            log.warning("🛑 翻译器：收到取消信号，停止批量翻译")
+            raise RuntimeError("翻译已被用户取消")
+
+        clean_texts = [self._clean_text(text) for text in texts]
+        unique_texts = [text for text in dict.fromkeys(clean_texts) if text]
+        translator_name = self.__class__.__name__.replace("Translator", "").replace("Deep", "")
+        cache_keys = {
+            text: self.translation_cache_manager.generate_key(
+                original_text=text, target_lang=target_lang, translator_type=translator_name
+            )
+            for text in unique_texts
+        }
+        cached_results = self.translation_cache_manager.get_many(list(cache_keys.values()))
+
+        translations: Dict[str, str] = {"": ""}
+        uncached_texts = []
+        for text in unique_texts:
+            cached_result = cached_results.get(cache_keys[text])
+            if cached_result is None:
+                uncached_texts.append(text)
+            elif cached_result.get('is_sensitive', False):
+                # 敏感缓存走单条逻辑（尝试使用Google翻译替换）
+                translations[text] = self.translate(text, target_lang)
+            else:
+                translations[text] = cached_result["text"]
+
+        if uncached_texts:
+            def translate_single(text: str) -> Optional[Dict[str, Any]]:
+                if cancel_flag and cancel_flag.is_set():
+                    raise RuntimeError("翻译已被用户取消")
+                try:
+                    return self._translate_text(text, target_lang)
+                except Exception as e:
+                    log.error(f"翻译失败: '{text[:30]}...', 错误: {e}")
+                    return None
+
+            log.debug(f"批量翻译: {len(uncached_texts)} 条未命中缓存，并发调用 {translator_name} API...")
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrent_requests, len(uncached_texts))) as executor:
+                api_results = list(executor.map(translate_single, uncached_texts))
+
+            new_cache_entries = []
+            for text, translation_api_result in zip(uncached_texts, api_results):
+                if translation_api_result and isinstance(translation_api_result, dict) and "text" in translation_api_result:
+                    translations[text] = translation_api_result["text"]
+                    new_cache_entries.append(
+                        (cache_keys[text], translation_api_result["text"], translation_api_result.get("is_sensitive", False), text)
+                    )
+                else:
+                    log.warning(f"翻译失败: '{text[:30]}...' 使用 {translator_name}")
+                    translations[text] = f"[Translation Failed: {text}]"
+            self.translation_cache_manager.set_many(new_cache_entries)
+
+        return [translations[text] for text in clean_texts]
+
     def _clean_text(self, text: str) -> str:
         if not text: return ""
         cleaned = ' '.join(text.strip().split())
@@ -84,13 +170,22 @@ class BaseTranslator(ABC):
         return cleaned
 
 class ZhipuTranslator(BaseTranslator):
-    def __init__(self, api_key, model="glm-4-flash-250414"):
+    def __init__(self, api_key, model="glm-4-flash-250414", session: Optional[requests.Session] = None):
         super().__init__()
         self.api_key = api_key
         self.model = model
+        self.session = session or create_http_session()
         self.api_base_url = "https://open.bigmodel.cn/api/paas/v4/chat/completions"
         self.batch_size = 20
-        log.debug(f"智谱翻译器已初始化，批量大小: {self.batch_size}")
+        self.max_parallel_batches = 4  # 同时在途的子批次请求数
+        # 请求节流：相邻请求的发送至少间隔 min_request_interval 秒；
+        # 请求失败或被限流（429/503）时所有后续请求统一推迟，优先采用响应的 Retry-After
+        self.min_request_interval = 0.5
+        self.failure_backoff = 2.0
+        self._dispatch_lock = threading.Lock()
+        self._next_dispatch_time = 0.0
+        self._backoff_until = 0.0
+        log.debug(f"智谱翻译器已初始化，批量大小: {self.batch_size}，并行子批次: {self.max_parallel_batches}")
 
     def translate_batch(self, texts: List[str], target_lang: str ="en", cancel_flag=None) -> List[str]:
         if not texts: return []
@@ -107,65 +202,85 @@ class ZhipuTranslator(BaseTranslator):
         google_translate_texts_map = {}
         translator_name = "Zhipu"
 
+        cache_keys = [
+            self.translation_cache_manager.generate_key(
+                original_text=text, target_lang=target_lang, translator_type=translator_name
+            ) if text else None
+            for text in clean_texts
+        ]
+        # 一次查询取回整批缓存
+        cached_results = self.translation_cache_manager.get_many([key for key in cache_keys if key])
+
         for i, text in enumerate(clean_texts):
             if not text:
                 results[i] = ""
                 continue
 
-            cache_key = self.translation_cache_manager.generate_key(
-                original_text=text, target_lang=target_lang, translator_type=translator_name
-            )
-            cached_result = self.translation_cache_manager.get(cache_key)
+            cached_result = cached_results.get(cache_keys[i])
 
             if cached_result is not None and isinstance(cached_result, dict) and "text" in cached_result:
                 if cached_result.get('is_sensitive', False):
                     log.info(f"批量缓存命中 (智谱键) 但标记为敏感: '{text[:30]}...'. 将尝试智谱单条翻译。")
                     retry_with_zhipu_single_map[i] = text 
                 else:
-                    log.debug(f"批量缓存命中 (智谱键, 不敏感): '{text[:30]}...'")
                     results[i] = cached_result["text"]
             else:
-                log.debug(f"批量缓存未命中 (智谱): '{text[:30]}...'. 准备调用智谱API...")
                 uncached_texts_map[i] = text
+
+        # 逐条的命中情况汇总为一条日志输出
+        log.debug("批量缓存 (智谱): %d 条命中, %d 条未命中, %d 条敏感待重试",
+                  len(clean_texts) - len(uncached_texts_map) - len(retry_with_zhipu_single_map),
+                  len(uncached_texts_map), len(retry_with_zhipu_single_map))
         
         if uncached_texts_map:
             uncached_items = list(uncached_texts_map.items())
-            for i_batch_start in range(0, len(uncached_items), self.batch_size):
+            sub_batches = [uncached_items[i_batch_start : i_batch_start + self.batch_size]
+                           for i_batch_start in range(0, len(uncached_items), self.batch_size)]
+
+            def translate_sub_batch(batch_items):
                 # 检查取消标志
                 if cancel_flag and cancel_flag.is_set():
                     log.warning("🛑 智谱翻译器：在批量处理中收到取消信号")
                     raise RuntimeError("翻译已被用户取消")
 
-                current_batch_items = uncached_items[i_batch_start : i_batch_start + self.batch_size]
-                batch_texts_to_translate = [item[1] for item in current_batch_items]
-                batch_original_indices = [item[0] for item in current_batch_items]
-
-                translated_sub_batch_results = self._translate_batch_api(batch_texts_to_translate, target_lang, cancel_flag)
-                
-                if translated_sub_batch_results and len(translated_sub_batch_results) == len(batch_texts_to_translate):
-                    for j, translated_item_or_signal in enumerate(translated_sub_batch_results):
-                        original_list_index = batch_original_indices[j]
-                        original_text_for_item = batch_texts_to_translate[j]
-                        if isinstance(translated_item_or_signal, str) and translated_item_or_signal == "__USE_GOOGLE_TRANSLATOR__":
-                            log.info(f"批量API指示 '{original_text_for_item[:30]}...' 敏感，将尝试智谱单条翻译。")
-                            retry_with_zhipu_single_map[original_list_index] = original_text_for_item
-                        elif isinstance(translated_item_or_signal, str):
-                            results[original_list_index] = translated_item_or_signal
-                            current_cache_key = self.translation_cache_manager.generate_key(
-                                original_text=original_text_for_item, target_lang=target_lang, translator_type=translator_name
-                            )
-                            self.translation_cache_manager.set(
-                                current_cache_key, translated_item_or_signal, is_sensitive=False, original_text=original_text_for_item
-                            )
-                        else: 
-                            log.warning(f"批量API翻译失败 for '{original_text_for_item[:30]}...'. 将尝试智谱单条翻译。")
-                            retry_with_zhipu_single_map[original_list_index] = original_text_for_item
-                else: 
-                    log.warning(f"智谱批量API调用失败 for sub-batch starting with '{batch_texts_to_translate[0][:30]}...'. 将对该批次所有文本尝试智谱单条翻译。")
-                    for idx, text_to_retry_single in zip(batch_original_indices, batch_texts_to_translate):
-                        retry_with_zhipu_single_map[idx] = text_to_retry_single
-                
-                if (i_batch_start // self.batch_size + 1) < ((len(uncached_items) + self.batch_size - 1) // self.batch_size): time.sleep(1)
+                batch_texts = [item[1] for item in batch_items]
+                sub_results = self._translate_batch_api(batch_texts, target_lang, cancel_flag)
+                if not sub_results or len(sub_results) != len(batch_texts) or all(r is None for r in sub_results):
+                    log.info(f"智谱子批次 ({len(batch_texts)}条) 翻译失败，退避后重试一次...")
+                    self._delay_dispatch(self.failure_backoff)
+                    sub_results = self._translate_batch_api(batch_texts, target_lang, cancel_flag)
+                return sub_results
+
+            # 子批次并行发送（数量受 max_parallel_batches 限制），结果按原顺序回收
+            with ThreadPoolExecutor(max_workers=min(self.max_parallel_batches, len(sub_batches))) as executor:
+                sub_batch_results = executor.map(translate_sub_batch, sub_batches)
+                for current_batch_items, translated_sub_batch_results in zip(sub_batches, sub_batch_results):
+                    batch_texts_to_translate = [item[1] for item in current_batch_items]
+                    batch_original_indices = [item[0] for item in current_batch_items]
+                    new_cache_entries = []
+
+                    if translated_sub_batch_results and len(translated_sub_batch_results) == len(batch_texts_to_translate):
+                        for j, translated_item_or_signal in enumerate(translated_sub_batch_results):
+                            original_list_index = batch_original_indices[j]
+                            original_text_for_item = batch_texts_to_translate[j]
+                            if isinstance(translated_item_or_signal, str) and translated_item_or_signal == "__USE_GOOGLE_TRANSLATOR__":
+                                log.info(f"批量API指示 '{original_text_for_item[:30]}...' 敏感，将尝试智谱单条翻译。")
+                                retry_with_zhipu_single_map[original_list_index] = original_text_for_item
+                            elif isinstance(translated_item_or_signal, str):
+                                results[original_list_index] = translated_item_or_signal
+                                new_cache_entries.append(
+                                    (cache_keys[original_list_index], translated_item_or_signal, False, original_text_for_item)
+                                )
+                            else: 
+                                log.warning(f"批量API翻译失败 for '{original_text_for_item[:30]}...'. 将尝试智谱单条翻译。")
+                                retry_with_zhipu_single_map[original_list_index] = original_text_for_item
+                    else: 
+                        log.warning(f"智谱批量API调用失败 for sub-batch starting with '{batch_texts_to_translate[0][:30]}...'. 将对该批次所有文本尝试智谱单条翻译。")
+                        for idx, text_to_retry_single in zip(batch_original_indices, batch_texts_to_translate):
+                            retry_with_zhipu_single_map[idx] = text_to_retry_single
+
+                    # 每个子批次的结果在一个事务中写入缓存
+                    self.translation_cache_manager.set_many(new_cache_entries)
 
         if retry_with_zhipu_single_map:
             log.info(f"开始对 {len(retry_with_zhipu_single_map)} 条文本进行智谱单条重试...")
@@ -208,6 +323,34 @@ class ZhipuTranslator(BaseTranslator):
         final_results = [res if res is not None else f"[Translation Failed: {clean_texts[i]}]" for i, res in enumerate(results)]
         return final_results
 
+    def _delay_dispatch(self, seconds: float) -> None:
+        """推迟之后所有请求的发送时间（用于失败退避和服务端限流）"""
+        with self._dispatch_lock:
+            self._backoff_until = max(self._backoff_until, time.monotonic() + seconds)
+
+    def _wait_for_dispatch_slot(self, cancel_flag=None) -> None:
+        """等待本次请求的发送时机：与上一个请求至少间隔 min_request_interval 秒，退避期间一并等待"""
+        with self._dispatch_lock:
+            slot = max(time.monotonic(), self._next_dispatch_time)
+            self._next_dispatch_time = slot + self.min_request_interval
+        while True:
+            # 等待期间其他请求可能触发新的退避，每次都重新计算
+            remaining = max(slot, self._backoff_until) - time.monotonic()
+            if remaining <= 0:
+                return
+            if cancel_flag and cancel_flag.is_set():
+                log.warning("🛑 智谱API等待发送时收到取消信号")
+                raise RuntimeError("翻译已被用户取消")
+            time.sleep(min(remaining, 0.5))
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str], default: float) -> float:
+        """解析 Retry-After 响应头（秒数），缺失或无法解析时返回 default"""
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            return default
+
     def _translate_batch_api(self, texts: List[str], target_lang: str, cancel_flag=None) -> List[Optional[str]]:
         if not texts: return []
 
@@ -238,17 +381,16 @@ class ZhipuTranslator(BaseTranslator):
 
         log.debug(f"智谱批量API请求 ({len(texts)}条): 模型={self.model}, 目标语言={target_lang_name}")
 
+        self._wait_for_dispatch_slot(cancel_flag)
+
         try:
             # 使用更短的超时时间，并在循环中检查取消标志
-            import threading
-            import time
-
             response_container = [None]
             exception_container = [None]
 
             def make_request():
                 try:
-                    response_container[0] = requests.post(
+                    response_container[0] = self.session.post(
                         self.api_base_url,
                         headers=headers,
                         json=payload,
@@ -292,6 +434,12 @@ class ZhipuTranslator(BaseTranslator):
             response = response_container[0]
             if response is None:
                 raise RuntimeError("智谱API请求失败：无响应")
+
+            if response.status_code in (429, 503):
+                retry_after = self._parse_retry_after(response.headers.get("Retry-After"), self.failure_backoff)
+                log.warning(f"智谱API限流 (HTTP {response.status_code})，{retry_after:.1f} 秒后再发送请求")
+                self._delay_dispatch(retry_after)
+                return [None] * len(texts)
             
             if response.status_code == 400:
                 try:
@@ -339,9 +487,11 @@ class ZhipuTranslator(BaseTranslator):
                 return [None] * len(texts)
         except requests.exceptions.Timeout:
             log.error(f"智谱批量API请求超时 ({len(texts)}条)。")
+            self._delay_dispatch(self.failure_backoff)
             return [None] * len(texts)
         except requests.exceptions.RequestException as e:
             log.error(f"智谱批量API请求失败 ({len(texts)}条): {e}")
+            self._delay_dispatch(self.failure_backoff)
             return [None] * len(texts)
         except json.JSONDecodeError as e:
             log.error(f"解析智谱API响应JSON失败: {e}. Response text: {response.text if 'response' in locals() else 'N/A'}")
@@ -393,12 +543,12 @@ class GoogleDeepTranslator(BaseTranslator):
             if target_lang.lower() in ["zh", "zh-cn", "zh-hans"]: dt_target_lang = "zh-CN"
             elif target_lang.lower() in ["zh-tw", "zh-hant"]: dt_target_lang = "zh-TW"
             
-            log.debug(f"GoogleDeepTranslator: Translating '{text[:30]}...' to {dt_target_lang}")
+            log.debug("GoogleDeepTranslator: Translating '%s...' to %s", text[:30], dt_target_lang)
             translator = GoogleTranslator(source="auto", target=dt_target_lang)
             translated_text = translator.translate(text)
             
             if translated_text:
-                log.debug(f"GoogleDeepTranslator: Success '{text[:30]}...' -> '{translated_text[:30]}...'")
+                log.debug("GoogleDeepTranslator: Success '%s...' -> '%s...'", text[:30], translated_text[:30])
                 return {"text": translated_text, "is_sensitive": False} 
             else:
                 log.warning(f"GoogleDeepTranslator: Translation returned empty for '{text[:30]}...'")
@@ -409,10 +559,10 @@ class GoogleDeepTranslator(BaseTranslator):
 
 class TranslatorFactory:
     @staticmethod
-    def create_translator(translator_type, api_key=None, model=None, **kwargs):
+    def create_translator(translator_type, api_key=None, model=None, session=None, **kwargs):
         if translator_type == "智谱":
             if not api_key: raise ValueError("ZhipuTranslator requires an API key.")
-            return ZhipuTranslator(api_key=api_key, model=model or "glm-4-flash-250414")
+            return ZhipuTranslator(api_key=api_key, model=model or "glm-4-flash-250414", session=session)
         elif translator_type == "Google":
             return GoogleDeepTranslator(api_key=api_key) 
         else:
@@ -73,6 +73,10 @@ class MangaLogger:
         for handler in self.logger.handlers:
             handler.setLevel(level)
 
+    def is_enabled_for(self, level):
+        """判断指定等级的日志是否会被输出，用于在热点循环中跳过日志消息的构建"""
+        return self.logger.isEnabledFor(level)
+
     def debug(self, message, *args, **kwargs):
         self.logger.debug(message, *args, **kwargs)
 
@@ -90,6 +94,10 @@ class MangaLogger:
 
 
 # 便捷函数，方便直接调用
+def is_debug_enabled():
+    return MangaLogger.get_instance().is_enabled_for(logging.DEBUG)
+
+
 def debug(message, *args, **kwargs):
     MangaLogger.get_instance().debug(message, *args, **kwargs)
 
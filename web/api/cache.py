@@ -100,17 +100,8 @@ class MangaListCacheHandler(CacheHandler):
     async def get_info(self) -> CacheInfo:
         """获取漫画列表缓存信息"""
         try:
-            # 获取所有目录条目
-            cached_dirs = self.manager.get_all_entries_for_display()
-            total_entries = 0
-            
-            # 计算总漫画数量
-            for dir_entry in cached_dirs:
-                directory_path = dir_entry.get("directory_path")
-                if directory_path:
-                    manga_list = self.manager.get(directory_path)
-                    if manga_list:
-                        total_entries += len(manga_list)
+            # 计算总漫画数量：由数据库直接计数，不必读取并解析每个目录的漫画列表
+            total_entries = self.manager.count_entries()
             
             # 获取缓存大小
             size_bytes = 0
@@ -506,18 +506,12 @@ async def get_manga_info(
 
         log.info(f"查找漫画信息: {manga_path}")
 
-        # 从漫画列表中查找对应的漫画
-        manga_list = interface.get_manga_list()
-        target_manga = None
-
-        for manga in manga_list:
-            if manga.file_path == manga_path:
-                target_manga = manga
-                break
+        # 按路径索引查找对应的漫画
+        target_manga = interface.get_manga_info(manga_path)
 
         if not target_manga:
             log.warning(f"漫画未找到: {manga_path}")
-            log.info(f"可用漫画列表前5个: {[m.file_path for m in manga_list[:5]]}")
+            log.info(f"可用漫画列表前5个: {[m.file_path for m in interface.manga_manager.manga_list[:5]]}")
             raise HTTPException(status_code=404, detail="漫画未找到")
 
         return {
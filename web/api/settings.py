@@ -142,6 +142,31 @@ async def get_all_settings():
             min_value=0.0,
             max_value=1.0
         ))
+        settings.append(SettingItem(
+            key="ocr_device",
+            name="OCR推理设备",
+            description="OCR模型使用的推理设备（CUDA需要onnxruntime-gpu，重新创建翻译器后生效）",
+            value=config.ocr_device.value,
+            type="enum",
+            options=[
+                {"value": "cpu", "label": "CPU"},
+                {"value": "cuda", "label": "CUDA (GPU)"}
+            ]
+        ))
+        settings.append(SettingItem(
+            key="ocr_quantized",
+            name="OCR INT8量化",
+            description="使用INT8量化的OCR检测/识别模型以加快CPU推理（首次启用时生成量化模型）",
+            value=config.ocr_quantized.value,
+            type="bool"
+        ))
+        settings.append(SettingItem(
+            key="ocr_skip_textless_pages",
+            name="跳过无文字页面",
+            description="OCR前先用边缘特征快速判断，跳过空白页等明显没有文字的页面",
+            value=config.ocr_skip_textless_pages.value,
+            type="bool"
+        ))
 
         # 翻译引擎类型
         settings.append(SettingItem(
@@ -156,6 +181,16 @@ async def get_all_settings():
             ]
         ))
 
+        settings.append(SettingItem(
+            key="translation_webp_quality",
+            name="翻译结果WebP质量",
+            description="保存翻译结果图片时的WebP编码质量，较低的值编码更快、文件更小",
+            value=config.translation_webp_quality.value,
+            type="int",
+            min_value=1,
+            max_value=100
+        ))
+
         # 智谱AI翻译设置
         settings.append(SettingItem(
             key="zhipu_api_key",
@@ -424,7 +459,8 @@ async def export_settings():
             "themeMode", "reading_order", "display_mode",
             "merge_tags", "log_level",
             "translator_type", "zhipu_model", "font_name",
-            "ocrConfidenceThreshold" # 添加遗漏的配置
+            "ocrConfidenceThreshold", # 添加遗漏的配置
+            "ocr_device", "ocr_quantized", "ocr_skip_textless_pages", "translation_webp_quality"
         ]
 
         for key in settings_keys:
@@ -23,6 +23,13 @@ import traceback
 import tempfile
 import hashlib
 import json
+import io
+import base64
+import shutil
+import random
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
 
 # 导入core模块
 from core.manga.manga_manager import MangaManager
@@ -117,12 +124,13 @@ class CoreInterface:
                                 manga_objects = []
                                 for manga_data in cached_manga:
                                     try:
-                                        from core.manga.manga_model import MangaInfo
                                         file_path = manga_data.get("file_path")
                                         if file_path and os.path.exists(file_path):
                                             manga = MangaInfo(file_path)
-                                            manga.title = manga_data.get("title", os.path.basename(file_path))
-                                            manga.tags = set(manga_data.get("tags", []))
+                                            # 缓存记录总会写入标题，只有缺失时才用文件名
+                                            cached_title = manga_data.get("title")
+                                            manga.title = cached_title if cached_title is not None else os.path.basename(file_path)
+                                            manga.tags = frozenset(manga_data.get("tags", []))
                                             manga.total_pages = manga_data.get("total_pages", 0)
                                             manga.is_valid = manga_data.get("is_valid", False)
                                             manga.last_modified = manga_data.get("last_modified", 0)
@@ -139,9 +147,9 @@ class CoreInterface:
 
                                 self._manga_manager.manga_list = manga_objects
                                 # 重新收集标签
-                                self._manga_manager.tags.clear()
-                                for manga in self._manga_manager.manga_list:
-                                    self._manga_manager.tags.update(manga.tags)
+                                self._manga_manager.tags = set().union(
+                                    *(manga.tags for manga in self._manga_manager.manga_list)
+                                )
                                 log.info(f"从缓存加载了 {len(manga_objects)} 个漫画")
                             else:
                                 log.info("缓存中没有找到漫画数据")
@@ -294,6 +302,13 @@ class CoreInterface:
             log.error(f"获取漫画列表失败: {e}")
             raise CoreInterfaceError("获取漫画列表失败", e)
     
+    def get_manga_info(self, manga_path: str) -> Optional[WebMangaInfo]:
+        """按路径获取单本漫画信息，通过管理器的路径索引查找，不转换和排序整个列表"""
+        manga_info = self.manga_manager.get_manga_by_path(manga_path)
+        if manga_info is None:
+            return None
+        return self._convert_manga_info(manga_info)
+
     def get_all_tags(self) -> List[str]:
         """获取所有标签"""
         try:
@@ -326,22 +341,20 @@ class CoreInterface:
 
     def get_manga_cover(self, manga_path: str) -> Optional[str]:
         """获取漫画封面（第一页）的base64编码"""
+        manga_data = None
         try:
-            # 加载漫画
+            # 加载漫画（临时对象，读取后关闭其打开的ZIP句柄）
             manga_data = self.manga_loader.load_manga(manga_path)
             if not manga_data or not manga_data.pages or manga_data.total_pages == 0:
                 return None
 
-            # 获取第一页图片数据
-            first_page_image = self.manga_loader.get_page_image(manga_data, 0)
+            # 获取第一页图片数据；封面只用于预览，不小于缩略图尺寸即可，JPEG可在解码时直接缩小
+            cover_size = (config.thumbnail_output_width.value, config.thumbnail_output_height.value)
+            first_page_image = self.manga_loader.get_page_image(manga_data, 0, target_size=cover_size)
             if first_page_image is None:
                 return None
 
             # 使用PIL转换numpy数组为图片
-            from PIL import Image
-            import io
-            import base64
-
             # 将numpy数组转换为PIL图片
             if first_page_image.dtype != 'uint8':
                 first_page_image = (first_page_image * 255).astype('uint8')
@@ -367,6 +380,9 @@ class CoreInterface:
         except Exception as e:
             log.error(f"获取漫画封面失败 {manga_path}: {e}")
             return None
+        finally:
+            if manga_data is not None:
+                manga_data.close()
 
     def get_manga_thumbnail(self, manga_path: str) -> Optional[str]:
         """获取漫画缩略图的base64编码（使用缓存）"""
@@ -377,7 +393,6 @@ class CoreInterface:
                 return None
 
             # 读取缩略图文件并转换为base64
-            import base64
             with open(thumbnail_path, 'rb') as f:
                 image_data = f.read()
 
@@ -392,9 +407,14 @@ class CoreInterface:
 
     def get_manga_page(self, manga_path: str, page_num: int) -> Optional[str]:
         """获取漫画指定页面的base64编码图片"""
+        manga_data = None
+        is_temporary = False
         try:
-            # 加载漫画
-            manga_data = self.manga_loader.load_manga(manga_path)
+            # 优先使用漫画列表中的对象，其保持打开的ZIP句柄可在连续翻页间复用
+            manga_data = self.manga_manager.get_manga_by_path(manga_path)
+            if manga_data is None or not manga_data.pages:
+                manga_data = self.manga_loader.load_manga(manga_path)
+                is_temporary = True
             if not manga_data or not manga_data.pages or manga_data.total_pages == 0:
                 log.warning(f"无法加载漫画或漫画为空: {manga_path}")
                 return None
@@ -411,10 +431,6 @@ class CoreInterface:
                 return None
 
             # 使用PIL转换numpy数组为图片
-            from PIL import Image
-            import io
-            import base64
-
             # 将numpy数组转换为PIL图片
             if page_image.dtype != 'uint8':
                 page_image = (page_image * 255).astype('uint8')
@@ -440,6 +456,16 @@ class CoreInterface:
         except Exception as e:
             log.error(f"获取漫画页面失败 {manga_path}, 页码 {page_num}: {e}")
             return None
+        finally:
+            # 临时加载的漫画对象用完即关闭其ZIP句柄
+            if is_temporary and manga_data:
+                manga_data.close()
+
+    def release_manga(self, manga_path: str):
+        """释放漫画保持打开的ZIP句柄（切换或关闭阅读时调用）"""
+        manga = self.manga_manager.get_manga_by_path(manga_path)
+        if manga is not None:
+            manga.close()
 
     # ==================== 数据转换工具 ====================
 
@@ -471,7 +497,7 @@ class CoreInterface:
             file_type = "unknown"
             file_size = None
 
-            if os.path.isdir(manga_info.file_path):
+            if manga_info.is_dir:
                 file_type = "folder"
             elif manga_info.file_path.lower().endswith(('.zip', '.cbz', '.cbr')):
                 file_type = "zip"
@@ -500,7 +526,9 @@ class CoreInterface:
             if hasattr(manga_info, 'is_likely_manga'):
                 web_manga.is_likely_manga = manga_info.is_likely_manga
             if hasattr(manga_info, 'page_dimensions'):
-                web_manga.page_dimensions = manga_info.page_dimensions
+                page_dimensions = manga_info.page_dimensions
+                # 尺寸分析结果为 numpy 数组，响应模型需要普通列表
+                web_manga.page_dimensions = page_dimensions.tolist() if hasattr(page_dimensions, "tolist") else page_dimensions
 
             # 保存到缓存
             self._conversion_cache[cache_key] = web_manga
@@ -562,9 +590,6 @@ class CoreInterface:
     def add_manga_from_path(self, path: str) -> WebScanResult:
         """从指定路径添加漫画到缓存"""
         try:
-            import os
-            from core.manga.manga_model import MangaLoader
-
             if not os.path.exists(path):
                 return WebScanResult(
                     success=False,
@@ -581,11 +606,8 @@ class CoreInterface:
             manga = MangaLoader.load_manga(path)
 
             if manga and manga.is_valid:
-                # 将漫画添加到管理器的列表中
-                existing_paths = {m.file_path for m in self.manga_manager.manga_list}
-
-                if manga.file_path not in existing_paths:
-                    self.manga_manager.manga_list.append(manga)
+                # 将漫画添加到管理器的列表中（按路径去重）
+                if self.manga_manager.add_manga(manga):
 
                     # 更新缓存
                     cache_key = self.manga_manager.manga_list_cache_manager.generate_key("all_manga")
@@ -634,9 +656,6 @@ class CoreInterface:
     def scan_directory_for_manga(self, directory_path: str) -> WebScanResult:
         """扫描指定目录中的所有漫画文件"""
         try:
-            import os
-            from core.manga.manga_model import MangaLoader
-
             if not os.path.exists(directory_path):
                 return WebScanResult(
                     success=False,
@@ -665,31 +684,40 @@ class CoreInterface:
             manga_files = MangaLoader.find_manga_files(directory_path)
             log.info(f"在目录 {directory_path} 中找到 {len(manga_files)} 个漫画文件")
 
-            existing_paths = {m.file_path for m in self.manga_manager.manga_list}
-
+            # 跳过已存在的漫画，其余用线程池并发加载（IO密集），map 保持原有顺序
+            new_files = []
             for file_path in manga_files:
-                try:
-                    # 检查是否已存在
-                    if file_path in existing_paths:
-                        log.info(f"漫画已存在，跳过: {file_path}")
-                        continue
-
-                    # 加载漫画
-                    manga = MangaLoader.load_manga(file_path)
-                    if manga and manga.is_valid:
-                        self.manga_manager.manga_list.append(manga)
-                        existing_paths.add(file_path)  # 更新已存在路径集合
-                        added_count += 1
-                        log.info(f"成功添加漫画: {manga.title}")
-                    else:
-                        error_msg = f"无法加载漫画: {file_path}"
-                        errors.append(error_msg)
-                        log.warning(error_msg)
+                if self.manga_manager.has_manga(file_path):
+                    log.info(f"漫画已存在，跳过: {file_path}")
+                else:
+                    new_files.append(file_path)
 
+            def load_manga_safely(file_path):
+                try:
+                    return MangaLoader.load_manga(file_path), None
                 except Exception as e:
-                    error_msg = f"处理 {file_path} 失败: {str(e)}"
+                    return None, e
+
+            if new_files:
+                max_workers = min(32, (os.cpu_count() or 1) * 4, len(new_files))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    loaded = list(executor.map(load_manga_safely, new_files))
+            else:
+                loaded = []
+
+            for file_path, (manga, load_error) in zip(new_files, loaded):
+                if load_error is not None:
+                    error_msg = f"处理 {file_path} 失败: {str(load_error)}"
                     errors.append(error_msg)
                     log.error(error_msg)
+                elif manga and manga.is_valid:
+                    self.manga_manager.add_manga(manga)
+                    added_count += 1
+                    log.info(f"成功添加漫画: {manga.title}")
+                else:
+                    error_msg = f"无法加载漫画: {file_path}"
+                    errors.append(error_msg)
+                    log.warning(error_msg)
 
             # 更新缓存
             if added_count > 0:
@@ -755,9 +783,6 @@ class CoreInterface:
         """
         try:
             from core.image.image_compressor import ImageCompressor
-            import tempfile
-            import shutil
-            from datetime import datetime
 
             compressor = ImageCompressor()
 
@@ -821,7 +846,8 @@ class CoreInterface:
                                 shutil.copy2(file_path, backup_path)
 
                                 try:
-                                    # 替换原文件
+                                    # 替换原文件；先释放列表中该漫画保持打开的ZIP句柄，Windows 上无法替换仍被打开的文件
+                                    self.release_manga(file_path)
                                     shutil.move(result["temp_file"], file_path)
 
                                     # 删除备份文件
@@ -893,11 +919,6 @@ class CoreInterface:
             验证是否通过
         """
         try:
-            import zipfile
-            import random
-            from PIL import Image
-            import io
-
             # 1. 检查文件数量是否一致
             original_files = []
             compressed_files = []
@@ -984,8 +1005,6 @@ class CoreInterface:
             过滤结果字典
         """
         try:
-            from core.config import config
-
             log.info(f"开始自动过滤漫画，方法: {filter_method}, 阈值: {threshold}")
 
             # 如果使用尺寸分析，先确保所有漫画都有尺寸分析数据
@@ -994,7 +1013,7 @@ class CoreInterface:
 
                 # 检查是否需要进行尺寸分析（仅对ZIP文件）
                 manga_list = self.manga_manager.manga_list
-                zip_manga_list = [m for m in manga_list if not os.path.isdir(m.file_path)]
+                zip_manga_list = [m for m in manga_list if not m.is_dir]
 
                 if not zip_manga_list:
                     log.info("没有ZIP格式的漫画需要进行尺寸分析")
@@ -1131,9 +1150,9 @@ class CoreInterface:
                 ]
 
             # 重新构建标签集合
-            self.manga_manager.tags = set()
-            for manga in self.manga_manager.manga_list:
-                self.manga_manager.tags.update(manga.tags)
+            self.manga_manager.tags = set().union(
+                *(manga.tags for manga in self.manga_manager.manga_list)
+            )
 
             log.info(f"已应用过滤结果，移除了 {len(removed_manga)} 个文件")
             return True
@@ -1145,6 +1164,10 @@ class CoreInterface:
     def close(self):
         """关闭接口，清理资源"""
         try:
+            # 先写入漫画管理器尚未保存的延迟数据，再关闭缓存管理器
+            if self._manga_manager is not None:
+                self._manga_manager.close()
+                self._manga_manager = None
             # 清理缓存管理器
             get_cache_factory_instance().close_all_managers()
             log.info("Core接口已关闭")
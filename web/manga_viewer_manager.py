@@ -116,6 +116,8 @@ class MangaViewerManager:
             # 切换漫画时清空缓存
             if self.current_manga_path != manga_path:
                 self._clear_caches()
+                if self.current_manga_path:
+                    self.core_interface.release_manga(self.current_manga_path)
                 log.info(f"会话 {self.session_id}: 切换漫画，清空缓存")
             
             # 获取漫画信息
@@ -286,17 +288,16 @@ class MangaViewerManager:
     def _get_manga_info(self, manga_path: str) -> Optional[Dict[str, Any]]:
         """获取漫画信息"""
         try:
-            # 通过核心接口获取漫画列表
-            manga_list = self.core_interface.get_manga_list()
-            for manga in manga_list:
-                if manga.file_path == manga_path:
-                    return {
-                        "title": manga.title,
-                        "file_path": manga.file_path,
-                        "total_pages": manga.total_pages,
-                        "file_size": getattr(manga, 'file_size', 0),
-                        "tags": getattr(manga, 'tags', [])
-                    }
+            # 通过核心接口按路径查找
+            manga = self.core_interface.get_manga_info(manga_path)
+            if manga is not None:
+                return {
+                    "title": manga.title,
+                    "file_path": manga.file_path,
+                    "total_pages": manga.total_pages,
+                    "file_size": getattr(manga, 'file_size', 0),
+                    "tags": getattr(manga, 'tags', [])
+                }
         except Exception as e:
             log.error(f"获取漫画信息失败: {e}")
         return None